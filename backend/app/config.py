@@ -6,7 +6,87 @@ class Settings(BaseSettings):
     ASYNC_DATABASE_URL : str
     CELERY_BROKER_URL : str
     CELERY_RESULT_BACKEND : str
-    OPENAI_API_KEY : str
+    OPENAI_API_KEY : str = ""  # openai 백엔드를 사용할 때만 필요
+
+    # 크롤러 설정
+    CRAWLER_RATE_PER_SECOND: float = 1.0  # 호스트별 초당 요청 수
+    CRAWLER_BURST: int = 3  # 호스트별 순간 최대 요청 수
+    CRAWLER_MAX_CONNECTIONS: int = 10
+    CRAWLER_TIMEOUT: float = 10.0
+    CRAWLER_PARSER: str = "lxml"  # 검색 결과 파서 (soup, lxml, selectolax)
+    CRAWL_SEEN_RETENTION_DAYS: int = 7  # 이미 본 URL을 기억하는 기간
+    CRAWL_HWM_SLACK_MINUTES: int = 60  # high-water mark 비교 시 허용 오차
+
+    # 기사 저장 설정
+    INGEST_BATCH_SIZE: int = 500  # multi-row INSERT 한 번에 보낼 행 수
+    INGEST_COPY_THRESHOLD: int = 5000  # 이 개수 이상이면 COPY 경로 사용
+
+    # 벡터 색인 설정
+    CHROMA_PERSIST_DIR: str = "chroma_data"  # 로컬 저장 경로 (CHROMA_HOST가 없을 때)
+    CHROMA_HOST: str = ""  # Chroma 서버 주소. 설정하면 HTTP 클라이언트 사용
+    CHROMA_PORT: int = 8000
+    CHROMA_COLLECTION: str = "news"
+    VECTOR_STORE_BACKEND: str = "chroma"  # chroma, pgvector (기사와 같은 PostgreSQL에 저장)
+    PGVECTOR_DIMENSIONS: int = 1536  # news_embeddings.embedding 차원 (임베딩 백엔드의 출력 차원과 같아야 함)
+    PGVECTOR_EF_SEARCH: int = 100  # HNSW 검색 후보 수. 필터가 좁을수록 크게 잡아야 결과가 k개 채워짐
+    RETRIEVER_K: int = 8  # 질문당 검색할 후보 수 (프롬프트에는 context_builder가 고른 문서만 들어감)
+    RETRIEVER_MODE: str = "hybrid"  # hybrid (BM25 + 벡터, RRF), vector
+    RETRIEVER_FETCH_K: int = 20  # 융합 전 각 검색기에서 가져올 후보 수
+    RETRIEVER_WINDOW_DAYS: int = 30  # 기간을 지정하지 않은 질문의 검색 범위
+    BM25_REFRESH_SECONDS: float = 30.0  # BM25 색인 증분 갱신 주기
+    EMBED_BATCH_SIZE: int = 64  # 수집 후 임베딩 작업 하나가 처리할 기사 수
+    EMBED_MAX_RETRIES: int = 5  # 임베딩 배치 실패 시 재시도 횟수 (지수 백오프)
+    EMBED_RETRY_BACKOFF_MAX: int = 600  # 재시도 간격 상한 (초)
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 200_000  # Redis에 보관할 최대 임베딩 수 (LRU)
+
+    # 임베딩/LLM 백엔드 설정
+    EMBEDDING_BACKEND: str = "openai"  # openai, hashing (오프라인 로컬 임베딩)
+    LOCAL_EMBEDDING_DIM: int = 512
+    LLM_BACKEND: str = "openai"  # openai, stub (결정적 테스트용 응답)
+    LLM_MODEL: str = "gpt-4o"
+    STUB_LLM_TOKEN_DELAY: float = 0.0  # stub 백엔드의 토큰당 지연 (초)
+    LLM_MAX_CONCURRENCY: int = 8  # 동시에 진행할 수 있는 LLM 호출 수
+    LLM_MAX_QUEUE_WAIT: float = 5.0  # 자리를 기다리는 최대 시간 (초). 넘으면 503
+
+    # 프롬프트 문맥 설정
+    CONTEXT_TOKEN_BUDGET: int = 2000  # 검색 문서와 대화 기록에 쓸 최대 토큰 수
+    CONTEXT_HISTORY_SHARE: float = 0.25  # 예산 중 대화 기록에 쓸 수 있는 비율
+    CONTEXT_HISTORY_TURNS: int = 6  # 불러올 최근 대화 수
+    CONTEXT_MMR_LAMBDA: float = 0.7  # 1에 가까울수록 관련도, 0에 가까울수록 다양성 우선
+    CONTEXT_DUPLICATE_THRESHOLD: float = 0.9  # 이 유사도 이상인 문서는 중복으로 제외
+
+    # 트렌드 설정
+    TREND_BUCKET_MINUTES: int = 30  # 카운터 구간 크기이자 트렌드 저장 주기
+    TREND_RETENTION_DAYS: int = 7  # 카운터를 유지하는 기간
+    TREND_BATCH_SIZE: int = 1000  # 엔진이 한 번에 읽는 새 기사 수
+    # 기사 ID는 커밋이 아니라 INSERT 시점에 정해지므로, 늦게 커밋되는 작은 ID를 건너뛰지 않도록
+    # INSERT된 지 이 시간이 지나지 않은 기사부터는 다음 실행에서 셉니다 (크롤링 트랜잭션 최대 길이보다 길게).
+    TREND_WATERMARK_LAG_SECONDS: int = 300
+    TREND_DEFAULT_POINTS: int = 48  # /trends/trend-data가 카테고리별로 반환하는 기본 구간 수
+    TREND_MAX_POINTS: int = 500
+
+    # 형태소 분석 설정
+    MORPH_ANALYZER_PROCESSES: int = 2  # 분석기를 하나씩 가진 워커 프로세스 수. 0이면 현재 프로세스에서 분석
+    MORPH_ANALYZER_BATCH_SIZE: int = 32  # 워커에 한 번에 보내는 텍스트 수
+
+    # 동시 중복 요청 합치기 설정
+    SINGLE_FLIGHT_REDIS: bool = False  # 여러 워커에서 실행할 때 Redis 락으로 워커 간에도 합침
+    SINGLE_FLIGHT_LOCK_TTL: int = 120  # 계산 중인 워커가 죽었을 때 락이 풀리기까지의 시간 (초)
+    SINGLE_FLIGHT_WAIT_TIMEOUT: float = 120.0  # 다른 워커의 결과를 기다리는 최대 시간 (초)
+    SINGLE_FLIGHT_RESULT_TTL: int = 10  # 다른 워커가 가져갈 수 있도록 결과를 보관하는 시간 (초)
+
+    # 읽기 API 응답 캐시 설정 (/trends/, /trends/trend-data, /news/)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_SECONDS: int = 30 * 60  # 버전이 그대로여도 이 시간이 지나면 다시 계산 (기본 구간이 현재 시각 기준이므로)
+
+    # 답변 캐시 설정
+    ANSWER_CACHE_ENABLED: bool = True
+    ANSWER_CACHE_THRESHOLD: float = 0.85  # 이 코사인 유사도 이상이면 같은 질문으로 간주
+    ANSWER_CACHE_TTL_SECONDS: int = 60 * 60
+    ANSWER_CACHE_MAX_ENTRIES: int = 200  # 카테고리 집합당 최대 항목 수
+    ANSWER_CACHE_SKETCH_DIM: int = 64  # 후보를 고를 때 쓰는 축소 벡터 차원 (float16)
+    ANSWER_CACHE_RERANK: int = 4  # 축소 벡터로 고른 뒤 원래 벡터로 다시 비교하는 후보 수
 
     class Config:
         env_file = ".env"
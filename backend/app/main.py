@@ -2,6 +2,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import news, user, category, auth, trends, chat
 from app.services.scheduler import schedule_tasks
+from app.services.morph_analyzer import shutdown_morph_analyzer, warm_morph_analyzer
+from app.services.vector_store import check_vector_store
 from app.database import engine, Base
 from contextlib import asynccontextmanager
 from app.models.chat_history import ChatHistory
@@ -15,6 +17,15 @@ async def lifespan(app: FastAPI):
     # Base.metadata.create_all(bind=engine)
     # print("New tables created.")
 
+    # 임베딩 차원이 pgvector 테이블과 다르면 요청을 받기 전에 실패합니다.
+    check_vector_store()
+
+    # BM25 검색어 분석에 쓰는 형태소 분석기 워커를 미리 띄웁니다.
+    await warm_morph_analyzer()
+
+    # LLM 클라이언트와 답변 체인은 한 번만 만들어 요청 간에 공유합니다.
+    chat.init_chat_runtime(app)
+
     # 스케줄링 작업 시작
     schedule_tasks()
     print("Scheduler started.")
@@ -23,6 +34,7 @@ async def lifespan(app: FastAPI):
 
     print("Application shutdown: cleanup tasks...")
     # 필요한 종료 작업 수행
+    shutdown_morph_analyzer()
     print("Shutdown complete.")
 
 # Lifespan 핸들러를 FastAPI에 추가
@@ -1,7 +1,12 @@
 from app.models.news import News
+from app.models.news_category import NewsCategory
 from app.models.user import User
 from app.models.category import Category
 from app.models.chat_history import ChatHistory
 from app.models.user_category import UserCategory
 from app.models.user_preference import UserPreferences
-from app.models.trend import Trend
\ No newline at end of file
+from app.models.trend import Trend
+from app.models.news_embedding import NewsEmbedding
+from app.models.trend_bucket import TrendBucket
+from app.models.trend_watermark import TrendWatermark
+from app.models.trend_rollup import TrendRollup
\ No newline at end of file
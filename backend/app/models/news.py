@@ -1,9 +1,34 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Index, Computed, DDL, event, func
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import deferred
 from app.database import Base
 
+# 한글 구간을 2글자 단위(bigram)로 쪼갠 문자열을 반환하는 함수.
+# 'simple' 설정은 조사가 붙은 단어("반도체가")를 그대로 토큰화하므로, bigram을 함께 색인해 부분 일치를 지원합니다.
+NEWS_BIGRAMS_FUNCTION = """
+CREATE OR REPLACE FUNCTION news_hangul_bigrams(txt text) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT coalesce(string_agg(substr(word, i, 2), ' '), '')
+    FROM regexp_split_to_table(coalesce(txt, ''), '[^가-힣]+') AS word,
+         generate_series(1, char_length(word) - 1) AS i
+$$
+"""
+
+NEWS_SEARCH_VECTOR = (
+    "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, '')) || "
+    "to_tsvector('simple', news_hangul_bigrams(coalesce(title, '') || ' ' || coalesce(description, '')))"
+)
+
+
 class News(Base):
     __tablename__ = "news"
+    __table_args__ = (
+        # 최신순 목록/기간 필터 (published_at DESC, id DESC 역방향 스캔)
+        Index("ix_news_published_at_id", "published_at", "id"),
+        # 전문 검색 및 제목 유사도 검색
+        Index("ix_news_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_news_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -11,6 +36,14 @@ class News(Base):
     url = Column(String, unique=True, nullable=False)  # URL 필드 추가
     published_at = Column(DateTime, nullable=True)
     source = Column(String, nullable=True)
-    category = Column(String, nullable=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # 사용자 ID
-    user = relationship("User", back_populates="news")
+    category = Column(String, nullable=True)  # 처음 수집된 카테고리 (표시용). 소속 카테고리는 news_categories 참고
+    # 행이 INSERT된 시각 (서버 시계). 트렌드 엔진은 이 시각이 TREND_WATERMARK_LAG_SECONDS 이상 지난 기사까지만 워터마크를 옮깁니다.
+    inserted_at = Column(DateTime, nullable=False, server_default=func.clock_timestamp())
+    # 저장 시 자동으로 계산되는 검색용 tsvector (일반 조회에서는 불러오지 않음)
+    search_vector = deferred(Column(TSVECTOR, Computed(NEWS_SEARCH_VECTOR, persisted=True)))
+    # 제목과 설명의 명사별 등장 횟수 (수집 후 extract_news_nouns 작업이 한 번만 채움, BM25 색인어로 사용, 일반 조회에서는 불러오지 않음)
+    noun_counts = deferred(Column(JSONB, nullable=True))
+
+
+event.listen(News.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+event.listen(News.__table__, "before_create", DDL(NEWS_BIGRAMS_FUNCTION))
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index, text
+from datetime import datetime
+from app.database import Base
+
+class NewsCategory(Base):
+    """
+    기사와 카테고리의 연결. 기사는 한 번만 저장되고, 여러 카테고리에 연결될 수 있습니다.
+    사용자는 UserCategory를 통해 구독한 카테고리의 기사를 읽습니다.
+    """
+    __tablename__ = "news_categories"
+    __table_args__ = (
+        # 카테고리 → 기사 조회 (PK는 news_id가 선두 컬럼)
+        Index("ix_news_categories_category_id_news_id", "category_id", "news_id"),
+    )
+
+    news_id = Column(Integer, ForeignKey("news.id", ondelete="CASCADE"), primary_key=True)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    linked_at = Column(
+        DateTime, default=datetime.utcnow, server_default=text("timezone('utc', now())"), nullable=False
+    )
@@ -0,0 +1,31 @@
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, DDL, event
+from app.config import settings
+from app.database import Base
+
+
+class NewsEmbedding(Base):
+    """
+    기사 청크의 임베딩 (VECTOR_STORE_BACKEND=pgvector).
+    기사와 같은 DB에 저장되므로 기사 삭제 시 함께 지워지고, 카테고리/게시 시간 조건은 SQL 조인으로 적용됩니다.
+    한 가지 임베딩 모델(EMBEDDING_BACKEND)의 벡터만 저장하며, 차원은 PGVECTOR_DIMENSIONS 하나로 정해집니다
+    (마이그레이션도 같은 설정을 사용). 모델을 바꾸면 차원을 맞춰 테이블을 다시 만들고 reindex_news로 다시 채웁니다.
+    """
+    __tablename__ = "news_embeddings"
+    __table_args__ = (
+        # 코사인 거리 근사 최근접 검색
+        Index(
+            "ix_news_embeddings_embedding_hnsw", "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    )
+
+    news_id = Column(Integer, ForeignKey("news.id", ondelete="CASCADE"), primary_key=True)
+    chunk_index = Column(Integer, primary_key=True)
+    content = Column(String, nullable=False)
+    embedding = Column(Vector(settings.PGVECTOR_DIMENSIONS), nullable=False)
+
+
+event.listen(NewsEmbedding.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS vector"))
@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class Trend(Base):
     __tablename__ = "trends"
+    __table_args__ = (
+        # 사용자 + 카테고리 + 시간 범위 조회
+        Index("ix_trends_user_id_category_time", "user_id", "category", "time"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     category = Column(String, index=True)
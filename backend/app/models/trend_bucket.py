@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
+from app.database import Base
+
+
+class TrendBucket(Base):
+    """
+    카테고리 키워드가 기사에 등장한 횟수를 게시 시간 구간(TREND_BUCKET_MINUTES)별로 누적한 카운터.
+    트렌드 엔진이 새 기사만 반영해 갱신하고, TREND_RETENTION_DAYS가 지난 구간은 지웁니다.
+    """
+    __tablename__ = "trend_buckets"
+    __table_args__ = (
+        # 오래된 구간 정리
+        Index("ix_trend_buckets_bucket_start", "bucket_start"),
+    )
+
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
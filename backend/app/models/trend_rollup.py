@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey
+from app.database import Base
+
+
+class TrendRollup(Base):
+    """
+    트렌드 스냅샷(trends)을 시간/일 단위로 미리 합쳐둔 집계. 스케줄러가 트렌드를 저장할 때 갱신합니다.
+    구간 평균은 count_sum / samples로 계산하므로 더 큰 구간으로 다시 합쳐도 정확합니다.
+    """
+    __tablename__ = "trend_rollups"
+
+    # 기본 키 순서가 사용자 + 카테고리 + 해상도 + 시간 범위 조회 순서와 같음
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    category = Column(String, primary_key=True)
+    resolution = Column(String, primary_key=True)  # hour, day
+    bucket_start = Column(DateTime, primary_key=True)
+    count_sum = Column(BigInteger, nullable=False)
+    samples = Column(Integer, nullable=False)
+    count_max = Column(Integer, nullable=False)
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from app.database import Base
+
+
+class TrendWatermark(Base):
+    """
+    트렌드 엔진이 어느 기사(news.id)까지 반영했는지 기록합니다.
+    """
+    __tablename__ = "trend_watermarks"
+
+    name = Column(String, primary_key=True)
+    last_news_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=True)
@@ -9,6 +9,5 @@ class User(Base):
     username = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
 
-    news = relationship("News", back_populates="user")  # News와의 관계 설정
     trends = relationship("Trend", back_populates="user")  # Trend와의 관계 설정
     chat_history = relationship("ChatHistory", back_populates="user", cascade="all, delete-orphan")
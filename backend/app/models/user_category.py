@@ -1,8 +1,11 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index
 from app.database import Base
 
 class UserCategory(Base):
     __tablename__ = "user_categories"
+    __table_args__ = (
+        Index("ix_user_categories_user_id_category_id", "user_id", "category_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -8,8 +8,8 @@ from app.models.user import User
 from app.schemas.category import CategoryCreate, CategoryResponse
 from app.dependencies import get_current_user
 from app.services.news_crawler import crawl_news_from_naver
-from app.services.news_service import save_news_to_db
-from background.task import crawl_and_save_news
+from background.task import enqueue_crawl
+from app.services.cache_versions import bump_trend_keywords_version
 
 router = APIRouter()
 
@@ -44,13 +44,21 @@ async def create_category(
     if user_category:
         raise HTTPException(status_code=400, detail="Category already added by the user")
 
+    # 다른 구독자가 있으면 이미 스케줄러가 크롤링 중인 카테고리
+    result = await db.execute(
+        select(UserCategory.id).filter(UserCategory.category_id == existing_category.id).limit(1)
+    )
+    has_subscribers = result.first() is not None
+
     # 유저와 카테고리 연결
     user_category = UserCategory(user_id=user.id, category_id=existing_category.id)
     db.add(user_category)
     await db.commit()
+    bump_trend_keywords_version()
 
-    # 뉴스 크롤링 작업 트리거
-    crawl_and_save_news.delay(existing_category.name, user.id)
+    # 첫 구독자일 때만 뉴스 크롤링 작업 트리거 (기사는 카테고리 단위로 공유)
+    if not has_subscribers:
+        enqueue_crawl(existing_category.name)
 
     return existing_category
 
@@ -93,5 +101,6 @@ async def delete_user_category(
     # 유저-카테고리 연결 삭제
     await db.delete(user_category)
     await db.commit()
+    bump_trend_keywords_version()
 
     return {"message": "Category removed successfully"}
@@ -1,187 +1,228 @@
-from fastapi import APIRouter, HTTPException, Depends
+import asyncio
+import json
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, FastAPI, Request
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.services.chat_service import save_chat_message, get_chat_history, delete_chat_history
-from app.services.rag_chain import build_rag_chain
-from app.database import async_get_db
-from app.services.redis_client import redis_client
-import pickle
-from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings
-from app.database import SessionLocal
 from sqlalchemy.future import select
-from app.models.news import News
+from app.services.chat_service import save_chat_message, get_chat_history, delete_chat_history
+from app.services.vector_store import embedding_cache_stats
+from app.services.retrieval import news_retriever
+from app.database import async_get_db, async_session
 from app.models.user import User
+from app.models.user_category import UserCategory
 from app.dependencies import get_current_user
-
-
-
-
-
-# 임시
-
-import psycopg2
-from langchain.schema import Document
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
-from langchain_chroma import Chroma
+from app.services.llm_backends import get_chat_model
+from app.services.answer_cache import get_answer_cache
+from app.services.context_builder import RAG_PROMPT_TEMPLATE, build_context
+from app.services.llm_gate import LLMGate, LLMSaturatedError, LLMSlot
+from app.services.single_flight import SingleFlight
+from app.config import settings
 from langchain_core.prompts import PromptTemplate
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.runnables import RunnableLambda
 from langchain_core.output_parsers import StrOutputParser
-from dotenv import load_dotenv
-import os
 
-load_dotenv()
 
-db_config = {
-    "dbname": "newspulse_db",  
-    "user": "newspulse_user",        
-    "password": "bV0_cCo-",    
-    "host": "localhost",            
-    "port": "5432"              
-}
-
-def fetch_news_from_db(user_id):
+def create_answer_chain():
     """
-    PostgreSQL 데이터베이스에서 'news' 테이블의 데이터를 가져옵니다.
+    {"context", "question", "history"}을 받아 답변 문자열을 생성하는 체인.
     """
-    
-    db: AsyncSession = SessionLocal()
-
-    try:
-        # "news" 테이블에서 title과 description 가져오기
-        result = db.execute(select(News).filter(News.user_id == user_id))
-        rows = [r for r in result.all()]
-        
-        print(f"DOCUMENT len : {len(rows)}")
-
-        # 데이터를 LangChain Document 형식으로 변환
-        documents = [
-            Document(page_content=f"Title: {row[0].title}\n\nDescription: {row[0].description}")
-            for row in rows
-        ]
-    except Exception as e:
-        print(e)
+    prompt = PromptTemplate.from_template(RAG_PROMPT_TEMPLATE)
+    return prompt | get_chat_model() | StrOutputParser()
 
-    return documents
 
-def setup_vectorstore(documents):
+def create_rag_chain(retriever, history=()):
     """
-    크롤링된 문서를 기반으로 LangChain의 벡터스토어를 생성합니다.
+    RAG 체인을 생성합니다. 검색된 문서는 context_builder가 토큰 예산 안에서 중복 없이 고릅니다.
     """
-    # 텍스트 분리
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-    splits = text_splitter.split_documents(documents)
+    def prompt_inputs(question: str) -> dict:
+        return build_context(question, retriever.invoke(question), history).prompt_inputs()
 
-    # 벡터스토어 생성
-    vectorstore = Chroma.from_documents(documents=splits, embedding=OpenAIEmbeddings())
-    return vectorstore
+    return RunnableLambda(prompt_inputs) | create_answer_chain()
 
-def format_docs(docs):
-    """
-    검색된 문서를 문자열로 포맷팅합니다.
-    """
-    return "\n\n".join(doc.page_content for doc in docs)
 
-def create_rag_chain(vectorstore):
+def init_chat_runtime(app: FastAPI):
     """
-    RAG 체인을 생성합니다.
+    LLM 클라이언트(연결 풀)와 답변 체인을 한 번만 만들어 app.state에 공유합니다. lifespan에서 호출됩니다.
     """
-    # 리트리버 설정
-    retriever = vectorstore.as_retriever()
+    app.state.answer_chain = create_answer_chain()
+    app.state.llm_gate = LLMGate()
+
 
-    # 프롬프트 설정
-    prompt_template = """You are an assistant for question-answering tasks. Use the following pieces of retrieved context to answer the question. If you don't know the answer, just say that you don't know. Use three sentences maximum and keep the answer concise.
+async def acquire_llm_slot(gate: LLMGate) -> LLMSlot:
+    try:
+        return await gate.acquire()
+    except LLMSaturatedError:
+        print(f"LLM gate saturated, rejecting chat request: {gate.stats()}")
+        raise HTTPException(
+            status_code=503,
+            detail="Too many chat requests. Please retry shortly.",
+            headers={"Retry-After": str(max(1, int(gate.max_queue_wait)))},
+        )
+
+
+async def retrieve_context(retriever, question: str, history=()):
+    docs = await retriever.ainvoke(question)
+    built = build_context(question, docs, history)
+    print(
+        f"Chat context: {len(built.documents)}/{len(docs)} docs, {built.history_turns} history turns, "
+        f"{built.prompt_tokens} prompt tokens"
+    )
+    return built
 
-    Question: {question} 
 
-    Context: {context} 
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
-    Answer:
+
+async def save_chat_exchange(user_id: int, question: str, answer_parts: list[str], cache_scope: str = None):
+    """
+    스트리밍이 끝난 뒤 질문과 완성된 답변을 저장합니다.
+    요청 세션은 응답 전송 후 닫히므로 새 세션을 사용합니다.
+    cache_scope가 주어지면 답변을 답변 캐시에도 저장합니다.
     """
-    prompt = PromptTemplate.from_template(prompt_template)
-    
-    print("중간 검검  : ", retriever)
+    if not answer_parts:
+        return
+    answer = "".join(answer_parts)
+    async with async_session() as db:
+        await save_chat_message(db, user_id, question, is_user=True)
+        await save_chat_message(db, user_id, answer, is_user=False)
+    if cache_scope:
+        await asyncio.to_thread(get_answer_cache().store, cache_scope, question, answer)
 
-    # RAG 체인 생성
-    rag_chain = (
-        {"context": retriever | format_docs, "question": RunnablePassthrough()}
-        | prompt
-        | ChatOpenAI(model="gpt-4o", temperature=0, max_tokens=None)
-        | StrOutputParser()
-    )
-    return rag_chain
 
+async def stream_cached_answer(answer: str):
+    yield sse_event("context", [])
+    yield sse_event("token", answer)
+    yield sse_event("done", {"response": answer, "cached": True, "prompt_tokens": 0})
 
-# 임시
+
+async def stream_answer(answer_chain, slot: LLMSlot, retriever, question: str, answer_parts: list[str], history=()):
+    """
+    프롬프트에 들어갈 문서를 먼저(context 이벤트) 보낸 뒤, 생성되는 토큰을 token 이벤트로 보냅니다.
+    스트림이 끝나거나 중단되면 LLM 호출 자리를 반납합니다.
+    """
+    try:
+        built = await retrieve_context(retriever, question, history)
+        yield sse_event("context", [
+            {"news_id": doc.metadata.get("news_id"), "content": doc.page_content} for doc in built.documents
+        ])
+        async for token in answer_chain.astream(built.prompt_inputs()):
+            answer_parts.append(token)
+            yield sse_event("token", token)
+        yield sse_event("done", {"response": "".join(answer_parts), "prompt_tokens": built.prompt_tokens})
+    except Exception as e:
+        print(f"Error during streaming chat response: {e}")
+        answer_parts.clear()
+        yield sse_event("error", {"detail": "Failed to generate answer."})
+    finally:
+        slot.release()
 
 router = APIRouter()
+chat_flight = SingleFlight("chat")
 
 
 @router.post("/query")
-async def query(user_id: int, question: str, db: AsyncSession = Depends(async_get_db), user: User = Depends(get_current_user)):
-    """
-    Handles user queries and returns answers using the RAG chain mechanism with hardcoded context.
-    """
-    # persist_directory = redis_client.get(f"user_vectorstore:{user_id}")
-    # if not persist_directory:
-    #     raise HTTPException(status_code=404, detail="Vector store not found in Redis.")
-
-    # # VectorStore Load
-    # vectorstore = Chroma(
-    #     collection_name=f"user_{user_id}_news",
-    #     persist_directory=persist_directory.decode("utf-8"),
-    #     embedding_function=OpenAIEmbeddings(),
-    # )
-
-    # # Build RAG Chain
-    # try:
-    #     rag_chain = build_rag_chain(vectorstore)
-    # except Exception as e:
-    #     print(f"Error building RAG chain: {e}")
-    #     raise HTTPException(status_code=500, detail="Failed to build RAG chain.")
-
-    # # Hardcoded context and question
-    # hardcoded_context = (
-    #     "돼지등뼈콩국 연잎밥 합자젓국 장어탕…전 세계인의 입맛을 사로잡은 '한국인의 밥상'\n\n"
-    #     "오늘 레스 씨가 배울 요리는 평창에서 즐겨 먹는 돼지등뼈콩국! 돼지 뼈를 푹 고아 살을 "
-    #     "일일이 발라내는 건 물론, 물에 불려 곱게 간 콩과 초벌 양념한 배추를 넣고 정성스레 끓여낸다."
-    # )
-    # hardcoded_question = "돼지등뼈콩국이란 무엇인가?"
-
-    # # Test Input Data
-    # input_data = {"context": hardcoded_context, "question": hardcoded_question}
-    # print(f"Test Input for RAG Chain: {input_data}")
-
-    # try:
-    #     # Debugging input processing
-    #     formatted_context = input_data["context"]
-    #     formatted_question = input_data["question"]
-    #     print(f"Formatted Context: {formatted_context}")
-    #     print(f"Formatted Question: {formatted_question}")
-
-    #     # Ensure the input data is correct for invoke
-    #     print("Running rag_chain.invoke...")
-    #     answer = rag_chain.invoke({
-    #         "context": formatted_context,
-    #         "question": formatted_question,
-    #     })
-
-    # except Exception as e:
-    #     print(f"Error during RAG chain execution: {e}")
-    #     raise HTTPException(status_code=500, detail="Failed to execute RAG chain.")
-
-    # await save_chat_message(db, user_id, hardcoded_question, is_user=True)
-    # await save_chat_message(db, user_id, answer, is_user=False)
-    
-    documents = fetch_news_from_db(user.id)
-    print(len(documents))
-    print(documents)
-    vectorstore = setup_vectorstore(documents)
-    rag_chain = create_rag_chain(vectorstore)
-    answer = rag_chain.invoke(question)
-
-    return {"response": answer}
-
+async def query(
+    request: Request,
+    user_id: int,
+    question: str,
+    stream: bool = False,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    db: AsyncSession = Depends(async_get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    사용자가 구독한 카테고리의 기사만 영구 벡터 컬렉션에서 검색해 답변합니다.
+    기사 임베딩은 수집 시점에 Celery 작업에서 미리 계산됩니다.
+    stream=true이면 server-sent events(context → token... → done)로 응답하고,
+    완성된 답변은 스트림이 끝난 뒤 백그라운드에서 저장합니다.
+    같은 카테고리 집합에서 비슷한 질문에 대한 답변이 캐시되어 있으면 검색과 LLM 호출 없이 바로 반환합니다.
+    기간(start_time, end_time)을 지정하지 않으면 최근 RETRIEVER_WINDOW_DAYS일의 기사만 검색합니다.
+    검색된 문서와 최근 대화는 CONTEXT_TOKEN_BUDGET 안에서 조립되며, 사용한 프롬프트 토큰 수를 함께 반환합니다.
+    동시에 진행되는 LLM 호출은 LLM_MAX_CONCURRENCY개로 제한되고, LLM_MAX_QUEUE_WAIT초 안에 자리가 나지 않으면 503을 반환합니다.
+    스트리밍이 아닌 요청은 같은 사용자의 동시 중복 질문을 한 번의 계산으로 합칩니다.
+    """
+    answer_chain = request.app.state.answer_chain
+    llm_gate = request.app.state.llm_gate
+
+    result = await db.execute(select(UserCategory.category_id).filter(UserCategory.user_id == user.id))
+    category_ids = result.scalars().all()
+    if not category_ids:
+        raise HTTPException(status_code=404, detail="No subscribed categories.")
+
+    since = start_time or datetime.utcnow() - timedelta(days=settings.RETRIEVER_WINDOW_DAYS)
+
+    # 기간을 직접 지정한 질문은 답변이 기간마다 달라지므로 캐시하지 않습니다.
+    use_cache = settings.ANSWER_CACHE_ENABLED and start_time is None and end_time is None
+    answer_cache = get_answer_cache() if use_cache else None
+    cache_scope, cached = None, None
+    if answer_cache:
+        # 질문 임베딩(OpenAI 등)과 Redis 조회는 블로킹 호출이므로 스레드에서 실행합니다.
+        cache_scope = await asyncio.to_thread(answer_cache.scope, category_ids)
+        cached = await asyncio.to_thread(answer_cache.lookup, cache_scope, question)
+
+    if stream:
+        background = BackgroundTasks()
+        if cached is not None:
+            body = stream_cached_answer(cached)
+            background.add_task(save_chat_exchange, user.id, question, [cached])
+        else:
+            answer_parts = []
+            history = await get_chat_history(db, user.id, settings.CONTEXT_HISTORY_TURNS)
+            retriever = news_retriever(category_ids, since, end_time)
+            slot = await acquire_llm_slot(llm_gate)
+            body = stream_answer(answer_chain, slot, retriever, question, answer_parts, history)
+            # 스트림이 시작되기 전에 연결이 끊긴 경우에도 자리가 반납되도록 합니다 (release는 한 번만 동작).
+            background.add_task(slot.release)
+            background.add_task(save_chat_exchange, user.id, question, answer_parts, cache_scope)
+        return StreamingResponse(
+            body,
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            background=background,
+        )
+
+    async def answer_question() -> dict:
+        # 요청이 끝나면 닫히는 요청 세션(db) 대신 자체 세션을 엽니다.
+        # 먼저 온 요청이 취소되어도 함께 기다리는 요청들이 이 계산의 결과를 받기 때문입니다.
+        async with async_session() as flight_db:
+            prompt_tokens = 0
+            if cached is not None:
+                answer = cached
+            else:
+                history = await get_chat_history(flight_db, user.id, settings.CONTEXT_HISTORY_TURNS)
+                built = await retrieve_context(news_retriever(category_ids, since, end_time), question, history)
+                slot = await acquire_llm_slot(llm_gate)
+                try:
+                    answer = await answer_chain.ainvoke(built.prompt_inputs())
+                finally:
+                    slot.release()
+                prompt_tokens = built.prompt_tokens
+                if answer_cache:
+                    await asyncio.to_thread(answer_cache.store, cache_scope, question, answer)
+
+            await save_chat_message(flight_db, user.id, question, is_user=True)
+            await save_chat_message(flight_db, user.id, answer, is_user=False)
+
+        return {"response": answer, "cached": cached is not None, "prompt_tokens": prompt_tokens}
+
+    # 같은 사용자의 같은 질문이 동시에 들어오면 한 번만 계산하고 결과를 함께 돌려줍니다.
+    return await chat_flight.do(f"{user.id}:{start_time}:{end_time}:{question.strip()}", answer_question)
+
+
+@router.get("/cache-stats")
+async def cache_stats(user: User = Depends(get_current_user)):
+    """
+    임베딩 캐시와 답변 캐시의 적중/미적중 통계를 반환합니다.
+    """
+    return {
+        "embeddings": embedding_cache_stats(),
+        "answers": get_answer_cache().stats() if settings.ANSWER_CACHE_ENABLED else {"enabled": False},
+    }
 
 
 @router.delete("/chat-history")
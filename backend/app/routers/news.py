@@ -1,23 +1,138 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.services.news_service import fetch_news_from_api, save_news_to_db
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.database import async_get_db
+from app.services.news_service import fetch_news_from_api
 from app.config import settings
 from app.models.news import News
-from app.services.news_crawler import crawl_news_from_naver
+from app.services.news_query import category_news_condition
+from app.services.pagination import encode_cursor, decode_cursor
+from app.schemas.news import NewsPage, NewsResponse, NewsSearchPage
+from app.services.news_search import query_tokens, search_news_query, highlight
+from app.services.response_cache import ResponseCache
+from app.services.cache_versions import get_news_version
+from background.task import enqueue_crawl
 
 
 router = APIRouter()
+news_cache = ResponseCache("news")
+
+
+def _after_cursor(position: dict):
+    """
+    (published_at DESC, id DESC) 순서에서 커서 위치 다음 행들을 고르는 keyset 조건.
+    PostgreSQL의 DESC 정렬은 NULL이 먼저 오므로 published_at이 없는 기사를 따로 처리합니다.
+    """
+    news_id = int(position["id"])
+    if position.get("published_at") is None:
+        return or_(
+            and_(News.published_at.is_(None), News.id < news_id),
+            News.published_at.isnot(None),
+        )
+    published_at = datetime.fromisoformat(position["published_at"])
+    return tuple_(News.published_at, News.id) < tuple_(published_at, news_id)
+
+
+@router.get("/", response_model=NewsPage)
+async def get_news(
+    request: Request,
+    category: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(5, ge=1, le=100),
+    db: AsyncSession = Depends(async_get_db),
+):
+    """
+    최신순 뉴스 목록을 커서 기반으로 페이지네이션해 반환합니다.
+    응답의 next_cursor를 다음 요청의 cursor로 넘기면 이어지는 페이지를 받을 수 있습니다.
+    응답은 새 기사가 저장될 때까지 캐시됩니다 (ETag 지원).
+    """
+    async def fetch_page():
+        query = select(News)
+        if category:
+            query = query.filter(category_news_condition(category))
+        if start_time:
+            query = query.filter(News.published_at >= start_time)
+        if end_time:
+            query = query.filter(News.published_at <= end_time)
+        if cursor:
+            try:
+                query = query.filter(_after_cursor(decode_cursor(cursor)))
+            except (ValueError, KeyError, TypeError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        # 다음 페이지 존재 여부 확인을 위해 하나 더 조회
+        query = query.order_by(News.published_at.desc(), News.id.desc()).limit(limit + 1)
+        result = await db.execute(query)
+        items = result.scalars().all()
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            next_cursor = encode_cursor({
+                "published_at": last.published_at.isoformat() if last.published_at else None,
+                "id": last.id,
+            })
+
+        return NewsPage(items=items, next_cursor=next_cursor)
+
+    return await news_cache.respond(request, fetch_page, version=get_news_version())
+
+@router.get("/search", response_model=NewsSearchPage)
+async def search_news(
+    q: str = Query(..., min_length=1, description="검색어"),
+    category: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(async_get_db),
+):
+    """
+    저장된 기사를 전문 검색합니다. 크롤러를 호출하지 않습니다.
+    결과는 관련도순이며, 응답의 next_cursor로 다음 페이지를 요청할 수 있습니다.
+    """
+    if not query_tokens(q):
+        raise HTTPException(status_code=400, detail="Query must contain letters or digits")
+
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+            float(after["rank"]), int(after["id"])
+        except (ValueError, KeyError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    result = await db.execute(search_news_query(q, category, after, limit + 1))
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_news, last_rank = rows[-1]
+        next_cursor = encode_cursor({"rank": last_rank, "id": last_news.id})
+
+    items = [
+        {
+            **NewsResponse.model_validate(news).model_dump(),
+            "rank": rank,
+            "highlighted_title": highlight(news.title, q),
+            "highlighted_description": highlight(news.description, q, snippet=True),
+        }
+        for news, rank in rows
+    ]
+    return {"items": items, "next_cursor": next_cursor}
 
-@router.get("/")
-def get_news(category: str = None, limit = 5, db: Session = Depends(get_db)):
-    query = db.query(News).order_by(News.published_at.desc())
-    if category:
-        query = query.filter(News.category == category)
-    return query.limit(limit).all()
 
 @router.post("/fetch")
 def fetch_news(category: str = "general", limit: int = 10):
-    data = crawl_news_from_naver(category, limit)
-    save_news_to_db(data, category)
-    return {"status": "success", "fetched": len(data)}
+    """
+    카테고리 크롤링을 Celery 파이프라인(크롤링 → 임베딩/명사 집계)으로 보냅니다.
+    스케줄러와 같은 경로를 타므로 증분 크롤링 상태가 갱신되고, 저장된 기사는 채팅 검색에도 반영됩니다.
+    """
+    result = enqueue_crawl(category, limit)
+    return {"status": "queued", "task_id": result.id}
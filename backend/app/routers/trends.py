@@ -1,129 +1,122 @@
-from fastapi import APIRouter, Query, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Query, Depends, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
 from datetime import datetime, timedelta
 from typing import List, Optional
 
-from app.database import get_db, async_get_db  # 데이터베이스 세션 의존성
+from app.database import async_get_db, async_session  # 데이터베이스 세션 의존성
 from app.models.trend import Trend  # Trend 모델 가져오기
-from app.services.trend_service import update_trends  # 트렌드 업데이트 함수 가져오기
+from app.services.trend_service import update_trends, trend_series  # 트렌드 업데이트/조회 함수 가져오기
 from app.dependencies import get_current_user
 from app.models.user import User
+from app.config import settings
 from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.single_flight import SingleFlight
+from app.services.response_cache import ResponseCache
+from app.services.cache_versions import get_trends_version
 
 router = APIRouter()
+trend_update_flight = SingleFlight("trends-update")
+trends_cache = ResponseCache("trends")
+trend_data_cache = ResponseCache("trend-data")
 
 @router.get("/")
-def get_trends(
+async def get_trends(
+    request: Request,
     categories: Optional[List[str]] = Query(None),
     start_time: Optional[datetime] = None,
     end_time: Optional[datetime] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(async_get_db),
     user: User = Depends(get_current_user),
 ):
-    print(f"Authenticated User ID: {user.id}")  # 사용자 ID 디버깅
-    query = db.query(Trend).filter(Trend.user_id == user.id)  # 사용자 ID로 필터링
+    """
+    사용자의 트렌드 목록. 응답은 트렌드가 새로 저장될 때까지 캐시됩니다 (ETag 지원).
+    """
+    async def fetch_trends():
+        query = select(Trend).filter(Trend.user_id == user.id)  # 사용자 ID로 필터링
 
-    # 카테고리 필터 적용
-    if categories:
-        print(f"Filtering categories: {categories}")
-        query = query.filter(Trend.category.in_(categories))
+        # 카테고리 필터 적용
+        if categories:
+            query = query.filter(Trend.category.in_(categories))
 
-    # 시간 필터 적용
-    if start_time:
-        print(f"Filtering from start_time: {start_time}")
-        query = query.filter(Trend.time >= start_time)
-    if end_time:
-        print(f"Filtering until end_time: {end_time}")
-        query = query.filter(Trend.time <= end_time)
+        # 시간 필터 적용
+        if start_time:
+            query = query.filter(Trend.time >= start_time)
+        if end_time:
+            query = query.filter(Trend.time <= end_time)
 
-    trends = query.all()
-    print(f"Fetched Trends: {trends}")  # 조회된 트렌드 디버깅
+        trends = (await db.execute(query)).scalars().all()
 
-    if not trends:
-        raise HTTPException(status_code=404, detail="No trends found")
+        if not trends:
+            raise HTTPException(status_code=404, detail="No trends found")
 
-    return trends
+        return trends
 
+    return await trends_cache.respond(request, fetch_trends, user.id, get_trends_version(user.id))
 
 
 @router.post("/update/")
 async def update_and_get_trends(
     categories: List[str],
-    db: AsyncSession = Depends(async_get_db),
     user: User = Depends(get_current_user),
 ):
     """
     트렌드 데이터를 업데이트하고 결과를 반환하는 엔드포인트.
+    같은 사용자가 같은 카테고리로 동시에 요청하면 업데이트는 한 번만 실행되고 결과를 함께 받습니다.
     """
-    try:
-        # 트렌드 업데이트
-        await update_trends(db, categories, user_id=user.id)
-        
-        # 업데이트된 트렌드 조회
-        result = await db.execute(
-            select(Trend).filter(Trend.category.in_(categories), Trend.user_id == user.id)
-        )
-        updated_trends = result.scalars().all()
+    async def update_and_fetch() -> dict:
+        # 먼저 온 요청이 취소되어도 계산이 이어지도록 요청 세션 대신 자체 세션을 사용합니다.
+        async with async_session() as flight_db:
+            # 트렌드 업데이트
+            await update_trends(flight_db, categories, user_id=user.id)
+
+            # 업데이트된 트렌드 조회
+            result = await flight_db.execute(
+                select(Trend).filter(Trend.category.in_(categories), Trend.user_id == user.id)
+            )
+            updated_trends = result.scalars().all()
 
         if not updated_trends:
             return {"message": "Trends updated successfully, but no trends found in the database."}
 
-        return {"message": "Trends updated successfully", "trends": updated_trends}
+        return {"message": "Trends updated successfully", "trends": jsonable_encoder(updated_trends)}
+
+    try:
+        return await trend_update_flight.do(f"{user.id}:{sorted(set(categories))}", update_and_fetch)
     except Exception as e:
         print(e)
         raise HTTPException(status_code=500, detail=f"Failed to update trends: {str(e)}")
 
 
 @router.get("/trend-data")
-def get_trend_data(
+async def get_trend_data(
+    request: Request,
     categories: Optional[List[str]] = Query(None, description="조회할 카테고리 목록"),
-    interval_minutes: int = Query(60, description="시간 간격 (분 단위, 기본값: 60분)"),
+    interval_minutes: int = Query(60, ge=1, description="시간 간격 (분 단위, 기본값: 60분)"),
     end_time: Optional[datetime] = Query(None, description="종료 시간 (기본값: 현재 시간)"),
-    db: Session = Depends(get_db),
+    points: int = Query(settings.TREND_DEFAULT_POINTS, ge=1, le=settings.TREND_MAX_POINTS, description="카테고리별 최대 구간 수"),
+    db: AsyncSession = Depends(async_get_db),
     user: User = Depends(get_current_user),
 ):
     """
-    특정 카테고리와 시간 간격에 따라 트렌드 데이터를 필터링하여 반환합니다.
+    특정 카테고리와 시간 간격에 따라 트렌드 데이터를 구간별 평균으로 묶어 반환합니다.
     - categories: 카테고리 목록 (예: 경제, 정치)
     - interval_minutes: 시간 간격 (분 단위, 기본값: 60분)
     - end_time: 종료 시간 (기본값: 현재 시간)
+    - points: 카테고리별 최대 구간 수. 긴 기간은 시간/일 롤업(trend_rollups)에서 읽습니다.
+    응답은 트렌드가 새로 저장될 때까지 캐시됩니다 (ETag 지원).
     """
     if not end_time:
         end_time = datetime.utcnow()
     start_time = end_time - timedelta(minutes=interval_minutes)
 
-    query = db.query(Trend).filter(Trend.user_id == user.id)  # 사용자 ID로 필터링
-
-    # 카테고리 필터 적용
-    if categories:
-        query = query.filter(Trend.category.in_(categories))
-
-    # 시간 범위 필터 적용
-    query = query.filter(Trend.time >= start_time, Trend.time <= end_time)
-
-    # 데이터 조회
-    trends = query.all()
-
-    if not trends:
+    async def fetch_trend_data():
+        step, result = await trend_series(db, user.id, start_time, end_time, points, categories)
         return {
             "interval_start": start_time,
             "interval_end": end_time,
-            "data": [],
+            "bucket_minutes": int(step.total_seconds() // 60),
+            "data": result or [],
         }
 
-    # 데이터 그룹화 및 응답 형식 정리
-    result = {}
-    for trend in trends:
-        if trend.category not in result:
-            result[trend.category] = []
-        result[trend.category].append({
-            "time": trend.time,
-            "count": trend.count,
-        })
-
-    return {
-        "interval_start": start_time,
-        "interval_end": end_time,
-        "data": result,
-    }
+    return await trend_data_cache.respond(request, fetch_trend_data, user.id, get_trends_version(user.id))
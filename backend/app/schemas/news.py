@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class NewsResponse(BaseModel):
+    id: int
+    title: str
+    description: str
+    url: str
+    published_at: Optional[datetime]
+    source: Optional[str]
+    category: Optional[str]
+
+    class Config:
+        from_attributes = True
+
+
+class NewsPage(BaseModel):
+    items: list[NewsResponse]
+    next_cursor: Optional[str] = None
+
+
+class NewsSearchHit(NewsResponse):
+    rank: float
+    highlighted_title: str
+    highlighted_description: str
+
+
+class NewsSearchPage(BaseModel):
+    items: list[NewsSearchHit]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,212 @@
+import hashlib
+import json
+import re
+import threading
+import time
+
+import numpy as np
+import redis
+from langchain_core.embeddings import Embeddings
+
+from app.config import settings
+from app.services.cache_versions import get_category_versions
+from app.services.llm_backends import HashingEmbeddings
+from app.services.redis_client import redis_client
+from app.services.vector_store import get_embeddings
+
+WORD_RE = re.compile(r"\w+")
+_projections: dict[tuple[int, int], np.ndarray] = {}
+
+
+def sketch_projection(dim: int, sketch_dim: int) -> np.ndarray:
+    """
+    dim차원 벡터를 sketch_dim차원으로 줄이는 랜덤 투영 행렬. 모든 프로세스에서 같도록 시드를 고정합니다.
+    """
+    key = (dim, sketch_dim)
+    if key not in _projections:
+        rng = np.random.default_rng(0)
+        _projections[key] = (rng.standard_normal((dim, sketch_dim)) / np.sqrt(sketch_dim)).astype(np.float32)
+    return _projections[key]
+
+
+class AnswerCache:
+    """
+    반복되는 채팅 질문을 위한 의미 기반 답변 캐시.
+
+    - 범위(scope): 사용자가 구독한 카테고리 집합과 각 카테고리의 캐시 버전.
+      같은 카테고리를 구독한 사용자끼리 답변을 공유하고, 카테고리에 새 기사가 들어와
+      버전이 바뀌면(bump_category_versions) 이전 항목은 조회되지 않다가 TTL로 사라집니다.
+    - 범위마다 질문 벡터(`answer:{scope}:vectors`), 답변(`answer:{scope}:answers`),
+      정규화한 질문 해시(`answer:{scope}:questions`)를 저장합니다.
+      같은 질문(대소문자/공백/문장부호 차이만 있는 질문)은 해시로 바로 찾고, 아니면 코사인 유사도가
+      ANSWER_CACHE_THRESHOLD 이상인 가장 가까운 질문의 답변을 돌려줍니다.
+    - 조회할 때마다 모든 질문 벡터(1536차원 float32면 항목당 6KB)를 읽지 않도록, 고정된 랜덤 투영으로 줄인
+      ANSWER_CACHE_SKETCH_DIM차원 float16 벡터(`answer:{scope}:sketches`, 항목당 128바이트)로 후보를 고르고
+      상위 ANSWER_CACHE_RERANK개만 원래 벡터를 읽어 임계값과 비교합니다.
+    - 질문 임베딩은 검색과 같은 의미 임베딩(get_embeddings, Redis 캐시)을 사용합니다.
+      로컬 hashing 임베딩은 단어 겹침만 보므로("증가한 이유" vs "감소한 이유") 이 경우에는 같은 질문만 적중합니다.
+    Redis 오류 시에는 캐시 없이 동작합니다.
+    """
+
+    STATS_KEY = "answer:stats"
+
+    def __init__(
+        self,
+        embeddings: Embeddings = None,
+        client: redis.Redis = None,
+        threshold: float = None,
+        ttl: int = None,
+        max_entries: int = None,
+        sketch_dim: int = None,
+        rerank: int = None,
+    ):
+        self.embeddings = embeddings or get_embeddings()
+        self.semantic = not isinstance(self.embeddings, HashingEmbeddings)
+        self.redis = client or redis_client
+        self.threshold = threshold or settings.ANSWER_CACHE_THRESHOLD
+        self.ttl = ttl or settings.ANSWER_CACHE_TTL_SECONDS
+        self.max_entries = max_entries or settings.ANSWER_CACHE_MAX_ENTRIES
+        self.sketch_dim = sketch_dim or settings.ANSWER_CACHE_SKETCH_DIM
+        self.rerank = rerank or settings.ANSWER_CACHE_RERANK
+        self.hits = 0
+        self.misses = 0
+
+    def scope(self, category_ids: list[int]):
+        """
+        카테고리 집합과 현재 버전으로 캐시 범위 키를 만듭니다. Redis 오류 시 None을 반환합니다.
+        """
+        try:
+            versions = get_category_versions(category_ids, self.redis)
+        except redis.RedisError as e:
+            print(f"Error reading category cache versions: {e}")
+            return None
+        raw = ",".join(f"{category_id}:{version}" for category_id, version in versions.items())
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _question_key(question: str) -> str:
+        # 대소문자, 공백, 문장부호 차이는 무시
+        return hashlib.sha1(" ".join(WORD_RE.findall(question.lower())).encode("utf-8")).hexdigest()
+
+    def _vector(self, question: str) -> np.ndarray:
+        return np.asarray(self.embeddings.embed_query(question.strip()), dtype=np.float32)
+
+    def _sketch(self, vector: np.ndarray) -> np.ndarray:
+        sketch = vector @ sketch_projection(len(vector), self.sketch_dim)
+        norm = np.linalg.norm(sketch)
+        return (sketch / norm if norm else sketch).astype(np.float16)
+
+    def _nearest(self, scope: str, vector: np.ndarray):
+        # 축소 벡터로 후보를 고르고, 후보의 원래 벡터로 임계값 이상인 가장 가까운 항목을 찾습니다.
+        sketches = self.redis.hgetall(f"answer:{scope}:sketches")
+        if not sketches:
+            return None
+        entry_ids = list(sketches)
+        matrix = np.frombuffer(b"".join(sketches.values()), dtype=np.float16).reshape(len(entry_ids), -1)
+        approx = matrix.astype(np.float32) @ self._sketch(vector).astype(np.float32)
+        candidates = [entry_ids[index] for index in np.argsort(-approx)[: self.rerank]]
+
+        best_id, best_score = None, self.threshold
+        for entry_id, value in zip(candidates, self.redis.hmget(f"answer:{scope}:vectors", candidates)):
+            if value is None:
+                continue
+            score = float(np.dot(vector, np.frombuffer(value, dtype=np.float32)))
+            if score >= best_score:
+                best_id, best_score = entry_id, score
+        return best_id
+
+    def _record(self, hit: bool):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        try:
+            self.redis.hincrby(self.STATS_KEY, "hits" if hit else "misses", 1)
+        except redis.RedisError as e:
+            print(f"Error updating answer cache stats: {e}")
+
+    def lookup(self, scope: str, question: str):
+        """
+        Returns:
+            str | None: 범위 안에서 충분히 비슷한 질문에 대해 저장된 답변. 없으면 None.
+        """
+        if scope is None:
+            return None
+        try:
+            best_id = self.redis.hget(f"answer:{scope}:questions", self._question_key(question))
+            if best_id is None and self.semantic:
+                best_id = self._nearest(scope, self._vector(question))
+            cached = self.redis.hget(f"answer:{scope}:answers", best_id) if best_id else None
+        except redis.RedisError as e:
+            print(f"Error reading answer cache: {e}")
+            return None
+
+        self._record(cached is not None)
+        return json.loads(cached)["answer"] if cached else None
+
+    def store(self, scope: str, question: str, answer: str):
+        """
+        답변을 저장합니다. 범위당 ANSWER_CACHE_MAX_ENTRIES를 넘으면 가장 오래된 항목을 지웁니다.
+        """
+        if scope is None or not answer:
+            return
+        entry_id = str(time.time_ns())
+        vectors_key, answers_key = f"answer:{scope}:vectors", f"answer:{scope}:answers"
+        sketches_key, questions_key = f"answer:{scope}:sketches", f"answer:{scope}:questions"
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            if self.semantic:
+                vector = self._vector(question)
+                pipe.hset(vectors_key, entry_id, vector.tobytes())
+                pipe.hset(sketches_key, entry_id, self._sketch(vector).tobytes())
+            pipe.hset(answers_key, entry_id, json.dumps({"question": question, "answer": answer}, ensure_ascii=False))
+            pipe.hset(questions_key, self._question_key(question), entry_id)
+            for key in (vectors_key, sketches_key, answers_key, questions_key):
+                pipe.expire(key, self.ttl)
+            pipe.hkeys(answers_key)
+            entry_ids = pipe.execute()[-1]
+
+            if len(entry_ids) > self.max_entries:
+                oldest = sorted(entry_ids, key=int)[: len(entry_ids) - self.max_entries]
+                evicted = {
+                    self._question_key(json.loads(value)["question"])
+                    for value in self.redis.hmget(answers_key, oldest) if value
+                }
+                self.redis.hdel(vectors_key, *oldest)
+                self.redis.hdel(sketches_key, *oldest)
+                self.redis.hdel(answers_key, *oldest)
+                # 같은 질문이 더 최근 항목으로 다시 저장된 경우에는 질문 해시를 남겨둡니다.
+                evicted = [key for key in evicted if self.redis.hget(questions_key, key) in set(oldest)]
+                if evicted:
+                    self.redis.hdel(questions_key, *evicted)
+        except redis.RedisError as e:
+            print(f"Error writing answer cache: {e}")
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: 이 프로세스와 전체의 적중/미적중 수 및 적중률.
+        """
+        stats = {"process": {"hits": self.hits, "misses": self.misses}}
+        try:
+            totals = {key.decode(): int(value) for key, value in self.redis.hgetall(self.STATS_KEY).items()}
+            stats["total"] = {"hits": totals.get("hits", 0), "misses": totals.get("misses", 0)}
+        except redis.RedisError as e:
+            print(f"Error reading answer cache stats: {e}")
+        for counts in list(stats.values()):
+            lookups = counts["hits"] + counts["misses"]
+            counts["hit_rate"] = counts["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+_answer_cache = None
+_answer_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> AnswerCache:
+    global _answer_cache
+    if _answer_cache is None:
+        with _answer_cache_lock:
+            if _answer_cache is None:
+                _answer_cache = AnswerCache()
+    return _answer_cache
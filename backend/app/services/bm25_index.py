@@ -0,0 +1,279 @@
+import asyncio
+import math
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Callable
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.news import News
+from app.models.news_category import NewsCategory
+from app.services.morph_analyzer import get_morph_analyzer
+from app.services.vector_store import news_text, to_epoch
+
+TERM_RE = re.compile(r"[가-힣]+|[0-9a-z]+")
+HANGUL_RE = re.compile(r"^[가-힣]+$")
+LINK_SLACK = timedelta(minutes=5)
+
+
+def search_terms(text: str) -> list[str]:
+    """
+    BM25 색인어. 단어 자체와, 한글 단어는 글자 bigram을 함께 사용합니다.
+    ("반도체가" → 반도체가, 반도, 도체, 체가) 형태소 분석 없이 조사가 붙은 단어도 일치시킵니다.
+    """
+    terms = []
+    for token in TERM_RE.findall((text or "").lower()):
+        terms.append(token)
+        if HANGUL_RE.match(token) and len(token) > 2:
+            terms.extend(token[i:i + 2] for i in range(len(token) - 1))
+    return terms
+
+
+def noun_terms(nouns: dict[str, int]) -> Counter:
+    """
+    명사 색인어. 수집 시 저장된 명사 집계(news.noun_counts)를 "n:" 접두어로 구분해
+    글자 기반 색인어(search_terms)와 섞이지 않게 합니다.
+    """
+    terms = Counter()
+    for noun, count in (nouns or {}).items():
+        terms[f"n:{noun.lower()}"] += count
+    return terms
+
+
+def query_nouns(text: str) -> dict[str, int]:
+    """
+    검색어의 명사. 기사 쪽과 같은 분석기를 API 프로세스의 워커 풀에서 실행합니다.
+    """
+    return dict(Counter(get_morph_analyzer().nouns_many([text])[0]))
+
+
+class BM25Index:
+    """
+    프로세스 내 BM25 역색인.
+
+    - 문서는 추가만 되고, 카테고리 연결은 나중에 추가될 수 있습니다.
+    - 검색 시 카테고리/게시 시간 조건으로 후보 문서 마스크를 먼저 만들고,
+      역색인 posting 중 마스크에 포함된 문서만 점수를 계산합니다.
+    - refresh()는 마지막으로 읽은 linked_at 이후의 변경분만 DB에서 읽습니다.
+    - 색인어는 글자 기반 search_terms에 수집 시 저장된 명사 집계를 더합니다. 기사 쪽은 형태소 분석을 다시 하지 않고,
+      검색어만 nouns 함수(운영에서는 query_nouns)로 분석합니다. 명사 집계가 아직 없던 기사는 refresh 때 보충합니다.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, nouns: Callable[[str], dict[str, int]] = None):
+        self.k1 = k1
+        self.b = b
+        self.nouns = nouns
+        self.news_ids: list[int] = []
+        self.texts: list[str] = []
+        self.doc_index: dict[int, int] = {}
+        self.doc_lengths: list[int] = []
+        self.published_at: list[int] = []
+        self.postings: dict[str, list[tuple[int, int]]] = {}
+        self.category_docs: dict[int, set[int]] = {}
+        self.pending_nouns: set[int] = set()
+        self.last_linked_at: datetime = None
+        self.refreshed_at = 0.0
+        self._arrays = None
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.news_ids)
+
+    def add(
+        self, news_id: int, text: str, published_at: datetime = None, category_ids: list[int] = (),
+        nouns: dict[str, int] = None,
+    ):
+        with self._lock:
+            if news_id in self.doc_index:
+                for category_id in category_ids:
+                    self.link(news_id, category_id)
+                return
+            doc = len(self.news_ids)
+            terms = Counter(search_terms(text))
+            self.news_ids.append(news_id)
+            self.texts.append(text)
+            self.doc_index[news_id] = doc
+            self.doc_lengths.append(0)
+            self.published_at.append(to_epoch(published_at))
+            self._add_terms(doc, terms)
+            if nouns is None:
+                self.pending_nouns.add(news_id)
+            else:
+                self._add_terms(doc, noun_terms(nouns))
+            for category_id in category_ids:
+                self.category_docs.setdefault(category_id, set()).add(doc)
+
+    def add_nouns(self, news_id: int, nouns: dict[str, int]):
+        """
+        명사 집계 없이 색인된 기사에 나중에 저장된 명사 집계를 더합니다.
+        """
+        with self._lock:
+            if news_id not in self.pending_nouns:
+                return
+            self.pending_nouns.discard(news_id)
+            self._add_terms(self.doc_index[news_id], noun_terms(nouns))
+
+    def _add_terms(self, doc: int, terms: Counter):
+        for term, tf in terms.items():
+            self.postings.setdefault(term, []).append((doc, tf))
+        self.doc_lengths[doc] += sum(terms.values())
+        self._arrays = None
+
+    def query_terms(self, query: str) -> set[str]:
+        terms = set(search_terms(query))
+        if self.nouns is not None:
+            try:
+                terms.update(noun_terms(self.nouns(query)))
+            except Exception as e:
+                # 분석기를 쓸 수 없으면 글자 기반 색인어만으로 검색합니다.
+                print(f"Error analyzing BM25 query: {e}")
+        return terms
+
+    def link(self, news_id: int, category_id: int):
+        with self._lock:
+            doc = self.doc_index.get(news_id)
+            if doc is not None:
+                self.category_docs.setdefault(category_id, set()).add(doc)
+
+    def _candidate_mask(self, category_ids, since: datetime, until: datetime) -> np.ndarray:
+        if self._arrays is None:
+            self._arrays = (np.array(self.doc_lengths, dtype=np.float32), np.array(self.published_at, dtype=np.int64))
+        doc_lengths, published_at = self._arrays
+
+        if category_ids is None:
+            mask = np.ones(len(self.news_ids), dtype=bool)
+        else:
+            mask = np.zeros(len(self.news_ids), dtype=bool)
+            for category_id in category_ids:
+                docs = self.category_docs.get(category_id)
+                if docs:
+                    mask[list(docs)] = True
+        if since:
+            mask &= published_at >= to_epoch(since)
+        if until:
+            mask &= published_at <= to_epoch(until)
+        return mask
+
+    def search(self, query: str, k: int = 10, category_ids=None, since: datetime = None, until: datetime = None):
+        """
+        Args:
+            query (str): 검색어.
+            k (int): 반환할 문서 수.
+            category_ids (list): 이 카테고리 중 하나에 연결된 기사만 검색. None이면 전체.
+            since, until (datetime): 게시 시간 범위 (UTC).
+
+        Returns:
+            list: 점수 내림차순 (news_id, score) 목록.
+        """
+        with self._lock:
+            if not self.news_ids:
+                return []
+            mask = self._candidate_mask(category_ids, since, until)
+            if not mask.any():
+                return []
+            doc_lengths = self._arrays[0]
+            average_length = float(doc_lengths.mean()) or 1.0
+            total = len(self.news_ids)
+
+            scores = {}
+            for term in self.query_terms(query):
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+                docs = np.fromiter((doc for doc, _ in postings), dtype=np.int64, count=len(postings))
+                tfs = np.fromiter((tf for _, tf in postings), dtype=np.float32, count=len(postings))
+                keep = mask[docs]
+                docs, tfs = docs[keep], tfs[keep]
+                if not len(docs):
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * doc_lengths[docs] / average_length)
+                term_scores = idf * tfs * (self.k1 + 1) / (tfs + norm)
+                for doc, score in zip(docs.tolist(), term_scores.tolist()):
+                    scores[doc] = scores.get(doc, 0.0) + score
+
+            best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+            return [(self.news_ids[doc], score) for doc, score in best]
+
+    def text(self, news_id: int) -> str:
+        return self.texts[self.doc_index[news_id]]
+
+    def published_epoch(self, news_id: int) -> int:
+        return self.published_at[self.doc_index[news_id]]
+
+    def refresh(self, db: Session, batch_size: int = None):
+        """
+        마지막 refresh 이후의 카테고리 연결(linked_at 기준)을 읽고, 처음 보는 기사는 본문을 불러와 색인합니다.
+        새 기사는 저장과 동시에 카테고리에 연결되므로 연결 테이블만 따라가면 됩니다.
+        늦게 커밋된 트랜잭션을 놓치지 않도록 LINK_SLACK만큼 겹쳐 읽습니다 (add/link는 멱등).
+        색인할 때 명사 집계가 아직 없던 기사(extract_news_nouns 전)는 집계가 저장된 뒤 명사 색인어를 더합니다.
+        """
+        batch_size = batch_size or settings.INGEST_BATCH_SIZE
+        with self._refresh_lock:
+            query = select(NewsCategory.news_id, NewsCategory.category_id, NewsCategory.linked_at)
+            if self.last_linked_at is not None:
+                query = query.filter(NewsCategory.linked_at >= self.last_linked_at - LINK_SLACK)
+            links = db.execute(query).all()
+
+            missing = sorted({news_id for news_id, _, _ in links if news_id not in self.doc_index})
+            for start in range(0, len(missing), batch_size):
+                rows = db.execute(
+                    select(News.id, News.title, News.description, News.published_at, News.inserted_at, News.noun_counts)
+                    .filter(News.id.in_(missing[start:start + batch_size]))
+                ).all()
+                for row in rows:
+                    # 게시 시간이 없는 기사는 수집 시각으로 기간 조건을 적용합니다.
+                    self.add(
+                        row.id, news_text(row.title, row.description), row.published_at or row.inserted_at,
+                        nouns=row.noun_counts,
+                    )
+
+            pending = sorted(self.pending_nouns - set(missing))
+            for start in range(0, len(pending), batch_size):
+                rows = db.execute(
+                    select(News.id, News.noun_counts)
+                    .filter(News.id.in_(pending[start:start + batch_size]), News.noun_counts.isnot(None))
+                ).all()
+                for row in rows:
+                    self.add_nouns(row.id, row.noun_counts)
+
+            for news_id, category_id, linked_at in links:
+                self.link(news_id, category_id)
+                if self.last_linked_at is None or linked_at > self.last_linked_at:
+                    self.last_linked_at = linked_at
+            self.refreshed_at = time.monotonic()
+
+    def refresh_from_db(self):
+        """
+        새 세션으로 refresh합니다. 요청 경로에서는 호출하지 않고, API 프로세스의 스케줄러가
+        시작 직후와 BM25_REFRESH_SECONDS마다 백그라운드 스레드에서 호출합니다(refresh_bm25_index).
+        """
+        db = SessionLocal()
+        try:
+            self.refresh(db)
+        except Exception as e:
+            print(f"Error refreshing BM25 index: {e}")
+        finally:
+            db.close()
+
+
+_bm25_index = BM25Index(nouns=query_nouns)
+
+
+def get_bm25_index() -> BM25Index:
+    return _bm25_index
+
+
+async def refresh_bm25_index():
+    """
+    스케줄러 작업. DB 읽기와 색인은 스레드에서 실행해 이벤트 루프를 막지 않습니다.
+    """
+    await asyncio.to_thread(get_bm25_index().refresh_from_db)
@@ -0,0 +1,118 @@
+import redis
+
+from app.services.redis_client import redis_client
+
+CATEGORY_VERSION_KEY = "cache:category_version"
+TREND_KEYWORDS_VERSION_KEY = "cache:trend_keywords_version"
+NEWS_VERSION_KEY = "cache:news_version"
+TRENDS_VERSION_KEY = "cache:trends_version"
+USER_TRENDS_VERSION_KEY = "cache:user_trends_version"
+
+
+def bump_category_versions(category_ids: list[int], client: redis.Redis = None):
+    """
+    카테고리에 새 기사가 들어왔음을 표시합니다.
+    버전이 바뀌면 해당 카테고리 기사로 만든 캐시 항목은 더 이상 조회되지 않습니다.
+    """
+    if not category_ids:
+        return
+    client = client or redis_client
+    try:
+        pipe = client.pipeline(transaction=False)
+        for category_id in set(category_ids):
+            pipe.hincrby(CATEGORY_VERSION_KEY, str(category_id), 1)
+        pipe.execute()
+    except redis.RedisError as e:
+        print(f"Error bumping category cache versions: {e}")
+
+
+def get_category_versions(category_ids: list[int], client: redis.Redis = None) -> dict[int, int]:
+    """
+    Returns:
+        dict: 카테고리 ID별 캐시 버전. 한 번도 바뀌지 않은 카테고리는 0입니다.
+    """
+    category_ids = sorted(set(category_ids))
+    if not category_ids:
+        return {}
+    client = client or redis_client
+    values = client.hmget(CATEGORY_VERSION_KEY, [str(category_id) for category_id in category_ids])
+    return {category_id: int(value or 0) for category_id, value in zip(category_ids, values)}
+
+
+def bump_trend_keywords_version(client: redis.Redis = None):
+    """
+    카테고리나 구독이 바뀌었음을 표시합니다. 트렌드 키워드 오토마톤은 버전이 바뀌었을 때만 다시 만들어집니다.
+    """
+    client = client or redis_client
+    try:
+        client.incr(TREND_KEYWORDS_VERSION_KEY)
+    except redis.RedisError as e:
+        print(f"Error bumping trend keywords version: {e}")
+
+
+def get_trend_keywords_version(client: redis.Redis = None):
+    """
+    Returns:
+        int: 트렌드 키워드 버전. Redis에 연결할 수 없으면 None (호출 측에서 매번 다시 만듦).
+    """
+    client = client or redis_client
+    try:
+        return int(client.get(TREND_KEYWORDS_VERSION_KEY) or 0)
+    except redis.RedisError as e:
+        print(f"Error reading trend keywords version: {e}")
+        return None
+
+
+def bump_news_version(client: redis.Redis = None):
+    """
+    기사 저장소가 바뀌었음을 표시합니다. 뉴스 목록 응답 캐시는 버전이 바뀌면 더 이상 조회되지 않습니다.
+    """
+    client = client or redis_client
+    try:
+        client.incr(NEWS_VERSION_KEY)
+    except redis.RedisError as e:
+        print(f"Error bumping news cache version: {e}")
+
+
+def get_news_version(client: redis.Redis = None):
+    """
+    Returns:
+        str: 뉴스 목록 캐시 버전. Redis에 연결할 수 없으면 None (캐시를 쓰지 않음).
+    """
+    client = client or redis_client
+    try:
+        return str(int(client.get(NEWS_VERSION_KEY) or 0))
+    except redis.RedisError as e:
+        print(f"Error reading news cache version: {e}")
+        return None
+
+
+def bump_trends_version(user_id: int = None, client: redis.Redis = None):
+    """
+    트렌드가 저장되었음을 표시합니다. user_id가 없으면(스케줄러) 모든 사용자의 트렌드 응답 캐시가 바뀝니다.
+    """
+    client = client or redis_client
+    try:
+        if user_id is None:
+            client.incr(TRENDS_VERSION_KEY)
+        else:
+            client.hincrby(USER_TRENDS_VERSION_KEY, str(user_id), 1)
+    except redis.RedisError as e:
+        print(f"Error bumping trends cache version: {e}")
+
+
+def get_trends_version(user_id: int, client: redis.Redis = None):
+    """
+    Returns:
+        str: 사용자의 트렌드 캐시 버전 (전체 버전.사용자 버전). Redis에 연결할 수 없으면 None.
+    """
+    client = client or redis_client
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.get(TRENDS_VERSION_KEY)
+        pipe.hget(USER_TRENDS_VERSION_KEY, str(user_id))
+        shared, own = pipe.execute()
+        return f"{int(shared or 0)}.{int(own or 0)}"
+    except redis.RedisError as e:
+        print(f"Error reading trends cache version: {e}")
+        return None
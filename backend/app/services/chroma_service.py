@@ -1,13 +1,13 @@
-from chromadb.config import Settings
-from chromadb import Client
+import chromadb
+
+from app.config import settings
+
 
 def get_chroma_client():
-    settings = Settings(
-        chroma_db_impl="postgres",
-        postgres_host="postgres",
-        postgres_port="5432",
-        postgres_user="newspulse_user",
-        postgres_password="bV0_cCo-",
-        postgres_database="newspulse_db",
-    )
-    return Client(settings)
+    """
+    Chroma 클라이언트를 생성합니다.
+    CHROMA_HOST가 설정되어 있으면 Chroma 서버에, 아니면 CHROMA_PERSIST_DIR의 로컬 저장소에 연결합니다.
+    """
+    if settings.CHROMA_HOST:
+        return chromadb.HttpClient(host=settings.CHROMA_HOST, port=settings.CHROMA_PORT)
+    return chromadb.PersistentClient(path=settings.CHROMA_PERSIST_DIR)
@@ -0,0 +1,160 @@
+import math
+import threading
+from dataclasses import dataclass, field
+
+import numpy as np
+from langchain.schema import Document
+
+from app.config import settings
+from app.services.llm_backends import HashingEmbeddings
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - langchain-openai 설치 시 함께 설치됨
+    tiktoken = None
+
+RAG_PROMPT_TEMPLATE = """You are an assistant for question-answering tasks. Use the following pieces of retrieved context to answer the question. If you don't know the answer, just say that you don't know. Use three sentences maximum and keep the answer concise.
+
+    Conversation history: {history}
+
+    Question: {question}
+
+    Context: {context}
+
+    Answer:
+    """
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+_similarity_embeddings = HashingEmbeddings(dim=1024)
+
+
+def _get_encoding():
+    """
+    LLM_MODEL의 tiktoken 인코딩. 인코딩 파일을 받을 수 없는 환경(오프라인)에서는 None을 반환합니다.
+    """
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        with _encoding_lock:
+            if not _encoding_loaded:
+                try:
+                    _encoding = tiktoken.encoding_for_model(settings.LLM_MODEL) if tiktoken else None
+                except Exception as e:
+                    print(f"tiktoken encoding unavailable, using estimated token counts: {e}")
+                    _encoding = None
+                _encoding_loaded = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """
+    텍스트의 토큰 수. tiktoken을 사용할 수 없으면 UTF-8 3바이트당 1토큰으로 추정합니다
+    (한글 1글자 ≈ 1토큰, 영어는 실제보다 조금 많게 계산되는 보수적인 추정).
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return math.ceil(len(text.encode("utf-8")) / 3)
+
+
+@dataclass
+class BuiltContext:
+    question: str
+    context: str
+    history: str
+    documents: list[Document] = field(default_factory=list)
+    history_turns: int = 0
+    context_tokens: int = 0
+    history_tokens: int = 0
+    prompt_tokens: int = 0
+
+    def prompt_inputs(self) -> dict:
+        return {"question": self.question, "context": self.context, "history": self.history}
+
+
+def select_documents(question: str, docs: list[Document], budget: int, mmr_lambda: float = None,
+                     duplicate_threshold: float = None) -> list[Document]:
+    """
+    MMR(maximal marginal relevance)로 질문과 관련 있으면서 서로 겹치지 않는 문서를 토큰 예산 안에서 고릅니다.
+    이미 고른 문서와 유사도가 duplicate_threshold 이상인 문서(같은 통신사 기사의 재전송 등)는 제외합니다.
+    유사도는 로컬 hashing 임베딩으로 계산하므로 네트워크 호출이 없습니다.
+    """
+    if not docs or budget <= 0:
+        return []
+    mmr_lambda = settings.CONTEXT_MMR_LAMBDA if mmr_lambda is None else mmr_lambda
+    duplicate_threshold = duplicate_threshold or settings.CONTEXT_DUPLICATE_THRESHOLD
+
+    vectors = np.array(_similarity_embeddings.embed_documents([question] + [doc.page_content for doc in docs]))
+    query_similarity = vectors[1:] @ vectors[0]
+    pairwise = vectors[1:] @ vectors[1:].T
+    tokens = [count_tokens(doc.page_content) for doc in docs]
+
+    selected = []
+    remaining = list(range(len(docs)))
+    used = 0
+    while remaining:
+        best, best_score = None, None
+        for index in remaining:
+            redundancy = max((pairwise[index, chosen] for chosen in selected), default=0.0)
+            score = mmr_lambda * query_similarity[index] - (1 - mmr_lambda) * redundancy
+            if best_score is None or score > best_score:
+                best, best_score = index, score
+        remaining.remove(best)
+
+        if selected and max(pairwise[best, chosen] for chosen in selected) >= duplicate_threshold:
+            continue
+        if used + tokens[best] > budget:
+            continue
+        selected.append(best)
+        used += tokens[best]
+    return [docs[index] for index in selected]
+
+
+def format_history(turns) -> str:
+    return "\n".join(f"{'User' if turn.is_user else 'Assistant'}: {turn.message}" for turn in turns)
+
+
+def build_context(question: str, docs: list[Document], history=(), budget: int = None) -> BuiltContext:
+    """
+    검색된 문서와 최근 대화를 하나의 토큰 예산 안에서 프롬프트 입력으로 조립합니다.
+
+    Args:
+        question (str): 사용자 질문.
+        docs (list): 검색된 문서 (관련도순).
+        history (list): 최근 대화 (get_chat_history 결과, 최신순).
+        budget (int): 문맥과 대화 기록에 쓸 최대 토큰 수 (기본값 CONTEXT_TOKEN_BUDGET).
+
+    Returns:
+        BuiltContext: 프롬프트 입력과 토큰 수. 문서는 최신 기사부터, 대화는 오래된 순서로 배치됩니다.
+    """
+    budget = budget or settings.CONTEXT_TOKEN_BUDGET
+
+    # 대화 기록은 예산의 CONTEXT_HISTORY_SHARE까지 최신 대화부터 채웁니다.
+    history_budget = int(budget * settings.CONTEXT_HISTORY_SHARE)
+    turns, history_tokens = [], 0
+    for turn in history:
+        turn_tokens = count_tokens(format_history([turn])) + 1
+        if history_tokens + turn_tokens > history_budget:
+            break
+        turns.append(turn)
+        history_tokens += turn_tokens
+    history_text = format_history(reversed(turns))
+
+    selected = select_documents(question, docs, budget - history_tokens)
+    selected.sort(key=lambda doc: doc.metadata.get("published_at") or 0, reverse=True)
+    context = "\n\n".join(doc.page_content for doc in selected)
+
+    built = BuiltContext(
+        question=question,
+        context=context,
+        history=history_text,
+        documents=selected,
+        history_turns=len(turns),
+        context_tokens=count_tokens(context),
+        history_tokens=count_tokens(history_text),
+    )
+    built.prompt_tokens = count_tokens(RAG_PROMPT_TEMPLATE.format(**built.prompt_inputs()))
+    return built
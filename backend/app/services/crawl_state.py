@@ -0,0 +1,115 @@
+import hashlib
+from datetime import datetime, timedelta
+
+import redis
+
+from app.config import settings
+from app.services.redis_client import redis_client
+
+
+def _url_fingerprint(url: str) -> bytes:
+    """
+    URL 대신 저장할 8바이트 지문. 전체 URL을 저장하는 것보다 Redis 메모리를 적게 사용합니다.
+    """
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest()
+
+
+class CrawlState:
+    """
+    카테고리별 증분 크롤링 상태.
+
+    - 이미 본 URL 집합: 날짜별 Redis set(`crawl:seen:{category}:{YYYYMMDD}`)에 URL 지문을 저장하고,
+      CRAWL_SEEN_RETENTION_DAYS 이후 만료시켜 메모리 사용량을 제한합니다.
+    - high-water mark: 가장 최근에 본 기사의 URL과 게시 시간(`crawl:hwm:{category}`).
+    """
+
+    def __init__(self, category: str, client: redis.Redis = None):
+        self.category = category
+        self.redis = client or redis_client
+        self.hwm_key = f"crawl:hwm:{category}"
+
+    def _seen_key(self, day: datetime) -> str:
+        return f"crawl:seen:{self.category}:{day:%Y%m%d}"
+
+    def _seen_keys(self) -> list[str]:
+        today = datetime.utcnow()
+        return [
+            self._seen_key(today - timedelta(days=i))
+            for i in range(settings.CRAWL_SEEN_RETENTION_DAYS)
+        ]
+
+    def get_high_water_mark(self):
+        """
+        Returns:
+            dict | None: {"url": ..., "published_at": "YYYY-MM-DD HH:MM:SS"} 형식. 없으면 None.
+        """
+        try:
+            hwm = self.redis.hgetall(self.hwm_key)
+        except redis.RedisError as e:
+            print(f"Error reading crawl high-water mark for '{self.category}': {e}")
+            return None
+        if not hwm:
+            return None
+        return {key.decode(): value.decode() for key, value in hwm.items()}
+
+    def known_flags(self, articles: list[dict]) -> list[bool]:
+        """
+        각 기사가 이미 수집된 것인지 판별합니다.
+        URL이 seen 집합에 있거나, 게시 시간이 high-water mark보다
+        CRAWL_HWM_SLACK_MINUTES 이상 오래된 기사는 이미 수집된 것으로 봅니다.
+        Redis 오류 시에는 모든 기사를 새 기사로 취급합니다.
+        """
+        if not articles:
+            return []
+
+        fingerprints = [_url_fingerprint(article["url"]) for article in articles]
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key in self._seen_keys():
+                pipe.smismember(key, fingerprints)
+            results = pipe.execute()
+        except redis.RedisError as e:
+            print(f"Error reading crawl state for '{self.category}': {e}")
+            return [False] * len(articles)
+
+        flags = [any(found) for found in zip(*results)]
+
+        hwm = self.get_high_water_mark()
+        if hwm and hwm.get("published_at"):
+            cutoff = (
+                datetime.strptime(hwm["published_at"], "%Y-%m-%d %H:%M:%S")
+                - timedelta(minutes=settings.CRAWL_HWM_SLACK_MINUTES)
+            ).strftime("%Y-%m-%d %H:%M:%S")
+            flags = [
+                known or bool(article.get("published_at") and article["published_at"] < cutoff)
+                for known, article in zip(flags, articles)
+            ]
+        return flags
+
+    def mark_seen(self, articles: list[dict]):
+        """
+        저장이 끝난 기사들을 seen 집합에 추가하고 high-water mark를 갱신합니다.
+        """
+        if not articles:
+            return
+
+        key = self._seen_key(datetime.utcnow())
+        newest = max(
+            (article for article in articles if article.get("published_at")),
+            key=lambda article: article["published_at"],
+            default=None,
+        )
+        try:
+            pipe = self.redis.pipeline()
+            pipe.sadd(key, *(_url_fingerprint(article["url"]) for article in articles))
+            pipe.expire(key, timedelta(days=settings.CRAWL_SEEN_RETENTION_DAYS))
+            pipe.execute()
+
+            hwm = self.get_high_water_mark()
+            if newest and (not hwm or newest["published_at"] > hwm.get("published_at", "")):
+                self.redis.hset(
+                    self.hwm_key,
+                    mapping={"url": newest["url"], "published_at": newest["published_at"]},
+                )
+        except redis.RedisError as e:
+            print(f"Error updating crawl state for '{self.category}': {e}")
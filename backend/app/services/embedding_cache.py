@@ -0,0 +1,117 @@
+import hashlib
+import time
+from array import array
+
+import redis
+from langchain_core.embeddings import Embeddings
+
+from app.config import settings
+from app.services.redis_client import redis_client
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    내용 기반 임베딩 캐시. 같은 모델로 같은 텍스트를 다시 임베딩하지 않습니다.
+
+    - 키: `emb:{sha256(모델 이름 + 텍스트)}`, 값: float32 벡터 바이트.
+    - LRU: 마지막 사용 시각을 sorted set(`emb:lru`)에 기록하고,
+      EMBEDDING_CACHE_MAX_ENTRIES를 넘으면 가장 오래 쓰이지 않은 항목부터 삭제합니다.
+    - 적중/미적중 수는 프로세스별(hits, misses)과 전체(`emb:stats`)로 집계됩니다.
+    Redis 오류 시에는 캐시 없이 원래 임베딩 함수를 호출합니다.
+    """
+
+    LRU_KEY = "emb:lru"
+    STATS_KEY = "emb:stats"
+
+    def __init__(self, embeddings: Embeddings, model_name: str, client: redis.Redis = None, max_entries: int = None):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.redis = client or redis_client
+        self.max_entries = max_entries or settings.EMBEDDING_CACHE_MAX_ENTRIES
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, text: str) -> str:
+        digest = hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+        return f"emb:{digest}"
+
+    def _read(self, keys: list[str]) -> list:
+        try:
+            values = self.redis.mget(keys)
+        except redis.RedisError as e:
+            print(f"Error reading embedding cache: {e}")
+            return [None] * len(keys)
+        return [array("f", value).tolist() if value else None for value in values]
+
+    def _write(self, hit_keys: list[str], new_items: dict[str, list[float]], miss_count: int):
+        now = time.time()
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key, vector in new_items.items():
+                pipe.set(key, array("f", vector).tobytes())
+            touched = {key: now for key in [*hit_keys, *new_items]}
+            if touched:
+                pipe.zadd(self.LRU_KEY, touched)
+            pipe.hincrby(self.STATS_KEY, "hits", len(hit_keys))
+            pipe.hincrby(self.STATS_KEY, "misses", miss_count)
+            pipe.zcard(self.LRU_KEY)
+            size = pipe.execute()[-1]
+
+            if size > self.max_entries:
+                evicted = [key for key, _ in self.redis.zpopmin(self.LRU_KEY, size - self.max_entries)]
+                if evicted:
+                    self.redis.delete(*evicted)
+        except redis.RedisError as e:
+            print(f"Error writing embedding cache: {e}")
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys = [self._key(text) for text in texts]
+        vectors = self._read(keys)
+
+        # 캐시에 없는 텍스트만 (중복 없이) 한 번에 임베딩합니다.
+        missing = {}
+        for key, text, vector in zip(keys, texts, vectors):
+            if vector is None and key not in missing:
+                missing[key] = text
+        new_items = {}
+        if missing:
+            new_vectors = self.embeddings.embed_documents(list(missing.values()))
+            new_items = dict(zip(missing.keys(), new_vectors))
+
+        hit_keys = [key for key, vector in zip(keys, vectors) if vector is not None]
+        miss_count = len(texts) - len(hit_keys)
+        self.hits += len(hit_keys)
+        self.misses += miss_count
+        self._write(hit_keys, new_items, miss_count)
+
+        return [vector if vector is not None else new_items[key] for key, vector in zip(keys, vectors)]
+
+    def embed_query(self, text: str) -> list[float]:
+        key = self._key(text)
+        vector = self._read([key])[0]
+        if vector is not None:
+            self.hits += 1
+            self._write([key], {}, 0)
+            return vector
+
+        vector = self.embeddings.embed_query(text)
+        self.misses += 1
+        self._write([], {key: vector}, 1)
+        return vector
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: 이 프로세스의 적중/미적중 수와 전체 누적 적중/미적중 수, 캐시 항목 수.
+        """
+        stats = {"process": {"hits": self.hits, "misses": self.misses}}
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.hgetall(self.STATS_KEY)
+            pipe.zcard(self.LRU_KEY)
+            totals, size = pipe.execute()
+            stats["total"] = {key.decode(): int(value) for key, value in totals.items()}
+            stats["entries"] = size
+        except redis.RedisError as e:
+            print(f"Error reading embedding cache stats: {e}")
+        return stats
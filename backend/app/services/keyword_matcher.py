@@ -0,0 +1,162 @@
+import re
+import threading
+from collections import Counter, deque
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.category import Category
+from app.models.user_category import UserCategory
+from app.services.cache_versions import get_trend_keywords_version
+
+_whitespace = re.compile(r"\s+")
+_ascii_word = re.compile(r"[a-z0-9]")
+
+
+def normalize(text: str) -> str:
+    return _whitespace.sub(" ", text.lower()).strip()
+
+
+class KeywordAutomaton:
+    """
+    여러 키워드를 한 번에 찾는 Aho-Corasick 오토마톤.
+    텍스트를 한 번 훑는 비용(O(텍스트 길이 + 일치 수))으로 모든 키워드의 등장 횟수를 셉니다.
+
+    - 대소문자와 공백 차이는 무시합니다 ("반도체  수출" == "반도체 수출").
+    - 영문/숫자로 시작하거나 끝나는 키워드는 단어 경계에서만 일치합니다 ("AI"는 "FAIR"에 일치하지 않음).
+    - 한글 키워드는 조사가 붙은 형태("반도체가")에도 일치합니다.
+    """
+
+    def __init__(self, keywords: dict[str, list[int]]):
+        """
+        Args:
+            keywords (dict): 키워드 → 카테고리 ID 목록.
+        """
+        self.keywords = []
+        self.targets = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        merged = {}
+        for keyword, category_ids in keywords.items():
+            keyword = normalize(keyword)
+            if keyword:
+                merged.setdefault(keyword, set()).update(category_ids)
+        for keyword, category_ids in merged.items():
+            self._add(keyword, sorted(category_ids))
+        self._build()
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def _add(self, keyword: str, category_ids: list[int]):
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(len(self.keywords))
+        self.keywords.append(keyword)
+        self.targets.append(category_ids)
+
+    def _build(self):
+        # 너비 우선으로 실패 링크를 만들고, 실패 링크 쪽의 일치 결과를 미리 합쳐둡니다.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def _at_boundary(self, text: str, start: int, end: int, keyword: str) -> bool:
+        if _ascii_word.match(keyword[0]) and start > 0 and _ascii_word.match(text[start - 1]):
+            return False
+        if _ascii_word.match(keyword[-1]) and end < len(text) and _ascii_word.match(text[end]):
+            return False
+        return True
+
+    def count_keywords(self, text: str) -> Counter:
+        """
+        Returns:
+            Counter: 키워드 번호별 등장 횟수.
+        """
+        counts = Counter()
+        if not self.keywords or not text:
+            return counts
+        text = normalize(text)
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for index in self._output[state]:
+                keyword = self.keywords[index]
+                start = position - len(keyword) + 1
+                if self._at_boundary(text, start, position + 1, keyword):
+                    counts[index] += 1
+        return counts
+
+    def count(self, text: str) -> Counter:
+        """
+        Returns:
+            Counter: 카테고리 ID별 등장 횟수.
+        """
+        counts = Counter()
+        for index, count in self.count_keywords(text).items():
+            for category_id in self.targets[index]:
+                counts[category_id] += count
+        return counts
+
+
+class KeywordMatcher:
+    """
+    구독자가 있는 카테고리 이름을 하나의 오토마톤으로 유지합니다.
+    카테고리/구독이 바뀔 때 올라가는 Redis 버전(bump_trend_keywords_version)이 달라졌을 때만 다시 만듭니다.
+    """
+
+    def __init__(self):
+        self._automaton = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    async def get(self, db: AsyncSession) -> KeywordAutomaton:
+        version = get_trend_keywords_version()
+        if self._automaton is not None and version is not None and version == self._version:
+            return self._automaton
+
+        result = await db.execute(
+            select(Category.id, Category.name)
+            .filter(Category.id.in_(select(UserCategory.category_id)))
+        )
+        keywords = {}
+        for category_id, name in result.all():
+            keywords.setdefault(name, []).append(category_id)
+        automaton = KeywordAutomaton(keywords)
+
+        with self._lock:
+            self._automaton, self._version = automaton, version
+        print(f"Trend keyword automaton rebuilt: {len(automaton)} keywords (version {version})")
+        return automaton
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_keyword_matcher() -> KeywordMatcher:
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = KeywordMatcher()
+    return _matcher
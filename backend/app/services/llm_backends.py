@@ -0,0 +1,142 @@
+import hashlib
+import re
+import time
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from app.config import settings
+
+TOKEN_RE = re.compile(r"[가-힣]+|[0-9a-z]+")
+QUESTION_RE = re.compile(r"Question:\s*(.*?)\s*\n\s*\n", re.DOTALL)
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    네트워크 없이 동작하는 로컬 임베딩 (feature hashing).
+    단어와 한글 글자 bigram을 해시해 dim 차원 벡터에 더하고 L2 정규화합니다.
+    조사가 붙은 한글 단어("반도체가", "반도체를")도 bigram이 겹치므로 가깝게 배치됩니다.
+    """
+
+    def __init__(self, dim: int = None):
+        self.dim = dim or settings.LOCAL_EMBEDDING_DIM
+        self.model = f"hashing-{self.dim}"
+
+    @staticmethod
+    def _features(text: str) -> list[str]:
+        features = []
+        for token in TOKEN_RE.findall(text.lower()):
+            features.append(token)
+            features.extend(token[i:i + 2] for i in range(len(token) - 1))
+        return features
+
+    def _hash(self, feature: str) -> tuple[int, float]:
+        digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+        return digest % self.dim, 1.0 if digest >> 63 else -1.0
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        rows, columns, signs = [], [], []
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                column, sign = self._hash(feature)
+                rows.append(row)
+                columns.append(column)
+                signs.append(sign)
+
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(matrix, (np.array(rows, dtype=np.int64), np.array(columns, dtype=np.int64)), signs)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1.0, norms)
+        return matrix.tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+
+class StubChatModel(BaseChatModel):
+    """
+    결정적인 응답을 돌려주는 테스트/부하 측정용 LLM.
+    프롬프트의 질문과 첫 번째 문맥 줄을 그대로 사용해 답변을 만들고, 단어 단위로 스트리밍합니다.
+    token_delay로 토큰당 생성 지연을 흉내 낼 수 있습니다.
+    """
+
+    token_delay: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def _answer(self, messages) -> str:
+        prompt = messages[-1].content if messages else ""
+        match = QUESTION_RE.search(prompt)
+        question = match.group(1) if match else prompt.strip()
+        context = prompt.split("Context:", 1)[1].strip() if "Context:" in prompt else ""
+        first_line = context.splitlines()[0] if context else ""
+        return f"Stub answer to '{question}'. {first_line}".strip()
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        answer = self._answer(messages)
+        time.sleep(self.token_delay * len(answer.split()))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=answer))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        for index, word in enumerate(self._answer(messages).split(" ")):
+            if self.token_delay:
+                time.sleep(self.token_delay)
+            token = word if index == 0 else f" {word}"
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+
+def _openai_embeddings() -> Embeddings:
+    from langchain_openai import OpenAIEmbeddings
+
+    return OpenAIEmbeddings()
+
+
+def _openai_chat_model() -> BaseChatModel:
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(model=settings.LLM_MODEL, temperature=0, max_tokens=None)
+
+
+EMBEDDING_BACKENDS = {
+    "openai": _openai_embeddings,
+    "hashing": HashingEmbeddings,
+}
+
+LLM_BACKENDS = {
+    "openai": _openai_chat_model,
+    "stub": lambda: StubChatModel(token_delay=settings.STUB_LLM_TOKEN_DELAY),
+}
+
+
+def get_embedding_backend(name: str = None) -> Embeddings:
+    """
+    설정(EMBEDDING_BACKEND)에 따라 임베딩 함수를 반환합니다.
+    알 수 없는 백엔드가 지정되면 OpenAI 임베딩을 사용합니다.
+    """
+    name = name or settings.EMBEDDING_BACKEND
+    backend = EMBEDDING_BACKENDS.get(name)
+    if backend is None:
+        print(f"Unknown embedding backend '{name}', falling back to openai")
+        backend = _openai_embeddings
+    return backend()
+
+
+def get_chat_model(name: str = None) -> BaseChatModel:
+    """
+    설정(LLM_BACKEND)에 따라 채팅 모델을 반환합니다.
+    알 수 없는 백엔드가 지정되면 OpenAI 모델을 사용합니다.
+    """
+    name = name or settings.LLM_BACKEND
+    backend = LLM_BACKENDS.get(name)
+    if backend is None:
+        print(f"Unknown LLM backend '{name}', falling back to openai")
+        backend = _openai_chat_model
+    return backend()
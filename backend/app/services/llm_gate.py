@@ -0,0 +1,81 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from app.config import settings
+
+
+class LLMSaturatedError(Exception):
+    """
+    LLM 호출 대기열에서 LLM_MAX_QUEUE_WAIT 안에 자리를 얻지 못했을 때 발생합니다.
+    """
+
+
+class LLMSlot:
+    """
+    획득한 LLM 호출 자리. release()는 여러 번 호출해도 한 번만 반납합니다.
+    """
+
+    def __init__(self, gate: "LLMGate"):
+        self._gate = gate
+        self._released = False
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._gate._release()
+
+
+class LLMGate:
+    """
+    동시에 진행되는 LLM 호출 수를 제한합니다.
+    자리가 없으면 최대 max_queue_wait초까지 기다리고, 그래도 없으면 LLMSaturatedError를 발생시켜
+    요청이 스레드/연결을 붙잡고 쌓이는 대신 바로 503으로 거절되도록 합니다.
+    """
+
+    def __init__(self, max_concurrency: int = None, max_queue_wait: float = None):
+        self.max_concurrency = max_concurrency or settings.LLM_MAX_CONCURRENCY
+        self.max_queue_wait = settings.LLM_MAX_QUEUE_WAIT if max_queue_wait is None else max_queue_wait
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    async def acquire(self) -> LLMSlot:
+        if not self._semaphore.locked():
+            # 자리가 있으면 기다리지 않고 바로 획득합니다.
+            await self._semaphore.acquire()
+        elif self.max_queue_wait <= 0:
+            self.rejected += 1
+            raise LLMSaturatedError("LLM is saturated")
+        else:
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.max_queue_wait)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise LLMSaturatedError("LLM is saturated") from None
+            finally:
+                self.waiting -= 1
+
+        self.in_flight += 1
+        return LLMSlot(self)
+
+    def _release(self):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    @asynccontextmanager
+    async def slot(self):
+        slot = await self.acquire()
+        try:
+            yield slot
+        finally:
+            slot.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,157 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+
+import jpype
+from konlpy.tag import Okt  # 형태소 분석기
+
+from app.config import settings
+
+# 스레드별 분석기 (풀 워커 프로세스, 또는 풀을 쓰지 않는 프로세스의 각 스레드)
+_local = threading.local()
+_worker_factory: Callable = Okt
+
+
+def _analyzer_for(factory: Callable):
+    # JPype는 JVM을 시작한 스레드가 아닌 스레드에서 호출할 때 JVM에 연결(attach)되어 있어야 합니다.
+    if jpype.isJVMStarted() and not jpype.isThreadAttachedToJVM():
+        jpype.attachThreadToJVM()
+    analyzers = getattr(_local, "analyzers", None)
+    if analyzers is None:
+        analyzers = _local.analyzers = {}
+    if factory not in analyzers:
+        analyzers[factory] = factory()
+    return analyzers[factory]
+
+
+def _init_worker(factory: Callable):
+    """
+    풀 워커 프로세스 시작 시 분석기를 만들고 한 번 실행해 JVM과 사전을 미리 올려둡니다.
+    """
+    global _worker_factory
+    _worker_factory = factory
+    _analyzer_for(factory).nouns("형태소 분석기 준비")
+
+
+def _nouns_batch(texts: list[str], factory: Callable = None) -> list[list[str]]:
+    analyzer = _analyzer_for(factory or _worker_factory)
+    return [analyzer.nouns(text) for text in texts]
+
+
+class MorphAnalyzer:
+    """
+    오래 유지되는 한국어 형태소 분석 서비스.
+    Okt는 생성할 때마다 JVM 연결과 사전 로드 비용이 크므로, 분석기를 하나씩 가진 워커 프로세스 풀을 미리 띄워두고
+    텍스트를 batch_size개씩 나눠 보냅니다.
+    현재 프로세스가 데몬 프로세스(Celery prefork 워커 등)라 자식 프로세스를 만들 수 없거나 processes가 0이면,
+    프로세스 안에서 스레드별 분석기를 재사용합니다.
+    """
+
+    def __init__(self, processes: int = None, batch_size: int = None, factory: Callable = Okt):
+        self.processes = settings.MORPH_ANALYZER_PROCESSES if processes is None else processes
+        self.batch_size = batch_size or settings.MORPH_ANALYZER_BATCH_SIZE
+        self.factory = factory
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @property
+    def uses_pool(self) -> bool:
+        return self.processes > 0 and not multiprocessing.current_process().daemon
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    # fork는 부모의 JVM/스레드/이벤트 루프 상태를 복제해 교착될 수 있으므로 spawn으로 새로 띄웁니다.
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.processes,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_worker,
+                        initargs=(self.factory,),
+                    )
+        return self._pool
+
+    def _batches(self, texts: list[str]) -> list[list[str]]:
+        return [texts[start:start + self.batch_size] for start in range(0, len(texts), self.batch_size)]
+
+    def _local_nouns(self, texts: list[str]) -> list[list[str]]:
+        return _nouns_batch(texts, self.factory)
+
+    def nouns_many(self, texts: list[str]) -> list[list[str]]:
+        """
+        Args:
+            texts (list): 분석할 텍스트 목록.
+
+        Returns:
+            list: 텍스트별 명사 목록 (입력 순서와 같음).
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        if not self.uses_pool:
+            return self._local_nouns(texts)
+        results = []
+        for nouns in self._get_pool().map(_nouns_batch, self._batches(texts)):
+            results.extend(nouns)
+        return results
+
+    async def anouns_many(self, texts: list[str]) -> list[list[str]]:
+        """
+        nouns_many의 비동기 버전. 분석하는 동안 이벤트 루프를 막지 않습니다.
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        if not self.uses_pool:
+            return await asyncio.to_thread(self._local_nouns, texts)
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        batches = await asyncio.gather(
+            *(loop.run_in_executor(pool, _nouns_batch, batch) for batch in self._batches(texts))
+        )
+        return [nouns for batch in batches for nouns in batch]
+
+    async def warm(self):
+        """
+        워커 프로세스를 모두 띄워 JVM과 사전을 미리 올려둡니다. 첫 검색어 분석이 JVM 시작을 기다리지 않게 합니다.
+        """
+        await self.anouns_many(["형태소 분석기 준비"] * max(self.processes, 1) * self.batch_size)
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+
+
+_analyzer = None
+_analyzer_lock = threading.Lock()
+
+
+def get_morph_analyzer() -> MorphAnalyzer:
+    global _analyzer
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                _analyzer = MorphAnalyzer()
+    return _analyzer
+
+
+async def warm_morph_analyzer():
+    """
+    API 시작 시 호출합니다. 분석기를 쓸 수 없어도(JVM 없음 등) 시작은 계속하며, BM25 검색은 글자 기반 색인어만 사용합니다.
+    """
+    try:
+        await get_morph_analyzer().warm()
+    except Exception as e:
+        print(f"Error warming morph analyzer: {e}")
+
+
+def shutdown_morph_analyzer():
+    global _analyzer
+    with _analyzer_lock:
+        if _analyzer is not None:
+            _analyzer.close()
+            _analyzer = None
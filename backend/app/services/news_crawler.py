@@ -1,10 +1,19 @@
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
+import asyncio
+import math
+import threading
 import time
-import re
+from urllib.parse import urlsplit
+
+import httpx
 import random
 
+from app.config import settings
+from app.services.news_parser import get_result_page_parser
+
+
+NAVER_SEARCH_URL = "https://search.naver.com/search.naver"
+ARTICLES_PER_PAGE = 10  # 네이버 뉴스는 한 페이지당 10개의 결과를 보여줍니다.
+
 
 def get_random_headers():
     """
@@ -24,89 +33,217 @@ def get_random_headers():
     return headers
 
 
-def crawl_news_from_naver(keyword: str, limit: int = 10):
+class TokenBucket:
+    """
+    토큰 버킷 방식의 비동기 요청 제한기.
+    초당 rate개의 토큰이 채워지며, 최대 capacity개까지 쌓일 수 있습니다.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """
+        토큰 하나를 얻을 때까지 대기합니다.
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated_at) * self.rate
+                )
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class HostRateLimiter:
+    """
+    호스트별로 TokenBucket을 관리합니다.
+    """
+
+    def __init__(self, rate: float = None, capacity: int = None):
+        self.rate = rate or settings.CRAWLER_RATE_PER_SECOND
+        self.capacity = capacity or settings.CRAWLER_BURST
+        self._buckets = {}
+
+    async def acquire(self, url: str):
+        host = urlsplit(url).netloc
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.rate, self.capacity)
+        await bucket.acquire()
+
+
+def create_http_client():
+    """
+    keep-alive 커넥션 풀을 사용하는 httpx.AsyncClient를 생성합니다.
+    """
+    return httpx.AsyncClient(
+        timeout=settings.CRAWLER_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=settings.CRAWLER_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.CRAWLER_MAX_CONNECTIONS,
+        ),
+    )
+
+
+# 프로세스 전역 크롤러 이벤트 루프와 공유 클라이언트
+# 동기 호출자(Celery 태스크, sync 엔드포인트)는 모두 이 루프에서 크롤링을 실행하므로
+# 커넥션 풀과 rate limiter가 호출 간에 공유됩니다.
+_crawler_loop = None
+_crawler_loop_lock = threading.Lock()
+_shared_client = None
+_shared_limiter = None
+
+
+def run_in_crawler_loop(coro):
+    """
+    코루틴을 크롤러 전용 이벤트 루프에서 실행하고 concurrent.futures.Future를 반환합니다.
+    루프 스레드는 처음 호출될 때 생성됩니다 (Celery prefork 자식 프로세스에서도 안전).
+    """
+    global _crawler_loop
+    with _crawler_loop_lock:
+        if _crawler_loop is None:
+            _crawler_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_crawler_loop.run_forever, name="naver-crawler", daemon=True
+            ).start()
+    return asyncio.run_coroutine_threadsafe(coro, _crawler_loop)
+
+
+def _get_shared_client():
+    global _shared_client, _shared_limiter
+    if _shared_client is None:
+        _shared_client = create_http_client()
+        _shared_limiter = HostRateLimiter()
+    return _shared_client, _shared_limiter
+
+
+async def fetch_search_page(client, limiter, keyword: str, page: int, latest_first: bool = False):
+    """
+    검색 결과 한 페이지를 가져와 기사 목록으로 변환합니다.
+
+    Returns:
+        list | None: 크롤링된 기사 목록. 요청이 실패하면 None 반환.
+    """
+    params = {
+        "query": keyword,
+        "where": "news",
+        "start": (page - 1) * ARTICLES_PER_PAGE + 1,  # 페이지 계산
+    }
+    if latest_first:
+        params["sort"] = 1  # 최신순 정렬
+    await limiter.acquire(NAVER_SEARCH_URL)
+    try:
+        response = await client.get(
+            NAVER_SEARCH_URL, params=params, headers=get_random_headers()
+        )
+    except httpx.HTTPError as e:
+        log_crawling_error(keyword, None, f"Request failed: {e}")
+        return None
+
+    # HTTP 상태 코드 확인
+    if response.status_code == 403:
+        log_crawling_error(keyword, response.status_code, "Access Denied")
+        return None
+    elif response.status_code != 200:
+        log_crawling_error(keyword, response.status_code, "Unexpected Error")
+        return None
+
+    return parse_news_items(response.text, keyword)
+
+
+def parse_news_items(html: str, keyword: str):
+    """
+    검색 결과 HTML에서 뉴스 기사 목록을 추출합니다. 파서 백엔드는 CRAWLER_PARSER 설정을 따릅니다.
     """
-    네이버 뉴스에서 키워드로 검색된 결과를 크롤링합니다. 여러 페이지를 탐색합니다.
+    return [record.to_dict() for record in get_result_page_parser().parse(html, keyword)]
+
+
+async def crawl_news_async(keyword: str, limit: int = 10, client=None, limiter=None, known_filter=None):
+    """
+    네이버 뉴스에서 키워드로 검색된 결과를 비동기로 크롤링합니다.
+    필요한 페이지들을 동시에 요청하며, 요청 간격은 호스트별 rate limiter가 조절합니다.
 
     Args:
         keyword (str): 검색할 키워드.
         limit (int): 가져올 뉴스 기사의 최대 수.
+        client (httpx.AsyncClient): 사용할 클라이언트. 없으면 공유 클라이언트 사용.
+        limiter (HostRateLimiter): 사용할 rate limiter. 없으면 공유 limiter 사용.
+        known_filter (callable): 기사 목록을 받아 이미 수집된 기사 여부(list[bool])를 반환하는 함수.
+            주어지면 최신순으로 한 페이지씩 증분 크롤링합니다.
 
     Returns:
-        list: 크롤링된 뉴스 기사 목록.
+        list: 크롤링된 뉴스 기사 목록. known_filter가 주어지면 새 기사만 포함.
     """
-    base_url = "https://search.naver.com/search.naver"
+    if client is None or limiter is None:
+        shared_client, shared_limiter = _get_shared_client()
+        client = client or shared_client
+        limiter = limiter or shared_limiter
+
+    if known_filter is not None:
+        return await _crawl_incremental(client, limiter, keyword, limit, known_filter)
+
+    pages = max(1, math.ceil(limit / ARTICLES_PER_PAGE))
+    results = await asyncio.gather(
+        *(fetch_search_page(client, limiter, keyword, page) for page in range(1, pages + 1))
+    )
+
     articles = []
-    page = 1
-    articles_per_page = 10  # 네이버 뉴스는 한 페이지당 10개의 결과를 보여줍니다.
+    for page_articles in results:
+        # 실패했거나 더 이상 결과가 없는 페이지 이후는 사용하지 않음
+        if not page_articles:
+            break
+        articles.extend(page_articles)
 
-    while len(articles) < limit:
-        params = {
-            "query": keyword,
-            "where": "news",
-            "start": (page - 1) * articles_per_page + 1,  # 페이지 계산
-        }
-        headers = get_random_headers()  # 랜덤 헤더 추가
-        try:
-            response = requests.get(
-                base_url, params=params, headers=headers, timeout=10
-            )
-
-            # HTTP 상태 코드 확인
-            if response.status_code == 403:
-                log_crawling_error(keyword, response.status_code, "Access Denied")
-                break
-            elif response.status_code != 200:
-                log_crawling_error(keyword, response.status_code, "Unexpected Error")
-                break
-
-            soup = BeautifulSoup(response.text, "html.parser")
-            news_items = soup.select(".news_wrap")
-
-            # 더 이상 결과가 없는 경우 루프 종료
-            if not news_items:
-                break
-
-            for item in news_items:
-                title = item.select_one(".news_tit").get("title", "")
-                url = item.select_one(".news_tit").get("href", "")
-                description = item.select_one(".dsc_wrap").text.strip()
-                published_at = extract_published_date(item)  # 날짜 추출 로직
-                articles.append(
-                    {
-                        "title": title,
-                        "description": description,
-                        "url": url,
-                        "published_at": published_at,
-                        "source": extract_source(item),
-                        "category": keyword,
-                    }
-                )
+    return articles[:limit]
 
-                if len(articles) >= limit:
-                    break
 
-            page += 1
-            time.sleep(random.uniform(1, 3))  # 요청 간 딜레이 추가
+async def _crawl_incremental(client, limiter, keyword: str, limit: int, known_filter):
+    """
+    최신순으로 한 페이지씩 가져오며, 페이지 전체가 이미 수집된 기사이면 중단합니다.
+    """
+    articles = []
+    page = 1
+    while len(articles) < limit:
+        page_articles = await fetch_search_page(client, limiter, keyword, page, latest_first=True)
+        if not page_articles:
+            break
 
-        except requests.exceptions.RequestException as e:
-            log_crawling_error(keyword, None, f"Request failed: {e}")
+        flags = await asyncio.to_thread(known_filter, page_articles)
+        new_articles = [article for article, known in zip(page_articles, flags) if not known]
+        if not new_articles:
+            print(f"Reached already crawled articles for keyword '{keyword}' at page {page}")
             break
 
-    return articles
+        articles.extend(new_articles)
+        page += 1
 
+    return articles[:limit]
 
-def extract_source(item):
-    try:
-        # 날짜 정보가 포함된 <span class="info"> 태그 선택
-        date_text = item.select_one(".info_group .info").text.strip()
 
-        return date_text
+def crawl_news_from_naver(keyword: str, limit: int = 10, known_filter=None):
+    """
+    crawl_news_async의 동기 래퍼. 크롤러 전용 이벤트 루프에서 실행합니다.
 
-    except Exception as e:
-        print(f"Error extracting source: {e}")
+    Args:
+        keyword (str): 검색할 키워드.
+        limit (int): 가져올 뉴스 기사의 최대 수.
+        known_filter (callable): 증분 크롤링에 사용할 수집 여부 판별 함수.
 
-    return None
+    Returns:
+        list: 크롤링된 뉴스 기사 목록.
+    """
+    return run_in_crawler_loop(
+        crawl_news_async(keyword, limit, known_filter=known_filter)
+    ).result()
 
 
 def log_crawling_error(keyword, status_code, message):
@@ -122,51 +259,3 @@ def log_crawling_error(keyword, status_code, message):
     if status_code:
         error_message += f" (HTTP {status_code})"
     print(error_message)
-
-
-def extract_published_date(item):
-    """
-    뉴스 기사의 게시 날짜를 추출합니다.
-
-    Args:
-        item (BeautifulSoup element): 크롤링된 뉴스 아이템.
-
-    Returns:
-        str: 게시 날짜를 'YYYY-MM-DD HH:MM:SS' 형식으로 반환. 추출 실패 시 None 반환.
-    """
-    try:
-        # info_group 내의 모든 info 태그 추출
-        info_elements = item.select(".info_group .info")
-        now = datetime.now()
-
-        for element in info_elements:
-            date_text = element.text.strip() if element.text else None
-
-            if not date_text:  # date_text가 None이면 건너뛰기
-                continue
-
-            # 상대 시간 처리 (예: "1일 전", "3시간 전")
-            if "전" in date_text:
-                if "분" in date_text:
-                    delta = int(re.search(r"\d+", date_text).group())
-                    return (now - timedelta(minutes=delta)).strftime(
-                        "%Y-%m-%d %H:%M:%S"
-                    )
-                elif "시간" in date_text:
-                    delta = int(re.search(r"\d+", date_text).group())
-                    return (now - timedelta(hours=delta)).strftime("%Y-%m-%d %H:%M:%S")
-                elif "일" in date_text:
-                    delta = int(re.search(r"\d+", date_text).group())
-                    return (now - timedelta(days=delta)).strftime("%Y-%m-%d %H:%M:%S")
-
-            # 절대 시간 처리 (예: "2024.12.03.")
-            if re.match(r"\d{4}\.\d{2}\.\d{2}\.", date_text):
-                return datetime.strptime(date_text, "%Y.%m.%d.").strftime(
-                    "%Y-%m-%d %H:%M:%S"
-                )
-
-    except Exception as e:
-        print(f"Error extracting date: {e}")
-
-    return None
-
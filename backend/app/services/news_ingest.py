@@ -0,0 +1,210 @@
+import io
+import time
+from dataclasses import dataclass, field
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.category import Category
+from app.models.news import News
+from app.models.news_category import NewsCategory
+
+NEWS_COLUMNS = ("title", "description", "url", "published_at", "source", "category")
+
+
+@dataclass
+class IngestResult:
+    """
+    일괄 저장 결과. duplicates에는 이미 DB에 있던 기사와 입력 안에서 중복된 기사가 모두 포함됩니다.
+    invalid는 URL이 없어 저장하지 않은 기사 수입니다 (중복으로 세지 않음).
+    linked는 이미 저장되어 있던 기사 중 이번에 카테고리에 새로 연결된 기사 수입니다.
+    """
+    received: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    linked: int = 0
+    inserted_ids: list[int] = field(default_factory=list)
+    linked_ids: list[int] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.received / self.elapsed if self.elapsed else 0.0
+
+
+def get_or_create_category_id(db: Session, name: str) -> int:
+    """
+    카테고리 이름으로 ID를 조회하고, 없으면 생성합니다.
+    """
+    category_id = db.execute(select(Category.id).filter(Category.name == name)).scalar_one_or_none()
+    if category_id is None:
+        db.execute(insert(Category).values(name=name).on_conflict_do_nothing(index_elements=["name"]))
+        category_id = db.execute(select(Category.id).filter(Category.name == name)).scalar_one()
+    return category_id
+
+
+def _to_rows(articles: list[dict], category: str) -> list[dict]:
+    """
+    크롤링 결과를 news 테이블 행으로 변환하고 URL 기준으로 중복을 제거합니다.
+    """
+    rows = {}
+    for article in articles:
+        if not article.get("url") or article["url"] in rows:
+            continue
+        rows[article["url"]] = {
+            "title": article["title"],
+            "description": article["description"],
+            "url": article["url"],
+            "published_at": article.get("published_at"),
+            "source": article.get("source"),
+            "category": category,
+        }
+    return list(rows.values())
+
+
+def _insert_batches(db: Session, rows: list[dict], batch_size: int) -> list[int]:
+    """
+    multi-row INSERT ... ON CONFLICT DO NOTHING RETURNING id 를 배치 단위로 실행합니다.
+    """
+    inserted_ids = []
+    for start in range(0, len(rows), batch_size):
+        stmt = (
+            insert(News)
+            .values(rows[start:start + batch_size])
+            .on_conflict_do_nothing(index_elements=["url"])
+            .returning(News.id)
+        )
+        inserted_ids.extend(db.execute(stmt).scalars().all())
+    return inserted_ids
+
+
+def _copy_value(value) -> str:
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _copy_insert(db: Session, rows: list[dict]) -> list[int]:
+    """
+    대량 백필용 경로. COPY로 임시 staging 테이블에 적재한 뒤 한 번의 INSERT ... SELECT로 옮깁니다.
+    staging 테이블은 항상 pg_temp로 지정해, search_path에 같은 이름의 일반 테이블이 있어도 건드리지 않습니다.
+    """
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_value(row[column]) for column in NEWS_COLUMNS) + "\n")
+    buffer.seek(0)
+
+    columns = ", ".join(NEWS_COLUMNS)
+    cursor = db.connection().connection.cursor()
+    try:
+        # 같은 트랜잭션에서 이미 만든 staging 테이블이 있으면 지웁니다 (ON COMMIT DROP 전).
+        cursor.execute("DROP TABLE IF EXISTS pg_temp.news_staging")
+        cursor.execute(
+            """
+            CREATE TEMP TABLE pg_temp.news_staging (
+                title text, description text, url text, published_at timestamp,
+                source text, category text
+            ) ON COMMIT DROP
+            """
+        )
+        cursor.copy_expert(f"COPY pg_temp.news_staging ({columns}) FROM STDIN", buffer)
+        cursor.execute(
+            f"""
+            INSERT INTO news ({columns})
+            SELECT {columns} FROM pg_temp.news_staging
+            ON CONFLICT (url) DO NOTHING
+            RETURNING id
+            """
+        )
+        return [row[0] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def _link_category(db: Session, news_ids: list[int], category_id: int) -> list[int]:
+    """
+    기사들을 카테고리에 연결하고, 새로 연결된 기사 ID를 반환합니다.
+    """
+    linked_ids = []
+    for start in range(0, len(news_ids), settings.INGEST_BATCH_SIZE):
+        stmt = (
+            insert(NewsCategory)
+            .values([
+                {"news_id": news_id, "category_id": category_id}
+                for news_id in news_ids[start:start + settings.INGEST_BATCH_SIZE]
+            ])
+            .on_conflict_do_nothing()
+            .returning(NewsCategory.news_id)
+        )
+        linked_ids.extend(db.execute(stmt).scalars().all())
+    return linked_ids
+
+
+def bulk_insert_news(
+    db: Session,
+    articles: list[dict],
+    category_id: int,
+    category_name: str,
+    batch_size: int = None,
+) -> IngestResult:
+    """
+    크롤링된 기사들을 일괄 저장하고 카테고리에 연결합니다.
+    이미 있는 URL은 다시 저장하지 않고 카테고리 연결만 추가합니다.
+    기사 수가 INGEST_COPY_THRESHOLD 이상이면 COPY 경로를 사용합니다.
+    커밋은 호출자가 수행합니다.
+
+    Args:
+        db (Session): 동기 DB 세션.
+        articles (list): 크롤링된 기사 목록.
+        category_id (int): 기사를 연결할 카테고리 ID.
+        category_name (str): 카테고리 이름 (새 기사의 표시용 category 값).
+        batch_size (int): multi-row INSERT 한 번에 보낼 행 수.
+
+    Returns:
+        IngestResult: 새로 저장된 기사 수, 중복 수, 새 기사 ID 목록 등.
+    """
+    started = time.perf_counter()
+    rows = _to_rows(articles, category_name)
+    invalid = sum(1 for article in articles if not article.get("url"))
+
+    if not rows:
+        inserted_ids = []
+    elif len(rows) >= settings.INGEST_COPY_THRESHOLD:
+        inserted_ids = _copy_insert(db, rows)
+    else:
+        inserted_ids = _insert_batches(db, rows, batch_size or settings.INGEST_BATCH_SIZE)
+
+    # 다른 카테고리로 이미 저장된 기사는 ID만 조회해 연결합니다.
+    existing_ids = []
+    if len(inserted_ids) < len(rows):
+        existing_ids = list(
+            db.execute(
+                select(News.id).filter(
+                    News.url.in_([row["url"] for row in rows]),
+                    News.id.notin_(inserted_ids),
+                )
+            ).scalars().all()
+        )
+
+    _link_category(db, inserted_ids, category_id)
+    linked_ids = _link_category(db, existing_ids, category_id)
+
+    return IngestResult(
+        received=len(articles),
+        inserted=len(inserted_ids),
+        duplicates=len(articles) - invalid - len(inserted_ids),
+        invalid=invalid,
+        linked=len(linked_ids),
+        inserted_ids=inserted_ids,
+        linked_ids=linked_ids,
+        elapsed=time.perf_counter() - started,
+    )
@@ -0,0 +1,201 @@
+import re
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from bs4 import BeautifulSoup
+from lxml import html as lxml_html
+
+from app.config import settings
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # selectolax는 선택 의존성
+    LexborHTMLParser = None
+
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# 날짜 파싱용 정규식 (모듈 로드 시 한 번만 컴파일)
+RELATIVE_DATE_RE = re.compile(r"(\d+)\s*(분|시간|일)\s*전")
+ABSOLUTE_DATE_RE = re.compile(r"\d{4}\.\d{2}\.\d{2}\.")
+RELATIVE_UNITS = {"분": "minutes", "시간": "hours", "일": "days"}
+
+
+@dataclass
+class ArticleRecord:
+    """
+    검색 결과에서 추출한 뉴스 기사 한 건.
+    """
+    title: str
+    description: str
+    url: str
+    published_at: Optional[str]
+    source: Optional[str]
+    category: str
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def parse_published_date(info_texts: list[str], now: datetime) -> Optional[str]:
+    """
+    `.info_group .info` 텍스트 목록에서 게시 날짜를 추출합니다.
+
+    Args:
+        info_texts (list): info 태그들의 텍스트.
+        now (datetime): 상대 시간("3시간 전") 계산 기준 시각.
+
+    Returns:
+        str: 게시 날짜를 'YYYY-MM-DD HH:MM:SS' 형식으로 반환. 추출 실패 시 None 반환.
+    """
+    for date_text in info_texts:
+        if not date_text:
+            continue
+
+        # 상대 시간 처리 (예: "1일 전", "3시간 전")
+        match = RELATIVE_DATE_RE.search(date_text)
+        if match:
+            delta = timedelta(**{RELATIVE_UNITS[match.group(2)]: int(match.group(1))})
+            return (now - delta).strftime(DATE_FORMAT)
+
+        # 절대 시간 처리 (예: "2024.12.03.")
+        if ABSOLUTE_DATE_RE.match(date_text):
+            return datetime.strptime(date_text[:11], "%Y.%m.%d.").strftime(DATE_FORMAT)
+
+    return None
+
+
+def _has_class(class_attr: Optional[str], name: str) -> bool:
+    return bool(class_attr) and name in class_attr.split()
+
+
+class ResultPageParser:
+    """
+    네이버 뉴스 검색 결과 페이지 파서의 공통 인터페이스.
+    """
+    name = None
+
+    def parse(self, html: str, keyword: str, now: datetime = None) -> list[ArticleRecord]:
+        """
+        검색 결과 HTML에서 기사 목록을 추출합니다. 상대 시간 계산 기준 시각은 페이지당 한 번만 구합니다.
+        """
+        now = now or datetime.now()
+        articles = []
+        for title, url, description, info_texts in self._iter_items(html):
+            articles.append(
+                ArticleRecord(
+                    title=title,
+                    description=description,
+                    url=url,
+                    published_at=parse_published_date(info_texts, now),
+                    source=info_texts[0] if info_texts else None,
+                    category=keyword,
+                )
+            )
+        return articles
+
+    def _iter_items(self, html: str):
+        """
+        기사별 (title, url, description, info_texts) 튜플을 생성합니다.
+        """
+        raise NotImplementedError
+
+
+class SoupResultPageParser(ResultPageParser):
+    """
+    BeautifulSoup(html.parser) 기반 파서. 기존 크롤러와 같은 동작을 하는 기준 구현입니다.
+    """
+    name = "soup"
+
+    def _iter_items(self, html: str):
+        soup = BeautifulSoup(html, "html.parser")
+        for item in soup.select(".news_wrap"):
+            title_tag = item.select_one(".news_tit")
+            info_texts = [info.text.strip() for info in item.select(".info_group .info")]
+            yield (
+                title_tag.get("title", ""),
+                title_tag.get("href", ""),
+                item.select_one(".dsc_wrap").text.strip(),
+                info_texts,
+            )
+
+
+class LxmlResultPageParser(ResultPageParser):
+    """
+    lxml 기반 파서. 기사마다 하위 노드를 한 번만 순회하며 필요한 값을 모두 추출합니다.
+    """
+    name = "lxml"
+
+    _items_xpath = "//*[contains(concat(' ', normalize-space(@class), ' '), ' news_wrap ')]"
+
+    def _iter_items(self, html: str):
+        root = lxml_html.fromstring(html)
+        for item in root.xpath(self._items_xpath):
+            title_tag = None
+            description = None
+            info_group = None
+            info_texts = []
+
+            for element in item.iter():
+                class_attr = element.get("class")
+                if not class_attr:
+                    continue
+                if title_tag is None and _has_class(class_attr, "news_tit"):
+                    title_tag = element
+                elif description is None and _has_class(class_attr, "dsc_wrap"):
+                    description = element.text_content().strip()
+                elif _has_class(class_attr, "info_group"):
+                    info_group = element
+                elif (
+                    info_group is not None
+                    and _has_class(class_attr, "info")
+                    and info_group in element.iterancestors()
+                ):
+                    info_texts.append(element.text_content().strip())
+
+            yield (
+                title_tag.get("title", ""),
+                title_tag.get("href", ""),
+                description,
+                info_texts,
+            )
+
+
+class SelectolaxResultPageParser(ResultPageParser):
+    """
+    selectolax(lexbor) 기반 파서. selectolax가 설치된 경우에만 사용할 수 있습니다.
+    """
+    name = "selectolax"
+
+    def _iter_items(self, html: str):
+        tree = LexborHTMLParser(html)
+        for item in tree.css(".news_wrap"):
+            title_tag = item.css_first(".news_tit")
+            yield (
+                title_tag.attributes.get("title") or "",
+                title_tag.attributes.get("href") or "",
+                item.css_first(".dsc_wrap").text().strip(),
+                [info.text().strip() for info in item.css(".info_group .info")],
+            )
+
+
+PARSER_BACKENDS = {
+    SoupResultPageParser.name: SoupResultPageParser,
+    LxmlResultPageParser.name: LxmlResultPageParser,
+}
+if LexborHTMLParser is not None:
+    PARSER_BACKENDS[SelectolaxResultPageParser.name] = SelectolaxResultPageParser
+
+
+def get_result_page_parser(name: str = None) -> ResultPageParser:
+    """
+    설정(CRAWLER_PARSER)에 따라 검색 결과 파서를 반환합니다.
+    설치되지 않은 백엔드가 지정되면 lxml 파서를 사용합니다.
+    """
+    name = name or settings.CRAWLER_PARSER
+    backend = PARSER_BACKENDS.get(name)
+    if backend is None:
+        print(f"Unknown or unavailable parser backend '{name}', falling back to lxml")
+        backend = LxmlResultPageParser
+    return backend()
@@ -0,0 +1,16 @@
+from sqlalchemy import select
+
+from app.models.category import Category
+from app.models.news import News
+from app.models.news_category import NewsCategory
+
+
+def category_news_condition(category_name: str):
+    """
+    특정 카테고리에 연결된 기사만 고르는 조건.
+    """
+    return News.id.in_(
+        select(NewsCategory.news_id)
+        .join(Category, Category.id == NewsCategory.category_id)
+        .filter(Category.name == category_name)
+    )
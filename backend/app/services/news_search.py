@@ -0,0 +1,91 @@
+import html
+import re
+
+from sqlalchemy import Float, cast, func, literal, or_, tuple_
+from sqlalchemy.future import select
+
+from app.models.news import News
+from app.services.news_query import category_news_condition
+
+HANGUL_RE = re.compile(r"^[가-힣]+$")
+QUERY_TOKEN_RE = re.compile(r"[가-힣]+|[0-9a-z]+")
+SNIPPET_LENGTH = 160
+
+
+def query_tokens(q: str) -> list[str]:
+    """
+    검색어를 한글 구간과 영문/숫자 구간으로 나눕니다.
+    """
+    return QUERY_TOKEN_RE.findall(q.lower())
+
+
+def build_tsquery(q: str) -> str:
+    """
+    검색어를 to_tsquery('simple', ...) 문자열로 변환합니다.
+    한글 토큰은 색인과 같은 방식으로 bigram AND 조건으로, 한 글자 한글과 영문/숫자 토큰은 접두어 검색으로 바꿉니다.
+    """
+    terms = []
+    for token in query_tokens(q):
+        if HANGUL_RE.match(token) and len(token) > 1:
+            terms.append(" & ".join(token[i:i + 2] for i in range(len(token) - 1)))
+        else:
+            terms.append(f"{token}:*")
+    return " & ".join(f"({term})" for term in terms)
+
+
+def rank_expression(q: str):
+    tsquery = func.to_tsquery("simple", build_tsquery(q))
+    return cast(func.ts_rank_cd(News.search_vector, tsquery) + func.similarity(News.title, q), Float)
+
+
+def search_news_query(q: str, category: str = None, after: dict = None, limit: int = 20):
+    """
+    전문 검색(tsvector) 또는 제목 trigram 유사도로 일치하는 기사를 관련도순으로 조회하는 쿼리.
+
+    Args:
+        q (str): 검색어.
+        category (str): 카테고리 필터.
+        after (dict): 이전 페이지 마지막 행의 {"rank", "id"} (keyset 커서).
+        limit (int): 조회할 행 수.
+    """
+    tsquery = func.to_tsquery("simple", build_tsquery(q))
+    rank = rank_expression(q).label("rank")
+
+    query = select(News, rank).filter(
+        or_(News.search_vector.op("@@")(tsquery), News.title.op("%")(q))
+    )
+    if category:
+        query = query.filter(category_news_condition(category))
+    if after:
+        query = query.filter(
+            tuple_(rank_expression(q), News.id) < tuple_(literal(float(after["rank"]), Float), int(after["id"]))
+        )
+    return query.order_by(rank.desc(), News.id.desc()).limit(limit)
+
+
+def highlight(text: str, q: str, snippet: bool = False) -> str:
+    """
+    검색어와 일치하는 부분을 <mark>로 감쌉니다. HTML은 이스케이프됩니다.
+    snippet이 True이면 첫 일치 위치 주변 SNIPPET_LENGTH 글자만 남깁니다.
+    """
+    text = text or ""
+    tokens = sorted(set(query_tokens(q)), key=len, reverse=True)
+    pattern = re.compile("|".join(re.escape(token) for token in tokens), re.IGNORECASE) if tokens else None
+
+    if snippet and len(text) > SNIPPET_LENGTH:
+        match = pattern.search(text) if pattern else None
+        start = max(0, (match.start() if match else 0) - SNIPPET_LENGTH // 4)
+        end = start + SNIPPET_LENGTH
+        text = ("…" if start > 0 else "") + text[start:end] + ("…" if end < len(text) else "")
+
+    if not pattern:
+        return html.escape(text)
+
+    parts = []
+    last = 0
+    for match in pattern.finditer(text):
+        parts.append(html.escape(text[last:match.start()]))
+        parts.append(f"<mark>{html.escape(match.group())}</mark>")
+        last = match.end()
+    parts.append(html.escape(text[last:]))
+    return "".join(parts)
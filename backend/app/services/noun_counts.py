@@ -0,0 +1,54 @@
+from collections import Counter
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.news import News
+from app.services.morph_analyzer import get_morph_analyzer
+
+
+def count_nouns(nouns: list[str]) -> dict[str, int]:
+    return dict(Counter(nouns))
+
+
+def store_noun_counts(db: Session, news_ids: list[int]) -> int:
+    """
+    아직 명사 집계가 없는 기사들의 제목과 설명에서 명사를 추출해 news.noun_counts에 저장합니다.
+    기사마다 한 번만 분석하므로, 각 API 프로세스의 BM25 색인은 기사를 다시 형태소 분석하지 않고 이 집계를 읽습니다.
+
+    Returns:
+        int: 새로 집계한 기사 수.
+    """
+    news_ids = sorted(set(news_ids))
+    if not news_ids:
+        return 0
+
+    rows = db.execute(
+        select(News.id, News.title, News.description).filter(News.id.in_(news_ids), News.noun_counts.is_(None))
+    ).all()
+    if not rows:
+        return 0
+
+    nouns = get_morph_analyzer().nouns_many([f"{row.title} {row.description}" for row in rows])
+    db.execute(
+        update(News),
+        [{"id": row.id, "noun_counts": count_nouns(words)} for row, words in zip(rows, nouns)],
+    )
+    db.commit()
+    return len(rows)
+
+
+def backfill_noun_counts(db: Session, batch_size: int = None) -> int:
+    """
+    명사 집계가 없는 모든 기사를 batch_size개씩 집계합니다 (기존 데이터 백필용).
+    """
+    batch_size = batch_size or settings.INGEST_BATCH_SIZE
+    counted = 0
+    while True:
+        news_ids = db.execute(
+            select(News.id).filter(News.noun_counts.is_(None)).order_by(News.id).limit(batch_size)
+        ).scalars().all()
+        if not news_ids:
+            return counted
+        counted += store_noun_counts(db, news_ids)
@@ -0,0 +1,24 @@
+import base64
+import json
+
+
+def encode_cursor(position: dict) -> str:
+    """
+    마지막으로 반환한 행의 정렬 키를 불투명한(opaque) 커서 문자열로 인코딩합니다.
+    """
+    raw = json.dumps(position, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    encode_cursor로 만든 커서를 되돌립니다. 형식이 잘못되면 ValueError를 발생시킵니다.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position = json.loads(raw)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+    if not isinstance(position, dict):
+        raise ValueError("Invalid cursor")
+    return position
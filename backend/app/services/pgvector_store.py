@@ -0,0 +1,248 @@
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Optional
+
+from langchain.schema import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+from sqlalchemy import and_, delete, exists, func, or_, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.news import News
+from app.models.news_category import NewsCategory
+from app.models.news_embedding import NewsEmbedding
+
+CATEGORY_FLAG_PREFIX = "category_"
+
+_COMPARATORS = {
+    "$eq": lambda column, value: column == value,
+    "$ne": lambda column, value: column != value,
+    "$gt": lambda column, value: column > value,
+    "$gte": lambda column, value: column >= value,
+    "$lt": lambda column, value: column < value,
+    "$lte": lambda column, value: column <= value,
+    "$in": lambda column, value: column.in_(value),
+    "$nin": lambda column, value: column.not_in(value),
+}
+
+
+def _from_epoch(value: int) -> datetime:
+    return datetime.fromtimestamp(value, timezone.utc).replace(tzinfo=None)
+
+
+def _field_condition(field: str, condition):
+    if field.startswith(CATEGORY_FLAG_PREFIX):
+        # category_{id} 플래그는 news_categories 연결로 확인합니다.
+        category_id = int(field[len(CATEGORY_FLAG_PREFIX):])
+        linked = exists().where(
+            NewsCategory.news_id == NewsEmbedding.news_id, NewsCategory.category_id == category_id
+        )
+        if condition not in (True, {"$eq": True}):
+            raise ValueError(f"Unsupported category condition: {condition}")
+        return linked
+
+    if field == "news_id":
+        column, convert = NewsEmbedding.news_id, int
+    elif field == "published_at":
+        # Chroma 메타데이터와 같이 게시 시간이 없는 기사는 수집 시각으로 비교합니다.
+        column, convert = func.coalesce(News.published_at, News.inserted_at), _from_epoch
+    else:
+        raise ValueError(f"Unsupported filter field: {field}")
+
+    if not isinstance(condition, dict):
+        condition = {"$eq": condition}
+    clauses = []
+    for operator, value in condition.items():
+        if operator not in _COMPARATORS:
+            raise ValueError(f"Unsupported filter operator: {operator}")
+        value = [convert(item) for item in value] if operator in ("$in", "$nin") else convert(value)
+        clauses.append(_COMPARATORS[operator](column, value))
+    return and_(*clauses)
+
+
+def where_clause(where: dict):
+    """
+    Chroma where 조건(vector_filter 결과)을 SQL 조건으로 바꿉니다.
+    지원하는 조건: $and, $or, category_{id} 플래그, news_id, published_at(epoch 초) 비교.
+    """
+    clauses = []
+    for key, value in where.items():
+        if key == "$and":
+            clauses.append(and_(*(where_clause(item) for item in value)))
+        elif key == "$or":
+            clauses.append(or_(*(where_clause(item) for item in value)))
+        else:
+            clauses.append(_field_condition(key, value))
+    return and_(*clauses)
+
+
+def parse_chunk_id(chunk_id: str) -> tuple[int, int]:
+    news_id, chunk_index = chunk_id.split(":")
+    return int(news_id), int(chunk_index)
+
+
+def check_dimensions(embedding: Embeddings, session_factory: Callable = SessionLocal):
+    """
+    임베딩 모델, PGVECTOR_DIMENSIONS, news_embeddings.embedding 컬럼의 차원이 모두 같은지 확인합니다.
+    다르면 저장할 때마다 실패해 임베딩 작업이 재시도 끝에 배치를 버리게 되므로, 시작할 때 바로 실패시킵니다.
+
+    Raises:
+        RuntimeError: 차원이 서로 다를 때.
+    """
+    expected = settings.PGVECTOR_DIMENSIONS
+    model = len(embedding.embed_query("임베딩 차원 확인"))
+    with session_factory() as db:
+        column = db.scalar(text(
+            "SELECT format_type(atttypid, atttypmod) FROM pg_attribute "
+            "WHERE attrelid = 'news_embeddings'::regclass AND attname = 'embedding'"
+        ))
+    if model != expected or column != f"vector({expected})":
+        raise RuntimeError(
+            f"Embedding dimensions do not match: model {settings.EMBEDDING_BACKEND} has {model}, "
+            f"PGVECTOR_DIMENSIONS is {expected}, news_embeddings.embedding is {column}. "
+            "Set PGVECTOR_DIMENSIONS to the model's dimensions and recreate news_embeddings (then run reindex_news)."
+        )
+
+
+class PgVectorStore(VectorStore):
+    """
+    PostgreSQL(pgvector)의 news_embeddings 테이블을 사용하는 LangChain 벡터 스토어.
+    청크 ID는 Chroma 컬렉션과 같은 "{news_id}:{청크 번호}" 형식이며,
+    검색 조건은 Chroma where 형식(vector_filter)을 그대로 받아 news/news_categories와의 SQL 조건으로 적용합니다.
+    """
+
+    def __init__(self, embedding: Embeddings, session_factory: Callable = SessionLocal, ef_search: int = None):
+        self.embedding = embedding
+        self.session_factory = session_factory
+        self.ef_search = ef_search or settings.PGVECTOR_EF_SEARCH
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding
+
+    def _check_dimensions(self, vector: list[float]):
+        if len(vector) != settings.PGVECTOR_DIMENSIONS:
+            raise ValueError(
+                f"Embedding has {len(vector)} dimensions but news_embeddings.embedding expects "
+                f"{settings.PGVECTOR_DIMENSIONS} (PGVECTOR_DIMENSIONS)"
+            )
+
+    def add_texts(self, texts: Iterable[str], metadatas: Optional[list[dict]] = None,
+                  ids: Optional[list[str]] = None, **kwargs: Any) -> list[str]:
+        """
+        청크를 임베딩해 저장합니다. ids("{news_id}:{청크 번호}")가 없으면 metadatas의 news_id와 순서로 만듭니다.
+        같은 청크가 이미 있으면 내용과 임베딩을 덮어씁니다.
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        if ids is None:
+            if metadatas is None:
+                raise ValueError("PgVectorStore.add_texts requires ids or metadatas with news_id")
+            ids = [f"{metadata['news_id']}:{index}" for index, metadata in enumerate(metadatas)]
+
+        vectors = self.embedding.embed_documents(texts)
+        rows = []
+        for chunk_id, content, vector in zip(ids, texts, vectors):
+            self._check_dimensions(vector)
+            news_id, chunk_index = parse_chunk_id(chunk_id)
+            rows.append({
+                "news_id": news_id,
+                "chunk_index": chunk_index,
+                "content": content,
+                "embedding": vector,
+            })
+
+        stmt = insert(NewsEmbedding).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["news_id", "chunk_index"],
+            set_={"content": stmt.excluded.content, "embedding": stmt.excluded.embedding},
+        )
+        with self.session_factory() as db:
+            db.execute(stmt)
+            db.commit()
+        return list(ids)
+
+    def delete(self, ids: Optional[list[str]] = None, **kwargs: Any) -> Optional[bool]:
+        if not ids:
+            return False
+        keys = [parse_chunk_id(chunk_id) for chunk_id in ids]
+        with self.session_factory() as db:
+            db.execute(
+                delete(NewsEmbedding).where(tuple_(NewsEmbedding.news_id, NewsEmbedding.chunk_index).in_(keys))
+            )
+            db.commit()
+        return True
+
+    def embedded_news_ids(self, news_ids: list[int]) -> set[int]:
+        """
+        이미 임베딩이 저장된 기사 ID. 카테고리는 news_categories에서 조인하므로 이 기사들은 다시 쓸 필요가 없습니다.
+        """
+        if not news_ids:
+            return set()
+        with self.session_factory() as db:
+            return set(db.scalars(
+                select(NewsEmbedding.news_id).distinct().where(NewsEmbedding.news_id.in_(news_ids))
+            ))
+
+    def similarity_search_with_score_by_vector(self, embedding: list[float], k: int = 4,
+                                               filter: Optional[dict] = None) -> list[tuple[Document, float]]:
+        """
+        코사인 거리 순으로 청크를 찾습니다. 점수는 거리(작을수록 가까움)입니다.
+        HNSW 색인은 ef_search개의 후보를 찾은 뒤 조건을 적용하므로, 조건이 좁으면 ef_search를 키워야 k개가 채워집니다.
+        """
+        self._check_dimensions(embedding)
+        distance = NewsEmbedding.embedding.cosine_distance(embedding).label("distance")
+        stmt = (
+            select(
+                NewsEmbedding.news_id, NewsEmbedding.chunk_index, NewsEmbedding.content,
+                func.coalesce(News.published_at, News.inserted_at).label("published_at"), distance,
+            )
+            .join(News, News.id == NewsEmbedding.news_id)
+            .order_by(distance)
+            .limit(k)
+        )
+        if filter:
+            stmt = stmt.where(where_clause(filter))
+
+        with self.session_factory() as db:
+            db.execute(text(f"SET LOCAL hnsw.ef_search = {max(int(self.ef_search), k)}"))
+            rows = db.execute(stmt).all()
+
+        return [
+            (
+                Document(
+                    page_content=row.content,
+                    metadata={
+                        "news_id": row.news_id,
+                        "chunk_index": row.chunk_index,
+                        "published_at": int(row.published_at.replace(tzinfo=timezone.utc).timestamp()) if row.published_at else 0,
+                    },
+                ),
+                float(row.distance),
+            )
+            for row in rows
+        ]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, filter: Optional[dict] = None,
+                                     **kwargs: Any) -> list[tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(self.embedding.embed_query(query), k=k, filter=filter)
+
+    def similarity_search_by_vector(self, embedding: list[float], k: int = 4, filter: Optional[dict] = None,
+                                    **kwargs: Any) -> list[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k=k, filter=filter)]
+
+    def similarity_search(self, query: str, k: int = 4, filter: Optional[dict] = None, **kwargs: Any) -> list[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k, filter=filter)]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        return self._cosine_relevance_score_fn
+
+    @classmethod
+    def from_texts(cls, texts: list[str], embedding: Embeddings, metadatas: Optional[list[dict]] = None,
+                   **kwargs: Any) -> "PgVectorStore":
+        ids = kwargs.pop("ids", None)
+        store = cls(embedding=embedding, **kwargs)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
@@ -1,33 +1,24 @@
 from langchain_core.prompts import PromptTemplate
-from langchain_core.runnables import RunnableLambda, RunnablePassthrough
+from langchain_core.runnables import RunnableLambda
 from langchain_core.output_parsers import StrOutputParser
-from langchain_openai import ChatOpenAI
+from app.services.llm_backends import get_chat_model
+from app.services.context_builder import RAG_PROMPT_TEMPLATE, build_context
 
-def format_docs(docs):
-    """
-    검색된 문서를 문자열로 포맷팅합니다.
-    """
-    return "\n\n".join(doc.page_content for doc in docs)
-
-def build_rag_chain(vectorstore):
+def build_rag_chain(vectorstore, history=()):
     retriever = vectorstore.as_retriever()
 
     # 프롬프트 템플릿
-    prompt_template = """You are an assistant for question-answering tasks. Use the following pieces of retrieved context to answer the question. If you don't know the answer, just say that you don't know. Use three sentences maximum and keep the answer concise.
-
-    Question: {question} 
-
-    Context: {context} 
+    prompt = PromptTemplate.from_template(RAG_PROMPT_TEMPLATE)
 
-    Answer:
-    """
-    prompt = PromptTemplate.from_template(prompt_template)
+    # 검색 문서는 토큰 예산 안에서 중복 없이 최신순으로 조립합니다.
+    def prompt_inputs(question):
+        return build_context(question, retriever.invoke(question), history).prompt_inputs()
 
     # RAG 체인 구성
     rag_chain = (
-        {"context": retriever | format_docs, "question": RunnablePassthrough()}
+        RunnableLambda(prompt_inputs)
         | prompt
-        | ChatOpenAI(model="gpt-4o", temperature=0, max_tokens=None)
+        | get_chat_model()
         | StrOutputParser()
     )
     return rag_chain
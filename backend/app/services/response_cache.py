@@ -0,0 +1,100 @@
+import hashlib
+from typing import Any, Awaitable, Callable
+from urllib.parse import urlencode
+
+import orjson
+import redis
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from app.config import settings
+from app.services.redis_client import redis_client
+
+
+def normalized_query(request: Request) -> str:
+    """
+    쿼리 파라미터를 이름/값 순으로 정렬하고 빈 값을 뺀 문자열. 순서만 다른 요청은 같은 캐시 항목을 씁니다.
+    """
+    return urlencode(sorted((name, value) for name, value in request.query_params.multi_items() if value != ""))
+
+
+def etag_for(body: bytes) -> str:
+    return f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return "*" in candidates or etag in (candidate.removeprefix("W/") for candidate in candidates)
+
+
+class ResponseCache:
+    """
+    읽기 전용 GET 응답 본문을 Redis에 캐시합니다.
+
+    - 키: `resp:{namespace}:{sha1(사용자, 정규화한 쿼리 파라미터, 데이터 버전)}`, 값: orjson으로 직렬화한 본문.
+    - 데이터 버전은 데이터를 바꾸는 작업(트렌드 저장, 기사 수집)이 올리므로(cache_versions),
+      버전이 바뀌면 이전 항목은 더 이상 조회되지 않고 TTL이 지나 사라집니다.
+    - ETag는 본문 해시입니다. If-None-Match가 같으면 본문 없이 304를 반환합니다.
+    버전을 알 수 없거나(Redis 오류) 캐시가 꺼져 있으면 매번 계산하되, ETag 비교는 그대로 합니다.
+    """
+
+    def __init__(self, namespace: str, client: redis.Redis = None, ttl: int = None, enabled: bool = None):
+        self.namespace = namespace
+        self.redis = client or redis_client
+        self.ttl = ttl or settings.RESPONSE_CACHE_TTL_SECONDS
+        self.enabled = settings.RESPONSE_CACHE_ENABLED if enabled is None else enabled
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, request: Request, user_id: int = None, version: str = "") -> str:
+        identity = f"{user_id}|{normalized_query(request)}|{version}"
+        return f"resp:{self.namespace}:{hashlib.sha1(identity.encode('utf-8')).hexdigest()}"
+
+    def _get(self, key: str):
+        try:
+            return self.redis.get(key)
+        except redis.RedisError as e:
+            print(f"Error reading response cache: {e}")
+            return None
+
+    def _set(self, key: str, body: bytes):
+        try:
+            self.redis.set(key, body, ex=self.ttl)
+        except redis.RedisError as e:
+            print(f"Error writing response cache: {e}")
+
+    async def respond(
+        self,
+        request: Request,
+        build: Callable[[], Awaitable[Any]],
+        user_id: int = None,
+        version: str = None,
+    ) -> Response:
+        """
+        Args:
+            request (Request): 현재 요청 (쿼리 파라미터, If-None-Match).
+            build (callable): 캐시에 없을 때 응답 데이터를 만드는 코루틴 함수. 예외(HTTPException 등)는 캐시하지 않고 그대로 전달됩니다.
+            user_id (int): 응답이 사용자별이면 사용자 ID.
+            version (str): 데이터 버전. None이면 캐시를 쓰지 않습니다.
+
+        Returns:
+            Response: JSON 본문(200) 또는 304.
+        """
+        key = self.key(request, user_id, version) if self.enabled and version is not None else None
+        body = self._get(key) if key else None
+        if body is None:
+            self.misses += 1
+            body = orjson.dumps(jsonable_encoder(await build()))
+            if key:
+                self._set(key, body)
+        else:
+            self.hits += 1
+
+        etag = etag_for(body)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,89 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from langchain.schema import Document
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.retrievers import BaseRetriever
+
+from app.config import settings
+from app.services.bm25_index import get_bm25_index
+from app.services.vector_store import get_news_vectorstore, vector_filter
+
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(rankings: list[list], k: int = RRF_K) -> list[tuple]:
+    """
+    여러 검색 결과 순위를 RRF(sum 1 / (k + rank))로 합칩니다.
+
+    Args:
+        rankings (list): 검색기별 키 목록 (앞쪽일수록 관련도가 높음).
+
+    Returns:
+        list: 점수 내림차순 (키, 점수) 목록.
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    BM25(키워드)와 벡터(의미) 검색을 RRF로 합치는 리트리버.
+    카테고리와 게시 시간 조건은 두 색인 모두에서 검색 시점에 적용되어, 범위 밖 기사는 후보로도 읽지 않습니다.
+    BM25 색인은 스케줄러가 백그라운드에서 갱신하며, 검색 중에는 읽기만 합니다.
+    결과는 기사 단위로 합쳐지며, 벡터 검색에서 찾은 기사는 가장 가까운 청크를 사용합니다.
+    """
+
+    vectorstore: Any
+    bm25: Any
+    category_ids: list[int]
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    k: int = 4
+    fetch_k: int = 20
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> list[Document]:
+        bm25_hits = self.bm25.search(query, self.fetch_k, self.category_ids, self.since, self.until)
+        vector_docs = self.vectorstore.similarity_search(
+            query, k=self.fetch_k, filter=vector_filter(self.category_ids, self.since, self.until)
+        )
+
+        documents = {}
+        for doc in vector_docs:
+            documents.setdefault(doc.metadata["news_id"], doc)
+        fused = reciprocal_rank_fusion([[news_id for news_id, _ in bm25_hits], list(documents)])
+
+        results = []
+        for news_id, score in fused[: self.k]:
+            doc = documents.get(news_id)
+            if doc is None:
+                doc = Document(
+                    page_content=self.bm25.text(news_id),
+                    metadata={"news_id": news_id, "published_at": self.bm25.published_epoch(news_id)},
+                )
+            results.append(Document(page_content=doc.page_content, metadata={**doc.metadata, "rrf_score": score}))
+        return results
+
+
+def news_retriever(category_ids: list[int], since: datetime = None, until: datetime = None, k: int = None):
+    """
+    사용자가 구독한 카테고리의 기간 내 기사만 검색하는 리트리버.
+    RETRIEVER_MODE가 hybrid이면 BM25와 벡터 검색 결과를 RRF로 합치고, vector이면 벡터 검색만 사용합니다.
+    """
+    k = k or settings.RETRIEVER_K
+    if settings.RETRIEVER_MODE == "hybrid":
+        return HybridRetriever(
+            vectorstore=get_news_vectorstore(),
+            bm25=get_bm25_index(),
+            category_ids=list(category_ids),
+            since=since,
+            until=until,
+            k=k,
+            fetch_k=settings.RETRIEVER_FETCH_K,
+        )
+    return get_news_vectorstore().as_retriever(
+        search_kwargs={"k": k, "filter": vector_filter(category_ids, since, until)}
+    )
@@ -1,6 +1,10 @@
+from datetime import datetime
+
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from app.services.news_service import update_news_from_api_by_scheduler
 from app.services.trend_service import update_trend_from_api_by_scheduler
+from app.services.bm25_index import refresh_bm25_index
+from app.config import settings
 
 def schedule_tasks():
     scheduler = AsyncIOScheduler()
@@ -12,12 +16,21 @@ def schedule_tasks():
         minutes=60 * 2,
     )
 
-    # 트렌드 업데이트 작업 추가
+    # 트렌드 업데이트 작업 추가 (카운터 구간 크기마다 한 번 저장)
     scheduler.add_job(
         update_trend_from_api_by_scheduler,
         "interval",
-        minutes=30,
+        minutes=settings.TREND_BUCKET_MINUTES,
     )
 
+    # BM25 색인 준비 및 증분 갱신 (프로세스별 색인이므로 각 API 프로세스에서 실행, 시작 직후 한 번 실행)
+    if settings.RETRIEVER_MODE == "hybrid":
+        scheduler.add_job(
+            refresh_bm25_index,
+            "interval",
+            seconds=settings.BM25_REFRESH_SECONDS,
+            next_run_time=datetime.now(),
+        )
+
     # 스케줄러 시작
     scheduler.start()
@@ -0,0 +1,119 @@
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from typing import Awaitable, Callable
+
+import redis
+
+from app.config import settings
+from app.services.redis_client import redis_client
+
+POLL_INTERVAL = 0.05
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 요청들이 한 번의 계산 결과를 함께 받도록 합니다.
+
+    - 프로세스 안: 진행 중인 계산 태스크를 키별로 보관하고, 모든 요청(처음 온 요청 포함)이 shield로 그 결과를 기다립니다.
+    - 여러 워커(SINGLE_FLIGHT_REDIS): Redis 락(`sf:{namespace}:{key}:lock`)을 잡은 워커만 계산하고,
+      결과를 `sf:{namespace}:{key}:result`에 잠시 저장합니다. 다른 워커는 결과가 생길 때까지 기다리며,
+      락이 결과 없이 사라지면(계산 실패) 직접 계산합니다. 이 경우 결과는 JSON으로 직렬화할 수 있어야 합니다.
+    Redis 오류 시에는 프로세스 안에서만 합칩니다.
+    """
+
+    def __init__(self, namespace: str, client: redis.Redis = None, use_redis: bool = None):
+        self.namespace = namespace
+        self.redis = client or redis_client
+        self.use_redis = settings.SINGLE_FLIGHT_REDIS if use_redis is None else use_redis
+        self._calls: dict[str, asyncio.Task] = {}
+        self.executed = 0
+        self.shared = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable]):
+        """
+        Args:
+            key (str): 같은 계산을 식별하는 키 (예: 사용자 ID + 질문).
+            fn (callable): 결과를 계산하는 코루틴 함수.
+
+        Returns:
+            fn()의 결과. 같은 키로 진행 중인 계산이 있으면 그 결과를 함께 받습니다.
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            self.shared += 1
+        else:
+            # 계산은 요청과 분리된 태스크에서 돌립니다. 먼저 온 요청이 취소되어도(클라이언트 연결 끊김 등)
+            # 계산은 계속되고, 기다리던 요청들은 결과를 그대로 받습니다.
+            task = asyncio.create_task(self._run_with_redis(key, fn) if self.use_redis else self._run(fn))
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # 기다리는 요청이 없어도 경고가 남지 않도록 조회 처리
+
+    async def _run(self, fn):
+        self.executed += 1
+        return await fn()
+
+    def _keys(self, key: str) -> tuple[str, str]:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        prefix = f"sf:{self.namespace}:{digest}"
+        return f"{prefix}:lock", f"{prefix}:result"
+
+    def _release(self, lock_key: str, token: str):
+        if self.redis.get(lock_key) == token.encode():
+            self.redis.delete(lock_key)
+
+    def _poll(self, lock_key: str, result_key: str):
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.get(result_key)
+        pipe.exists(lock_key)
+        return pipe.execute()
+
+    async def _run_with_redis(self, key: str, fn):
+        # Redis 클라이언트는 동기식이므로 명령은 스레드에서 실행해 이벤트 루프를 막지 않습니다.
+        lock_key, result_key = self._keys(key)
+        token = uuid.uuid4().hex
+        try:
+            acquired = await asyncio.to_thread(
+                self.redis.set, lock_key, token, nx=True, ex=settings.SINGLE_FLIGHT_LOCK_TTL
+            )
+        except redis.RedisError as e:
+            print(f"Error acquiring single-flight lock: {e}")
+            return await self._run(fn)
+
+        if acquired:
+            try:
+                result = await self._run(fn)
+                await asyncio.to_thread(
+                    self.redis.set, result_key, json.dumps(result, ensure_ascii=False), ex=settings.SINGLE_FLIGHT_RESULT_TTL
+                )
+                return result
+            finally:
+                try:
+                    await asyncio.to_thread(self._release, lock_key, token)
+                except redis.RedisError as e:
+                    print(f"Error releasing single-flight lock: {e}")
+
+        # 다른 워커가 계산 중: 결과가 저장되거나 락이 사라질 때까지 기다립니다.
+        deadline = time.monotonic() + settings.SINGLE_FLIGHT_WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(POLL_INTERVAL)
+            try:
+                cached, locked = await asyncio.to_thread(self._poll, lock_key, result_key)
+            except redis.RedisError as e:
+                print(f"Error polling single-flight result: {e}")
+                break
+            if cached is not None:
+                self.shared += 1
+                return json.loads(cached)
+            if not locked:
+                break
+        return await self._run(fn)
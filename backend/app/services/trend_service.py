@@ -1,69 +1,400 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+import math
+from sqlalchemy import Numeric, String, cast, delete, func, literal, literal_column, true, tuple_
+from sqlalchemy.dialects.postgresql import array, insert
 from collections import Counter
 from datetime import datetime, timedelta
+from app.config import settings
 from app.models.news import News
 from app.models.trend import Trend
+from app.models.trend_bucket import TrendBucket
+from app.models.trend_rollup import TrendRollup
+from app.models.trend_watermark import TrendWatermark
 from app.models.category import Category
+from app.models.user_category import UserCategory
 from app.database import async_session
-from konlpy.tag import Okt  # 형태소 분석기
+from app.services.keyword_matcher import KeywordAutomaton, get_keyword_matcher
+from app.services.cache_versions import bump_trends_version
+
+WATERMARK_NAME = "trend_buckets"
+KEYWORD_MARK_PREFIX = "keyword:"
+EPOCH = datetime(1970, 1, 1)
+ROLLUP_RESOLUTIONS = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+
+
+def bucket_start(value: datetime) -> datetime:
+    """
+    게시 시간이 속한 TREND_BUCKET_MINUTES 구간의 시작 시각.
+    """
+    size = timedelta(minutes=settings.TREND_BUCKET_MINUTES)
+    return EPOCH + (value - EPOCH) // size * size
+
+
+async def _lock_watermark(db: AsyncSession) -> TrendWatermark:
+    # 동시에 실행된 엔진이 같은 기사를 두 번 세지 않도록 워터마크 행을 잠급니다.
+    await db.execute(insert(TrendWatermark).values(name=WATERMARK_NAME, last_news_id=0).on_conflict_do_nothing())
+    result = await db.execute(select(TrendWatermark).filter_by(name=WATERMARK_NAME).with_for_update())
+    return result.scalar_one()
+
+
+async def _add_counts(db: AsyncSession, automaton: KeywordAutomaton, rows, retention_start: datetime):
+    # 보관 기간 안에 게시된 기사의 키워드 수를 구간별로 합쳐 trend_buckets에 더합니다.
+    increments = Counter()
+    for row in rows:
+        if row.published_at and row.published_at >= retention_start:
+            bucket = bucket_start(row.published_at)
+            for category_id, count in automaton.count(f"{row.title} {row.description}").items():
+                increments[(category_id, bucket)] += count
+    if increments:
+        stmt = insert(TrendBucket).values([
+            {"category_id": category_id, "bucket_start": bucket, "count": count}
+            for (category_id, bucket), count in increments.items()
+        ])
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=["category_id", "bucket_start"],
+            set_={"count": TrendBucket.count + stmt.excluded.count},
+        ))
+
+
+async def _count_news(db: AsyncSession, automaton: KeywordAutomaton, after_id: int, retention_start: datetime,
+                      batch_size: int, up_to_id: int = None) -> tuple[int, int]:
+    """
+    after_id < news.id (<= up_to_id) 기사를 id 순서로 batch_size개씩 읽어 오토마톤으로 세고 trend_buckets에 더합니다.
+
+    Returns:
+        tuple: (읽은 기사 수, 마지막으로 읽은 기사 ID).
+    """
+    last_news_id = after_id
+    processed = 0
+    while True:
+        query = select(News.id, News.published_at, News.title, News.description).filter(News.id > last_news_id)
+        if up_to_id is not None:
+            query = query.filter(News.id <= up_to_id)
+        rows = (await db.execute(query.order_by(News.id).limit(batch_size))).all()
+
+        await _add_counts(db, automaton, rows, retention_start)
+        if rows:
+            last_news_id = rows[-1].id
+        processed += len(rows)
+        if len(rows) < batch_size:
+            return processed, last_news_id
+
+
+async def _count_retained_news(db: AsyncSession, automaton: KeywordAutomaton, retention_start: datetime,
+                               batch_size: int, up_to_id: int) -> int:
+    """
+    보관 기간 안에 게시된 기사(news.id <= up_to_id)만 (published_at, id) 순서로 batch_size개씩 읽어 셉니다.
+    새 키워드 백필용이며, 기간 조건을 SQL에 넣어 ix_news_published_at_id로 보관 기간만 읽습니다.
+
+    Returns:
+        int: 읽은 기사 수.
+    """
+    position = None
+    processed = 0
+    while True:
+        query = select(News.id, News.published_at, News.title, News.description).filter(
+            News.published_at >= retention_start, News.id <= up_to_id
+        )
+        if position is not None:
+            query = query.filter(tuple_(News.published_at, News.id) > position)
+        rows = (await db.execute(query.order_by(News.published_at, News.id).limit(batch_size))).all()
+
+        await _add_counts(db, automaton, rows, retention_start)
+        if rows:
+            position = tuple_(rows[-1].published_at, rows[-1].id)
+        processed += len(rows)
+        if len(rows) < batch_size:
+            return processed
+
+
+async def _backfill_new_keywords(db: AsyncSession, automaton: KeywordAutomaton, up_to_id: int,
+                                 retention_start: datetime, batch_size: int, now: datetime) -> list[int]:
+    """
+    오토마톤에 새로 들어온 키워드(새로 구독된 카테고리, 이름이 바뀐 카테고리)는 워터마크 이전 기사를 센 적이 없으므로,
+    해당 카테고리의 구간을 비우고 보관 기간 안에 게시된 기사만 한 번 훑어 다시 셉니다(_count_retained_news).
+    어떤 (카테고리, 키워드)까지 셌는지는 `keyword:{카테고리 ID}:{키워드}` 이름의 워터마크 행으로 기록합니다.
+
+    Returns:
+        list: 다시 센 카테고리 ID 목록.
+    """
+    marks = {
+        category_id: f"{KEYWORD_MARK_PREFIX}{category_id}:{keyword}"
+        for keyword, category_ids in zip(automaton.keywords, automaton.targets)
+        for category_id in category_ids
+    }
+    existing = set((await db.execute(
+        select(TrendWatermark.name).filter(TrendWatermark.name.startswith(KEYWORD_MARK_PREFIX))
+    )).scalars().all())
+    stale = existing - set(marks.values())
+    new_ids = sorted(category_id for category_id, mark in marks.items() if mark not in existing)
+
+    # 구독이 끊겼거나 키워드가 바뀐 카테고리의 기존 구간은 더 이상 맞지 않으므로 지웁니다.
+    reset_ids = {int(name.split(":")[1]) for name in stale} | set(new_ids)
+    if stale:
+        await db.execute(delete(TrendWatermark).filter(TrendWatermark.name.in_(stale)))
+    if reset_ids:
+        await db.execute(delete(TrendBucket).filter(TrendBucket.category_id.in_(reset_ids)))
+    if not new_ids:
+        return []
+
+    new_keywords = {
+        keyword: [category_id for category_id in category_ids if category_id in new_ids]
+        for keyword, category_ids in zip(automaton.keywords, automaton.targets)
+    }
+    await _count_retained_news(
+        db, KeywordAutomaton({keyword: ids for keyword, ids in new_keywords.items() if ids}),
+        retention_start, batch_size, up_to_id,
+    )
+    await db.execute(insert(TrendWatermark).values([
+        {"name": marks[category_id], "last_news_id": up_to_id, "updated_at": now} for category_id in new_ids
+    ]))
+    return new_ids
+
+
+async def _settled_news_id(db: AsyncSession, after_id: int):
+    """
+    워터마크를 옮겨도 되는 마지막 기사 ID.
+    ID는 INSERT 시점에 정해지므로, 두 크롤링 트랜잭션이 ID 순서와 다르게 커밋되면 큰 ID가 먼저 보이고
+    작은 ID는 나중에 보입니다. INSERT된 지 TREND_WATERMARK_LAG_SECONDS가 지나지 않은 첫 기사 바로 앞에서 멈추면,
+    그보다 작은 ID를 가진 트랜잭션은 그 사이에 커밋을 마쳤으므로 건너뛰는 기사가 없습니다.
+
+    Returns:
+        int | None: 마지막 ID. 아직 안정되지 않은 기사가 없으면 None (끝까지 읽음).
+    """
+    lag = timedelta(seconds=settings.TREND_WATERMARK_LAG_SECONDS)
+    first_recent = await db.scalar(
+        select(func.min(News.id)).filter(News.id > after_id, News.inserted_at > func.localtimestamp() - lag)
+    )
+    return None if first_recent is None else first_recent - 1
+
+
+async def advance_trend_counters(db: AsyncSession, batch_size: int = None, now: datetime = None) -> int:
+    """
+    워터마크 이후에 저장된 기사만 읽어 카테고리별 구간 카운터(trend_buckets)에 더합니다.
+    기사 제목과 설명을 모든 구독 카테고리 이름으로 만든 오토마톤으로 한 번씩 훑어 세므로,
+    실행 비용은 새 기사의 텍스트 길이에 비례하고 카테고리 수와는 무관합니다.
+    오토마톤에 새로 들어온 키워드는 먼저 보관 기간 안의 기존 기사로 채웁니다(_backfill_new_keywords).
+    방금 INSERT된 기사는 늦게 커밋되는 작은 ID를 놓치지 않도록 다음 실행으로 미룹니다(_settled_news_id).
+    카운터 갱신과 워터마크 이동은 한 트랜잭션으로 커밋됩니다.
+
+    Returns:
+        int: 이번 실행에서 반영한 기사 수.
+    """
+    batch_size = batch_size or settings.TREND_BATCH_SIZE
+    now = now or datetime.utcnow()
+    retention_start = bucket_start(now - timedelta(days=settings.TREND_RETENTION_DAYS))
+
+    watermark = await _lock_watermark(db)
+    automaton = await get_keyword_matcher().get(db)
+
+    backfilled = await _backfill_new_keywords(
+        db, automaton, watermark.last_news_id, retention_start, batch_size, now
+    )
+    if backfilled:
+        print(f"Trend counters backfilled for new keywords of categories {backfilled}")
+
+    up_to_id = await _settled_news_id(db, watermark.last_news_id)
+    processed, last_news_id = await _count_news(
+        db, automaton, watermark.last_news_id, retention_start, batch_size, up_to_id=up_to_id
+    )
+
+    # 보관 기간이 지난 구간 정리 (링 버퍼처럼 최근 TREND_RETENTION_DAYS만 유지)
+    await db.execute(delete(TrendBucket).filter(TrendBucket.bucket_start < retention_start))
+    watermark.last_news_id = last_news_id
+    watermark.updated_at = now
+    await db.commit()
+    return processed
+
+
+async def refresh_trend_rollups(db: AsyncSession, since: datetime = None, user_id: int = None):
+    """
+    since가 속한 시간/일 구간부터 현재까지의 롤업을 다시 계산합니다 (같은 구간을 여러 번 갱신해도 결과가 같음).
+    시간 롤업은 trends에서, 일 롤업은 시간 롤업에서 만듭니다.
+    """
+    since = since or datetime.utcnow()
+    hour = func.date_trunc(literal_column("'hour'"), Trend.time).label("bucket_start")
+    day = func.date_trunc(literal_column("'day'"), TrendRollup.bucket_start).label("bucket_start")
+    sources = {
+        "hour": (
+            select(
+                Trend.user_id, Trend.category, literal("hour"), hour,
+                func.sum(Trend.count), func.count(), func.max(Trend.count),
+            )
+            .filter(Trend.time >= func.date_trunc("hour", since), Trend.user_id.is_not(None))
+            .group_by(Trend.user_id, Trend.category, hour)
+        ),
+        "day": (
+            select(
+                TrendRollup.user_id, TrendRollup.category, literal("day"), day,
+                func.sum(TrendRollup.count_sum), func.sum(TrendRollup.samples), func.max(TrendRollup.count_max),
+            )
+            .filter(TrendRollup.resolution == "hour", TrendRollup.bucket_start >= func.date_trunc("day", since))
+            .group_by(TrendRollup.user_id, TrendRollup.category, day)
+        ),
+    }
+    for resolution, source in sources.items():
+        if user_id is not None:
+            model = Trend if resolution == "hour" else TrendRollup
+            source = source.filter(model.user_id == user_id)
+        stmt = insert(TrendRollup).from_select(
+            ["user_id", "category", "resolution", "bucket_start", "count_sum", "samples", "count_max"], source
+        )
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=["user_id", "category", "resolution", "bucket_start"],
+            set_={
+                "count_sum": stmt.excluded.count_sum,
+                "samples": stmt.excluded.samples,
+                "count_max": stmt.excluded.count_max,
+            },
+        ))
+    await db.commit()
+
+
+def _window_totals(since: datetime):
+    return (
+        select(TrendBucket.category_id, func.sum(TrendBucket.count).label("count"))
+        .filter(TrendBucket.bucket_start >= bucket_start(since))
+        .group_by(TrendBucket.category_id)
+        .subquery()
+    )
 
 
 async def update_trends(db: AsyncSession, keywords: list[str], user_id: int, hours: int = 24):
+    """
+    새 기사를 카운터에 반영한 뒤, 최근 hours시간 동안 키워드(구독 중인 카테고리 이름)별 등장 횟수를 사용자의 트렌드로 저장합니다.
+    """
     now = datetime.utcnow()
-    start_time = now - timedelta(hours=hours)
 
     try:
         print(f"Updating trends for user_id={user_id}...")
+        await advance_trend_counters(db, now=now)
 
-        # 최근 뉴스 데이터 조회
+        totals = _window_totals(now - timedelta(hours=hours))
         result = await db.execute(
-            select(News).filter(News.user_id == user_id, News.published_at >= start_time)
+            select(Category.name, totals.c.count)
+            .join(totals, totals.c.category_id == Category.id)
+            .filter(Category.name.in_(keywords))
         )
-        recent_news = result.scalars().all()
-
-        if not recent_news:
-            print("No recent news found for user.")
-            return
-
-        # 모든 뉴스의 제목과 설명 합치기
-        all_text = " ".join(news.title + " " + news.description for news in recent_news)
-        print(f"Aggregated text for user_id={user_id}: {all_text}")
-
-        # 형태소 분석 및 명사 추출
-        okt = Okt()
-        extracted_words = okt.nouns(all_text)
+        keyword_counts = dict(result.all())
 
         # 키워드 매칭
-        keyword_counts = Counter(extracted_words)
         for category in keywords:
-            count = keyword_counts.get(category, 0)
-            new_trend = Trend(category=category, count=count, time=now, user_id=user_id)
+            new_trend = Trend(category=category, count=keyword_counts.get(category, 0), time=now, user_id=user_id)
             db.add(new_trend)
 
         await db.commit()
+        await refresh_trend_rollups(db, now, user_id=user_id)
+        bump_trends_version(user_id)
         print(f"Trends updated successfully for user_id={user_id}.")
 
     except Exception as e:
         print(f"Error in update_trends for user_id={user_id}: {e}")
 
 
+async def snapshot_trends(db: AsyncSession, hours: int = 24, now: datetime = None) -> int:
+    """
+    모든 구독(사용자, 카테고리)에 대해 최근 hours시간 트렌드를 한 번의 INSERT ... SELECT로 저장합니다.
+    """
+    now = now or datetime.utcnow()
+    totals = _window_totals(now - timedelta(hours=hours))
+    subscriptions = (
+        select(Category.name, func.coalesce(totals.c.count, 0), literal(now), UserCategory.user_id)
+        .select_from(UserCategory)
+        .join(Category, Category.id == UserCategory.category_id)
+        .outerjoin(totals, totals.c.category_id == Category.id)
+        .distinct()
+    )
+    result = await db.execute(
+        insert(Trend).from_select(["category", "count", "time", "user_id"], subscriptions)
+    )
+    await db.commit()
+    return result.rowcount
+
+
 async def update_trend_from_api_by_scheduler():
     async with async_session() as db:
         try:
-            # 모든 카테고리를 가져오기
-            result = await db.execute(select(Category))
-            categories_from_db = result.scalars().all()
-
-            if not categories_from_db:
-                print("No categories found.")
-                return
-
-            # 사용자별로 트렌드를 업데이트
-            for category in categories_from_db:
-                user_id = category.user_id  # 각 카테고리에 연결된 사용자 ID
-                category_names = [cat.name for cat in categories_from_db if cat.user_id == user_id]
-                await update_trends(db, category_names, user_id=user_id)
+            processed = await advance_trend_counters(db)
+            saved = await snapshot_trends(db)
+            await refresh_trend_rollups(db)
+            bump_trends_version()
+            print(f"Trend counters advanced by {processed} news, {saved} trends saved.")
 
         except Exception as e:
             print(f"Error in update_trend_from_api_by_scheduler: {e}")
+
+
+def series_step(start: datetime, end: datetime, points: int) -> tuple[timedelta, str]:
+    """
+    기간을 points개 구간으로 나눌 때의 구간 크기와 읽을 원본(raw, hour, day).
+    트렌드는 TREND_BUCKET_MINUTES마다 저장되므로 구간은 그보다 작아지지 않습니다 (작으면 대부분 빈 구간).
+    구간이 1시간/1일 이상이면 해당 롤업의 배수로 올림해 롤업을 읽습니다.
+    """
+    minutes = math.ceil((end - start).total_seconds() / 60 / points)
+    step = timedelta(minutes=max(settings.TREND_BUCKET_MINUTES, minutes))
+    for resolution in ("day", "hour"):
+        size = ROLLUP_RESOLUTIONS[resolution]
+        if step >= size:
+            return math.ceil(step / size) * size, resolution
+    return step, "raw"
+
+
+async def trend_series(db: AsyncSession, user_id: int, start: datetime, end: datetime, points: int,
+                       categories: list[str] = None) -> tuple[timedelta, dict]:
+    """
+    [start, end) 기간의 사용자 트렌드를 카테고리별 points개 이하의 구간 평균으로 반환합니다.
+    구간 나누기와 빈 구간 채우기(generate_series)는 DB에서 처리하므로, 응답 크기는 원본 행 수와 무관합니다.
+
+    Returns:
+        tuple: (구간 크기, {카테고리: [{"time", "count"}, ...]}). 샘플이 없는 구간의 count는 None입니다.
+    """
+    step, source = series_step(start, end, points)
+    if source == "raw":
+        origin = start
+        bucket = func.date_bin(step, Trend.time, origin).label("bucket")
+        samples = (
+            select(Trend.category, bucket, func.sum(Trend.count).label("total"), func.count().label("samples"))
+            .filter(Trend.user_id == user_id, Trend.time >= start, Trend.time < end)
+            .group_by(Trend.category, bucket)
+        )
+        if categories:
+            samples = samples.filter(Trend.category.in_(categories))
+    else:
+        # 롤업 구간 경계에 맞춰 시작 시각을 내림
+        origin = func.date_trunc(literal_column(f"'{source}'"), start)
+        bucket = func.date_bin(step, TrendRollup.bucket_start, origin).label("bucket")
+        samples = (
+            select(
+                TrendRollup.category, bucket,
+                func.sum(TrendRollup.count_sum).label("total"), func.sum(TrendRollup.samples).label("samples"),
+            )
+            .filter(
+                TrendRollup.user_id == user_id,
+                TrendRollup.resolution == source,
+                TrendRollup.bucket_start >= origin,
+                TrendRollup.bucket_start < end,
+            )
+            .group_by(TrendRollup.category, bucket)
+        )
+        if categories:
+            samples = samples.filter(TrendRollup.category.in_(categories))
+    samples = samples.subquery()
+
+    # 끝 시각 직전까지 시작하는 모든 구간 (구간 크기를 올림해 기간보다 커져도 최소 한 구간)
+    series_table = func.generate_series(origin, end - timedelta(microseconds=1), step).table_valued("time").render_derived()
+    series = series_table.c.time
+    category_names = select(samples.c.category).distinct().subquery()
+    if categories:
+        category_names = select(func.unnest(array(list(categories), type_=String)).label("category")).subquery()
+
+    result = await db.execute(
+        select(category_names.c.category, series, func.round(cast(samples.c.total, Numeric) / samples.c.samples))
+        .select_from(category_names.join(series_table, true()))
+        .outerjoin(samples, (samples.c.category == category_names.c.category) & (samples.c.bucket == series))
+        .order_by(category_names.c.category, series)
+    )
+    data = {}
+    for category, time, count in result.all():
+        data.setdefault(category, []).append({"time": time, "count": None if count is None else int(count)})
+    return step, data
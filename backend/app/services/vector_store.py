@@ -0,0 +1,235 @@
+import threading
+from datetime import datetime, timezone
+
+from langchain.schema import Document
+from langchain_chroma import Chroma
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.news import News
+from app.models.news_category import NewsCategory
+from app.services.chroma_service import get_chroma_client
+from app.services.embedding_cache import CachedEmbeddings
+from app.services.llm_backends import get_embedding_backend
+from app.services.pgvector_store import PgVectorStore, check_dimensions
+
+text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+
+_vectorstore = None
+_vectorstore_lock = threading.Lock()
+_embeddings = None
+
+
+def get_embeddings():
+    """
+    채팅/RAG 코드가 사용하는 임베딩 함수 (EMBEDDING_BACKEND).
+    EMBEDDING_CACHE_ENABLED이면 Redis 캐시로 감쌉니다. 로컬 hashing 임베딩은 캐시 조회보다 빠르므로 감싸지 않습니다.
+    """
+    global _embeddings
+    if _embeddings is None:
+        embeddings = get_embedding_backend()
+        if settings.EMBEDDING_CACHE_ENABLED and settings.EMBEDDING_BACKEND != "hashing":
+            embeddings = CachedEmbeddings(embeddings, model_name=embeddings.model)
+        _embeddings = embeddings
+    return _embeddings
+
+
+def embedding_cache_stats() -> dict:
+    embeddings = get_embeddings()
+    if not isinstance(embeddings, CachedEmbeddings):
+        return {"enabled": False}
+    return {"enabled": True, **embeddings.stats()}
+
+
+def _chroma_vectorstore():
+    return Chroma(
+        collection_name=f"{settings.CHROMA_COLLECTION}_{settings.EMBEDDING_BACKEND}",
+        embedding_function=get_embeddings(),
+        client=get_chroma_client(),
+    )
+
+
+def _pgvector_vectorstore():
+    return PgVectorStore(embedding=get_embeddings())
+
+
+def check_vector_store():
+    """
+    시작 시 벡터 스토어 설정을 검증합니다. pgvector는 임베딩 모델, PGVECTOR_DIMENSIONS,
+    테이블 컬럼의 차원이 모두 같아야 하며 다르면 첫 검색/색인까지 기다리지 않고 바로 실패합니다.
+    """
+    if settings.VECTOR_STORE_BACKEND == "pgvector":
+        check_dimensions(get_embeddings())
+
+
+VECTOR_STORE_BACKENDS = {
+    "chroma": _chroma_vectorstore,
+    "pgvector": _pgvector_vectorstore,
+}
+
+
+def get_news_vectorstore():
+    """
+    모든 기사를 담는 영구 벡터 스토어를 반환합니다 (VECTOR_STORE_BACKEND). 프로세스마다 한 번만 연결합니다.
+    기사는 한 번만 임베딩됩니다. Chroma는 소속 카테고리를 메타데이터 플래그(category_{id})로 표시하고,
+    pgvector는 news_categories를 조인해 같은 조건을 SQL로 적용합니다.
+    임베딩 백엔드마다 벡터 공간이 다르므로 Chroma 컬렉션은 백엔드별로 나뉘고, pgvector 테이블은
+    현재 EMBEDDING_BACKEND 하나만 담습니다 (check_vector_store로 차원을 확인).
+    """
+    global _vectorstore
+    if _vectorstore is None:
+        with _vectorstore_lock:
+            if _vectorstore is None:
+                backend = VECTOR_STORE_BACKENDS.get(settings.VECTOR_STORE_BACKEND)
+                if backend is None:
+                    print(f"Unknown vector store backend '{settings.VECTOR_STORE_BACKEND}', falling back to chroma")
+                    backend = _chroma_vectorstore
+                _vectorstore = backend()
+    return _vectorstore
+
+
+def category_flag(category_id: int) -> str:
+    return f"category_{category_id}"
+
+
+def category_filter(category_ids: list[int]) -> dict:
+    """
+    카테고리 중 하나라도 연결된 청크만 고르는 Chroma where 조건.
+    """
+    conditions = [{category_flag(category_id): True} for category_id in sorted(set(category_ids))]
+    if not conditions:
+        raise ValueError("category_ids must not be empty")
+    return conditions[0] if len(conditions) == 1 else {"$or": conditions}
+
+
+def vector_filter(category_ids: list[int], since: datetime = None, until: datetime = None) -> dict:
+    """
+    카테고리와 게시 시간 범위를 Chroma where 조건으로 만듭니다 (검색 시점에 색인에서 바로 거릅니다).
+    """
+    conditions = [category_filter(category_ids)]
+    if since:
+        conditions.append({"published_at": {"$gte": to_epoch(since)}})
+    if until:
+        conditions.append({"published_at": {"$lte": to_epoch(until)}})
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+def to_epoch(value: datetime) -> int:
+    return int(value.replace(tzinfo=timezone.utc).timestamp()) if value else 0
+
+
+def news_text(title: str, description: str) -> str:
+    return f"Title: {title}\n\nDescription: {description}"
+
+
+def chunk_documents(article: dict, metadata: dict) -> tuple[list[str], list[Document]]:
+    """
+    기사를 청크로 나눠 청크 ID("{news_id}:{청크 번호}")와 문서 목록을 반환합니다.
+    """
+    chunks = text_splitter.split_text(news_text(article["title"], article["description"]))
+    return (
+        [f"{article['id']}:{index}" for index in range(len(chunks))],
+        [Document(page_content=chunk, metadata=metadata) for chunk in chunks],
+    )
+
+
+def index_articles(vectorstore, articles: list[dict]) -> dict:
+    """
+    기사들을 벡터 스토어에 반영합니다.
+    이미 색인된 기사는 카테고리 플래그만 갱신하고, 처음 보는 기사만 임베딩합니다.
+    pgvector는 카테고리를 news_categories에서 조인하므로 이미 색인된 기사는 건드리지 않습니다.
+
+    Args:
+        vectorstore (Chroma | PgVectorStore): 기사 벡터 스토어.
+        articles (list): {"id", "title", "description", "published_at", "category_ids"} 목록.
+
+    Returns:
+        dict: 새로 임베딩한 기사 수(embedded)와 메타데이터만 갱신한 기사 수(updated).
+    """
+    if not articles:
+        return {"embedded": 0, "updated": 0}
+
+    news_ids = [article["id"] for article in articles]
+    if isinstance(vectorstore, PgVectorStore):
+        existing = vectorstore.embedded_news_ids(news_ids)
+        new_ids, new_documents = [], []
+        for article in articles:
+            if article["id"] not in existing:
+                ids, documents = chunk_documents(article, {"news_id": article["id"]})
+                new_ids.extend(ids)
+                new_documents.extend(documents)
+        if new_documents:
+            vectorstore.add_documents(new_documents, ids=new_ids)
+        return {"embedded": len(articles) - len(existing), "updated": len(existing)}
+
+    collection = vectorstore._collection
+    existing = collection.get(where={"news_id": {"$in": news_ids}}, include=["metadatas"])
+
+    chunks_by_news = {}
+    for chunk_id, metadata in zip(existing["ids"], existing["metadatas"]):
+        chunks_by_news.setdefault(metadata["news_id"], []).append((chunk_id, metadata))
+
+    update_ids, update_metadatas = [], []
+    new_ids, new_documents = [], []
+    for article in articles:
+        flags = {category_flag(category_id): True for category_id in article["category_ids"]}
+
+        if article["id"] in chunks_by_news:
+            for chunk_id, metadata in chunks_by_news[article["id"]]:
+                update_ids.append(chunk_id)
+                if not metadata.get("published_at") and article.get("published_at"):
+                    # 게시 시간 없이(epoch 0) 색인된 기존 청크 보정 (reindex_news)
+                    metadata = {**metadata, "published_at": to_epoch(article["published_at"])}
+                update_metadatas.append({**metadata, **flags})
+            continue
+
+        metadata = {
+            "news_id": article["id"],
+            "published_at": to_epoch(article.get("published_at")),
+            **flags,
+        }
+        ids, documents = chunk_documents(article, metadata)
+        new_ids.extend(ids)
+        new_documents.extend(documents)
+
+    if update_ids:
+        collection.update(ids=update_ids, metadatas=update_metadatas)
+    if new_documents:
+        vectorstore.add_documents(new_documents, ids=new_ids)
+
+    return {"embedded": len(articles) - len(chunks_by_news), "updated": len(chunks_by_news)}
+
+
+def index_news(db: Session, news_ids: list[int]) -> dict:
+    """
+    DB에 저장된 기사들을 벡터 스토어에 반영합니다.
+    수집 파이프라인에서 새로 저장되었거나 카테고리에 새로 연결된 기사 ID로 호출됩니다.
+    """
+    news_ids = sorted(set(news_ids))
+    if not news_ids:
+        return {"embedded": 0, "updated": 0}
+
+    category_ids = {}
+    for news_id, category_id in db.execute(
+        select(NewsCategory.news_id, NewsCategory.category_id).filter(NewsCategory.news_id.in_(news_ids))
+    ):
+        category_ids.setdefault(news_id, []).append(category_id)
+
+    rows = db.execute(
+        select(News.id, News.title, News.description, News.published_at, News.inserted_at)
+        .filter(News.id.in_(news_ids))
+    ).all()
+    articles = [
+        {
+            "id": row.id,
+            "title": row.title,
+            "description": row.description,
+            # 게시 시간이 없는 기사는 수집 시각으로 기간 조건을 적용합니다 (epoch 0이면 기간 검색에서 항상 빠짐).
+            "published_at": row.published_at or row.inserted_at,
+            "category_ids": category_ids.get(row.id, []),
+        }
+        for row in rows
+    ]
+    return index_articles(get_news_vectorstore(), articles)
@@ -1,10 +1,19 @@
 import logging
+import time
+from celery import chain, group
+from celery.signals import worker_init
 from .celery_app import celery_app
 from app.services.news_crawler import crawl_news_from_naver
-from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.crawl_state import CrawlState
+from sqlalchemy import select
+from sqlalchemy.orm import Session
 from app.database import SessionLocal
+from app.services.news_ingest import bulk_insert_news, get_or_create_category_id
+from app.services.vector_store import check_vector_store, index_news
+from app.services.noun_counts import backfill_noun_counts, store_noun_counts
+from app.services.cache_versions import bump_category_versions, bump_news_version
 from app.models.news import News
-from sqlalchemy.dialects.postgresql import insert
+from app.config import settings
 from sqlalchemy.exc import IntegrityError
 import traceback  # traceback 모듈 추가
 
@@ -14,35 +23,47 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@worker_init.connect
+def verify_vector_store(**kwargs):
+    # 임베딩 차원이 pgvector 테이블과 다르면 작업을 받기 전에 워커를 멈춥니다.
+    check_vector_store()
+
+
 @celery_app.task
-def crawl_and_save_news(category_name: str, user_id: int):
-    logger.info(f"Starting Celery task for category '{category_name}', user_id={user_id}")
+def crawl_and_save_news(category_name: str, limit: int = 10):
+    """
+    카테고리 하나를 크롤링해 공유 기사 저장소에 저장합니다.
+    구독자 수와 관계없이 카테고리당 한 번만 실행됩니다.
+    """
+    logger.info(f"Starting Celery task for category '{category_name}'")
     fetched_news = []
+    crawl_state = CrawlState(category_name)
 
     try:
-        # Scrapy 크롤링 실행
-        fetched_news = crawl_news_from_naver(category_name, limit=10)
-        logger.info(f"Scrapy crawl completed. Articles fetched: {len(fetched_news)}")
+        # 증분 크롤링 실행 (이미 수집한 기사에 도달하면 중단)
+        fetched_news = crawl_news_from_naver(
+            category_name, limit=limit, known_filter=crawl_state.known_flags
+        )
+        logger.info(f"Crawl completed. Articles fetched: {len(fetched_news)}")
     except Exception as e:
-        logger.error(f"Scrapy crawl failed: {e}\n{traceback.format_exc()}")
+        logger.error(f"Crawl failed: {e}\n{traceback.format_exc()}")
         return {"status": "failure", "error": str(e)}
 
     # 데이터베이스 저장
-    db: AsyncSession = SessionLocal()
+    db: Session = SessionLocal()
     try:
-        for news in fetched_news:
-            stmt = insert(News).values(
-                title=news["title"],
-                description=news["description"],
-                url=news["url"],
-                published_at=news["published_at"],
-                source=news["source"],
-                category=category_name,
-                user_id=user_id,
-            ).on_conflict_do_nothing(index_elements=["url"])
-            db.execute(stmt)
+        category_id = get_or_create_category_id(db, category_name)
+        ingest = bulk_insert_news(db, fetched_news, category_id, category_name)
         db.commit()
-        logger.info(f"Successfully saved news for category '{category_name}' and user_id={user_id}")
+        crawl_state.mark_seen(fetched_news)
+        if ingest.inserted or ingest.linked:
+            bump_news_version()
+        logger.info(
+            f"Saved news for category '{category_name}': "
+            f"{ingest.inserted} inserted, {ingest.duplicates} duplicates, {ingest.invalid} without url, "
+            f"{ingest.linked} linked "
+            f"in {ingest.elapsed:.3f}s ({ingest.rows_per_second:.0f} rows/s)"
+        )
     except IntegrityError as e:
         db.rollback()
         logger.error(f"IntegrityError: {e}")
@@ -50,4 +71,150 @@ def crawl_and_save_news(category_name: str, user_id: int):
     finally:
         db.close()
 
-    return {"status": "success", "category": category_name, "count": len(fetched_news)}
\ No newline at end of file
+    # 임베딩은 다음 단계(embed_new_news)에서 배치로 처리합니다.
+    return {
+        "status": "success",
+        "category": category_name,
+        "category_id": category_id,
+        "count": len(fetched_news),
+        "inserted": ingest.inserted,
+        "duplicates": ingest.duplicates,
+        "linked": ingest.linked,
+        "news_ids": ingest.inserted_ids + ingest.linked_ids,
+    }
+
+
+@celery_app.task
+def embed_new_news(crawl_result: dict):
+    """
+    crawl_and_save_news 다음 단계. 새로 저장되었거나 카테고리에 새로 연결된 기사를
+    EMBED_BATCH_SIZE개씩 나눠 embed_news_batch 작업으로 보냅니다.
+    """
+    news_ids = crawl_result.get("news_ids") or []
+    if crawl_result.get("status") != "success" or not news_ids:
+        return {"status": "skipped", "category": crawl_result.get("category"), "batches": 0}
+
+    batch_size = settings.EMBED_BATCH_SIZE
+    batches = [news_ids[start:start + batch_size] for start in range(0, len(news_ids), batch_size)]
+    for batch in batches:
+        embed_news_batch.delay(batch, [crawl_result["category_id"]])
+
+    logger.info(
+        f"Queued embedding for category '{crawl_result['category']}': "
+        f"{len(news_ids)} news in {len(batches)} batches"
+    )
+    return {"status": "queued", "category": crawl_result["category"], "count": len(news_ids), "batches": len(batches)}
+
+
+def embed_batch(db: Session, news_ids: list[int]) -> dict:
+    """
+    기사 묶음을 벡터 스토어에 반영하고 처리량을 기록합니다.
+    새로 저장된 기사만 임베딩하고, 이미 색인된 기사는 카테고리 메타데이터만 갱신합니다.
+    """
+    started = time.perf_counter()
+    indexed = index_news(db, news_ids)
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Embedded batch of {len(news_ids)} news: {indexed['embedded']} embedded, {indexed['updated']} updated "
+        f"in {elapsed:.3f}s ({len(news_ids) / elapsed if elapsed else 0:.1f} news/s)"
+    )
+    return indexed
+
+
+@celery_app.task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_backoff_max=settings.EMBED_RETRY_BACKOFF_MAX,
+    retry_jitter=True,
+    max_retries=settings.EMBED_MAX_RETRIES,
+)
+def embed_news_batch(self, news_ids: list[int], category_ids: list[int]):
+    """
+    기사 한 묶음을 임베딩합니다. 임베딩 API나 DB 오류는 지수 백오프로 재시도하며,
+    색인된 기사는 다시 임베딩하지 않으므로 재시도해도 중복 비용이 생기지 않습니다.
+    """
+    db: Session = SessionLocal()
+    try:
+        indexed = embed_batch(db, news_ids)
+    finally:
+        db.close()
+
+    # 새 기사가 검색 가능해진 뒤 해당 카테고리의 답변 캐시를 무효화합니다.
+    bump_category_versions(category_ids)
+    return {"status": "success", "attempt": self.request.retries + 1, **indexed}
+
+
+@celery_app.task
+def extract_news_nouns(crawl_result: dict):
+    """
+    crawl_and_save_news 다음 단계. 새로 저장된 기사의 명사를 한 번만 추출해 news.noun_counts에 저장합니다.
+    이미 집계된 기사(다른 카테고리에서 먼저 수집된 기사)는 건너뜁니다.
+    """
+    news_ids = crawl_result.get("news_ids") or []
+    if crawl_result.get("status") != "success" or not news_ids:
+        return {"status": "skipped", "category": crawl_result.get("category"), "count": 0}
+
+    started = time.perf_counter()
+    db: Session = SessionLocal()
+    try:
+        counted = store_noun_counts(db, news_ids)
+    finally:
+        db.close()
+
+    logger.info(
+        f"Extracted nouns for category '{crawl_result['category']}': "
+        f"{counted} news in {time.perf_counter() - started:.3f}s"
+    )
+    return {"status": "success", "category": crawl_result["category"], "count": counted}
+
+
+@celery_app.task
+def backfill_news_nouns():
+    """
+    명사 집계가 없는 기존 기사를 모두 집계합니다.
+    """
+    db: Session = SessionLocal()
+    try:
+        counted = backfill_noun_counts(db)
+    finally:
+        db.close()
+    logger.info(f"Backfilled noun counts for {counted} news")
+    return {"status": "success", "count": counted}
+
+
+def enqueue_crawl(category_name: str, limit: int = 10):
+    """
+    카테고리 크롤링 → (임베딩, 명사 집계) 파이프라인을 큐에 넣습니다.
+    """
+    return chain(
+        crawl_and_save_news.s(category_name, limit),
+        group(embed_new_news.s(), extract_news_nouns.s()),
+    ).apply_async()
+
+
+@celery_app.task
+def reindex_news():
+    """
+    저장된 모든 기사를 벡터 스토어에 반영합니다. 이미 색인된 기사는 다시 임베딩하지 않습니다.
+    기존 데이터 백필이나 색인 실패 복구에 사용합니다.
+    """
+    db: Session = SessionLocal()
+    embedded = updated = 0
+    last_id = 0
+    try:
+        while True:
+            news_ids = db.execute(
+                select(News.id).filter(News.id > last_id).order_by(News.id).limit(settings.INGEST_BATCH_SIZE)
+            ).scalars().all()
+            if not news_ids:
+                break
+            indexed = embed_batch(db, news_ids)
+            embedded += indexed["embedded"]
+            updated += indexed["updated"]
+            last_id = news_ids[-1]
+            logger.info(f"Reindexed news up to id {last_id}: {embedded} embedded, {updated} updated")
+    finally:
+        db.close()
+
+    return {"status": "success", "embedded": embedded, "updated": updated}
@@ -0,0 +1,29 @@
+"""
+네이버 검색 결과 파서 백엔드별 처리 속도를 비교합니다.
+
+    cd backend && python -m benchmarks.bench_news_parser [반복 횟수]
+"""
+import sys
+import timeit
+from pathlib import Path
+
+from app.services.news_parser import PARSER_BACKENDS, get_result_page_parser
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+
+def main(number: int = 200):
+    pages = [path.read_text(encoding="utf-8") for path in sorted(FIXTURES.glob("naver_search_*.html"))]
+    print(f"{len(pages)} fixture pages, {number} rounds")
+
+    baseline = None
+    for name in PARSER_BACKENDS:
+        parser = get_result_page_parser(name)
+        seconds = timeit.timeit(lambda: [parser.parse(page, "경제") for page in pages], number=number)
+        per_page_ms = seconds / (number * len(pages)) * 1000
+        baseline = baseline or per_page_ms
+        print(f"{name:>12}: {per_page_ms:7.3f} ms/page  (x{baseline / per_page_ms:.1f} vs soup)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
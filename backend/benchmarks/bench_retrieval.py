@@ -0,0 +1,130 @@
+"""
+fixture 말뭉치로 BM25, 벡터, 하이브리드(RRF) 검색의 recall@k와 지연 시간을 비교합니다.
+검색 범위(카테고리, 게시 시간)를 색인 조회에 적용한 경우와 전체 검색 후 거르는 경우의 지연 시간도 비교합니다.
+기본값은 오프라인으로 동작하는 hashing 임베딩입니다.
+
+    cd backend && python -m benchmarks.bench_retrieval [말뭉치 크기] [임베딩 백엔드]
+"""
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import chromadb
+from chromadb.config import Settings
+from langchain_chroma import Chroma
+
+from app.services.bm25_index import BM25Index
+from app.services.llm_backends import get_embedding_backend
+from app.services.retrieval import HybridRetriever
+from app.services.vector_store import index_articles, news_text, vector_filter
+
+CORPUS = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "retrieval_corpus.json"
+SINCE = datetime(2024, 12, 1)
+K = 3
+
+
+def load_corpus(size: int):
+    """
+    fixture 기사에 더해, 기존 기사 단어를 섞은 방해 기사(범위 밖 카테고리/오래된 날짜)로 말뭉치를 size까지 채웁니다.
+    """
+    data = json.loads(CORPUS.read_text(encoding="utf-8"))
+    categories = {name: index for index, name in enumerate(sorted({a["category"] for a in data["articles"]}), start=1)}
+    articles = [
+        {
+            "id": article["id"],
+            "title": article["title"],
+            "description": article["description"],
+            "published_at": datetime.strptime(article["published_at"], "%Y-%m-%d %H:%M:%S"),
+            "category_ids": [categories[article["category"]]],
+        }
+        for article in data["articles"]
+    ]
+
+    rng = random.Random(42)
+    words = " ".join(a["title"] + " " + a["description"] for a in data["articles"]).split()
+    for news_id in range(len(articles) + 1, size + 1):
+        articles.append({
+            "id": news_id,
+            "title": " ".join(rng.sample(words, 6)),
+            "description": " ".join(rng.sample(words, 20)),
+            "published_at": SINCE - timedelta(days=rng.randint(1, 365)),
+            "category_ids": [rng.randint(1, len(categories) + 20)],
+        })
+
+    queries = [
+        {**query, "category_ids": [categories[name] for name in query["categories"]]}
+        for query in data["queries"]
+    ]
+    return articles, queries
+
+
+def timed(function, queries):
+    results, started = [], time.perf_counter()
+    for query in queries:
+        results.append(function(query))
+    return results, (time.perf_counter() - started) / len(queries) * 1000
+
+
+def recall(results, queries):
+    scores = [
+        len(set(found[:K]) & set(query["relevant"])) / min(K, len(query["relevant"]))
+        for found, query in zip(results, queries)
+    ]
+    return sum(scores) / len(scores)
+
+
+def main(size: int = 5000, backend: str = "hashing"):
+    articles, queries = load_corpus(size)
+
+    bm25 = BM25Index()
+    for article in articles:
+        bm25.add(article["id"], news_text(article["title"], article["description"]), article["published_at"], article["category_ids"])
+
+    started = time.perf_counter()
+    vectorstore = Chroma(
+        collection_name="bench_retrieval",
+        embedding_function=get_embedding_backend(backend),
+        client=chromadb.EphemeralClient(Settings(anonymized_telemetry=False)),
+    )
+    for start in range(0, len(articles), 1000):
+        index_articles(vectorstore, articles[start:start + 1000])
+    print(f"{len(articles)} articles, {len(queries)} queries, embedding={backend} "
+          f"(indexed in {time.perf_counter() - started:.1f}s)")
+
+    def bm25_pushdown(query):
+        return [news_id for news_id, _ in bm25.search(query["query"], K, query["category_ids"], SINCE)]
+
+    def bm25_post_filter(query):
+        allowed = {a["id"] for a in articles if set(a["category_ids"]) & set(query["category_ids"]) and a["published_at"] >= SINCE}
+        hits = bm25.search(query["query"], len(articles))
+        return [news_id for news_id, _ in hits if news_id in allowed][:K]
+
+    def vector(query):
+        docs = vectorstore.similarity_search(query["query"], k=K, filter=vector_filter(query["category_ids"], SINCE))
+        return [doc.metadata["news_id"] for doc in docs]
+
+    def hybrid(query):
+        retriever = HybridRetriever(
+            vectorstore=vectorstore, bm25=bm25, category_ids=query["category_ids"], since=SINCE, k=K, fetch_k=20
+        )
+        return [doc.metadata["news_id"] for doc in retriever.invoke(query["query"])]
+
+    print(f"{'retriever':>18}  recall@{K}  latency")
+    for name, function in [
+        ("bm25", bm25_pushdown),
+        ("bm25 post-filter", bm25_post_filter),
+        ("vector", vector),
+        ("hybrid (rrf)", hybrid),
+    ]:
+        results, latency = timed(function, queries)
+        print(f"{name:>18}  {recall(results, queries):8.3f}  {latency:7.2f} ms/query")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+        sys.argv[2] if len(sys.argv) > 2 else "hashing",
+    )
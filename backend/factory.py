@@ -1,12 +1,14 @@
 import psycopg2
 from langchain.schema import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
+from app.services.llm_backends import get_chat_model
 from langchain_chroma import Chroma
 from langchain_core.prompts import PromptTemplate
 from langchain_core.runnables import RunnablePassthrough
 from langchain_core.output_parsers import StrOutputParser
 from dotenv import load_dotenv
+from app.services.vector_store import get_embeddings
+from app.config import settings
 import os
 
 load_dotenv()
@@ -21,7 +23,7 @@ db_config = {
 }
 
 openai_api_key = os.getenv("OPENAI_API_KEY")
-if not openai_api_key:
+if "openai" in (settings.LLM_BACKEND, settings.EMBEDDING_BACKEND) and not openai_api_key:
     raise ValueError("OPENAI_API_KEY is not set in the environment variables.")
 print(openai_api_key)
 
@@ -59,7 +61,7 @@ def setup_vectorstore(documents):
     splits = text_splitter.split_documents(documents)
 
     # 벡터스토어 생성
-    vectorstore = Chroma.from_documents(documents=splits, embedding=OpenAIEmbeddings())
+    vectorstore = Chroma.from_documents(documents=splits, embedding=get_embeddings())
     return vectorstore
 
 def format_docs(docs):
@@ -92,7 +94,7 @@ def create_rag_chain(vectorstore):
     rag_chain = (
         {"context": retriever | format_docs, "question": RunnablePassthrough()}
         | prompt
-        | ChatOpenAI(model="gpt-4o", temperature=0, max_tokens=None)
+        | get_chat_model()
         | StrOutputParser()
     )
     return rag_chain
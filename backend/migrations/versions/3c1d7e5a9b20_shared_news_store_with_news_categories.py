@@ -0,0 +1,59 @@
+"""Shared news store: link news to categories instead of users
+
+Revision ID: 3c1d7e5a9b20
+Revises: bfef7338f99b
+Create Date: 2024-12-10 14:02:11.204318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1d7e5a9b20'
+down_revision: Union[str, None] = 'bfef7338f99b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'news_categories',
+        sa.Column('news_id', sa.Integer(), sa.ForeignKey('news.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('category_id', sa.Integer(), sa.ForeignKey('categories.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('linked_at', sa.DateTime(), nullable=False, server_default=sa.text("timezone('utc', now())")),
+    )
+
+    # 기존 기사들을 수집 당시 카테고리에 연결
+    op.execute(
+        """
+        INSERT INTO news_categories (news_id, category_id)
+        SELECT news.id, categories.id
+        FROM news JOIN categories ON categories.name = news.category
+        ON CONFLICT DO NOTHING
+        """
+    )
+
+    op.drop_column('news', 'user_id')
+
+
+def downgrade() -> None:
+    op.add_column('news', sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=True))
+
+    # 기사마다 해당 카테고리 구독자 중 한 명에게 다시 할당
+    op.execute(
+        """
+        UPDATE news SET user_id = owner.user_id
+        FROM (
+            SELECT news_categories.news_id, min(user_categories.user_id) AS user_id
+            FROM news_categories
+            JOIN user_categories ON user_categories.category_id = news_categories.category_id
+            GROUP BY news_categories.news_id
+        ) AS owner
+        WHERE owner.news_id = news.id
+        """
+    )
+
+    op.drop_table('news_categories')
@@ -0,0 +1,44 @@
+"""Add pgvector news_embeddings table with an HNSW index
+
+Revision ID: 5a7e1f3b9c62
+Revises: c52e9a0f4d18
+Create Date: 2024-12-16 10:42:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+from app.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a7e1f3b9c62'
+down_revision: Union[str, None] = 'c52e9a0f4d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    # 한 테이블에는 EMBEDDING_BACKEND 하나의 벡터만 저장합니다. 차원은 모델과 같은 PGVECTOR_DIMENSIONS를 사용합니다.
+    op.create_table(
+        'news_embeddings',
+        sa.Column('news_id', sa.Integer(), sa.ForeignKey('news.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('chunk_index', sa.Integer(), primary_key=True),
+        sa.Column('content', sa.String(), nullable=False),
+        sa.Column('embedding', Vector(settings.PGVECTOR_DIMENSIONS), nullable=False),
+    )
+    op.create_index(
+        'ix_news_embeddings_embedding_hnsw', 'news_embeddings', ['embedding'],
+        postgresql_using='hnsw',
+        postgresql_with={'m': 16, 'ef_construction': 64},
+        postgresql_ops={'embedding': 'vector_cosine_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_news_embeddings_embedding_hnsw', table_name='news_embeddings')
+    op.drop_table('news_embeddings')
@@ -0,0 +1,54 @@
+"""Add hourly and daily trend rollups
+
+Revision ID: 7b3e9d2c5f41
+Revises: e4c8a1d7b396
+Create Date: 2024-12-19 14:05:12.394821
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e9d2c5f41'
+down_revision: Union[str, None] = 'e4c8a1d7b396'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'trend_rollups',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('category', sa.String(), primary_key=True),
+        sa.Column('resolution', sa.String(), primary_key=True),
+        sa.Column('bucket_start', sa.DateTime(), primary_key=True),
+        sa.Column('count_sum', sa.BigInteger(), nullable=False),
+        sa.Column('samples', sa.Integer(), nullable=False),
+        sa.Column('count_max', sa.Integer(), nullable=False),
+    )
+    # 기존 트렌드 스냅샷으로 롤업 채우기
+    op.execute(
+        """
+        INSERT INTO trend_rollups (user_id, category, resolution, bucket_start, count_sum, samples, count_max)
+        SELECT user_id, category, 'hour', date_trunc('hour', time), sum(count), count(*), max(count)
+        FROM trends
+        WHERE user_id IS NOT NULL
+        GROUP BY user_id, category, date_trunc('hour', time)
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO trend_rollups (user_id, category, resolution, bucket_start, count_sum, samples, count_max)
+        SELECT user_id, category, 'day', date_trunc('day', bucket_start), sum(count_sum), sum(samples), max(count_max)
+        FROM trend_rollups
+        WHERE resolution = 'hour'
+        GROUP BY user_id, category, date_trunc('day', bucket_start)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('trend_rollups')
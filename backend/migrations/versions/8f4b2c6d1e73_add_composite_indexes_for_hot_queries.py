@@ -0,0 +1,38 @@
+"""Add composite indexes for hot query shapes
+
+Revision ID: 8f4b2c6d1e73
+Revises: 3c1d7e5a9b20
+Create Date: 2024-12-11 10:37:48.912044
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f4b2c6d1e73'
+down_revision: Union[str, None] = '3c1d7e5a9b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_news_published_at_id', 'news', ['published_at', 'id']),
+    ('ix_news_categories_category_id_news_id', 'news_categories', ['category_id', 'news_id']),
+    ('ix_user_categories_user_id_category_id', 'user_categories', ['user_id', 'category_id']),
+    ('ix_trends_user_id_category_time', 'trends', ['user_id', 'category', 'time']),
+    ('ix_chat_history_user_id_timestamp', 'chat_history', ['user_id', 'timestamp']),
+]
+
+
+def upgrade() -> None:
+    # 운영 중인 테이블이 잠기지 않도록 CONCURRENTLY로 생성
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
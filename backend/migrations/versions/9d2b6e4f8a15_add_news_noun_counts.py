@@ -0,0 +1,28 @@
+"""Add per-article noun counts to news
+
+Revision ID: 9d2b6e4f8a15
+Revises: 5a7e1f3b9c62
+Create Date: 2024-12-17 11:05:12.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d2b6e4f8a15'
+down_revision: Union[str, None] = '5a7e1f3b9c62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 기존 기사는 backfill_news_nouns 작업으로 채웁니다.
+    op.add_column('news', sa.Column('noun_counts', postgresql.JSONB(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('news', 'noun_counts')
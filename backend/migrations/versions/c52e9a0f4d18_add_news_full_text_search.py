@@ -0,0 +1,56 @@
+"""Add full-text and trigram search over news
+
+Revision ID: c52e9a0f4d18
+Revises: 8f4b2c6d1e73
+Create Date: 2024-12-12 16:21:05.337190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c52e9a0f4d18'
+down_revision: Union[str, None] = '8f4b2c6d1e73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NEWS_BIGRAMS_FUNCTION = """
+CREATE OR REPLACE FUNCTION news_hangul_bigrams(txt text) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT coalesce(string_agg(substr(word, i, 2), ' '), '')
+    FROM regexp_split_to_table(coalesce(txt, ''), '[^가-힣]+') AS word,
+         generate_series(1, char_length(word) - 1) AS i
+$$
+"""
+
+NEWS_SEARCH_VECTOR = (
+    "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, '')) || "
+    "to_tsvector('simple', news_hangul_bigrams(coalesce(title, '') || ' ' || coalesce(description, '')))"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(NEWS_BIGRAMS_FUNCTION)
+
+    # 기존 행도 포함해 저장 시 자동으로 계산되는 generated column
+    op.add_column(
+        'news',
+        sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(NEWS_SEARCH_VECTOR, persisted=True)),
+    )
+    op.create_index('ix_news_search_vector', 'news', ['search_vector'], postgresql_using='gin')
+    op.create_index(
+        'ix_news_title_trgm', 'news', ['title'],
+        postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_news_title_trgm', table_name='news')
+    op.drop_index('ix_news_search_vector', table_name='news')
+    op.drop_column('news', 'search_vector')
+    op.execute("DROP FUNCTION IF EXISTS news_hangul_bigrams(text)")
@@ -0,0 +1,30 @@
+"""Add news inserted_at for the trend watermark lag
+
+Revision ID: d1f7a3c9e254
+Revises: 7b3e9d2c5f41
+Create Date: 2024-12-20 15:40:09.263517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1f7a3c9e254'
+down_revision: Union[str, None] = '7b3e9d2c5f41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 기존 기사는 마이그레이션 시각으로 채워지며, 트렌드 엔진은 TREND_WATERMARK_LAG_SECONDS 뒤에 이어서 셉니다.
+    op.add_column(
+        'news',
+        sa.Column('inserted_at', sa.DateTime(), nullable=False, server_default=sa.text('clock_timestamp()')),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('news', 'inserted_at')
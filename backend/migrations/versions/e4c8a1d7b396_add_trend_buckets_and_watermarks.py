@@ -0,0 +1,40 @@
+"""Add incremental trend counters and watermarks
+
+Revision ID: e4c8a1d7b396
+Revises: 9d2b6e4f8a15
+Create Date: 2024-12-18 09:31:48.127650
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4c8a1d7b396'
+down_revision: Union[str, None] = '9d2b6e4f8a15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'trend_buckets',
+        sa.Column('category_id', sa.Integer(), sa.ForeignKey('categories.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('bucket_start', sa.DateTime(), primary_key=True),
+        sa.Column('count', sa.Integer(), nullable=False),
+    )
+    op.create_index('ix_trend_buckets_bucket_start', 'trend_buckets', ['bucket_start'])
+    op.create_table(
+        'trend_watermarks',
+        sa.Column('name', sa.String(), primary_key=True),
+        sa.Column('last_news_id', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('trend_watermarks')
+    op.drop_index('ix_trend_buckets_bucket_start', table_name='trend_buckets')
+    op.drop_table('trend_buckets')
@@ -0,0 +1,98 @@
+import fakeredis
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from app.services.answer_cache import AnswerCache
+from app.services.cache_versions import bump_category_versions
+from app.services.llm_backends import HashingEmbeddings
+
+
+@pytest.fixture
+def client():
+    return fakeredis.FakeRedis()
+
+
+class SemanticEmbeddings(Embeddings):
+    """의미 임베딩 자리에 쓰는 테스트용 임베딩 (유사도 비교 경로를 타도록 HashingEmbeddings를 감쌈)."""
+
+    def __init__(self):
+        self.inner = HashingEmbeddings(dim=256)
+
+    def embed_documents(self, texts):
+        return self.inner.embed_documents(texts)
+
+    def embed_query(self, text):
+        return self.inner.embed_query(text)
+
+
+@pytest.fixture
+def cache(client):
+    return AnswerCache(embeddings=SemanticEmbeddings(), client=client, threshold=0.8, ttl=60, max_entries=2)
+
+
+def test_similar_question_hits_within_same_category_set(cache):
+    scope = cache.scope([1, 2])
+    cache.store(scope, "오늘 경제 뉴스 요약", "경제 요약")
+
+    assert cache.lookup(scope, "오늘 경제 뉴스 요약해줘") == "경제 요약"
+    assert cache.lookup(scope, "날씨 어때") is None
+    assert cache.lookup(cache.scope([1]), "오늘 경제 뉴스 요약") is None
+    assert cache.stats()["total"] == {"hits": 1, "misses": 2, "hit_rate": pytest.approx(1 / 3)}
+
+
+def test_new_articles_invalidate_scope(cache, client):
+    scope = cache.scope([1, 2])
+    cache.store(scope, "오늘 경제 뉴스 요약", "경제 요약")
+
+    bump_category_versions([2], client)
+
+    assert cache.scope([1, 2]) != scope
+    assert cache.lookup(cache.scope([1, 2]), "오늘 경제 뉴스 요약") is None
+    assert cache.scope([3]) == AnswerCache(embeddings=cache.embeddings, client=client).scope([3])
+
+
+def test_scope_keeps_only_newest_entries(cache):
+    scope = cache.scope([1])
+    for index, question in enumerate(["반도체 수출", "환율 전망", "금리 인상"]):
+        cache.store(scope, question, f"answer {index}")
+
+    assert cache.lookup(scope, "반도체 수출") is None
+    assert cache.lookup(scope, "금리 인상") == "answer 2"
+
+
+def test_lexical_embeddings_only_hit_the_same_question(client):
+    cache = AnswerCache(embeddings=HashingEmbeddings(dim=256), client=client, ttl=60, max_entries=2)
+    scope = cache.scope([1])
+    cache.store(scope, "삼성전자 영업이익이 지난 분기 대비 증가한 이유를 알려줘", "증가 이유")
+
+    # 단어 하나만 달라도 뜻이 반대일 수 있으므로 적중하지 않음
+    assert cache.lookup(scope, "삼성전자 영업이익이 지난 분기 대비 감소한 이유를 알려줘") is None
+    assert cache.lookup(scope, " 삼성전자  영업이익이 지난 분기 대비 증가한 이유를 알려줘") == "증가 이유"
+    assert client.hlen(f"answer:{scope}:vectors") == 0
+
+
+def test_evicted_questions_no_longer_match_exactly(cache, client):
+    scope = cache.scope([1])
+    for index, question in enumerate(["반도체 수출", "환율 전망", "반도체 수출", "금리 인상"]):
+        cache.store(scope, question, f"answer {index}")
+
+    assert cache.lookup(scope, "반도체 수출") == "answer 2"
+    assert cache.lookup(scope, "환율 전망") is None
+    assert client.hlen(f"answer:{scope}:questions") == 2
+
+
+def test_lookup_reads_sketches_and_only_reranked_vectors(client):
+    cache = AnswerCache(embeddings=SemanticEmbeddings(), client=client, threshold=0.8, ttl=60, max_entries=50, rerank=2)
+    scope = cache.scope([1])
+    questions = [f"{topic} 뉴스 요약" for topic in ["반도체", "환율", "금리", "부동산", "야구", "날씨", "선거", "유가"]]
+    for question in questions:
+        cache.store(scope, question, f"{question} 답변")
+
+    # 원래 벡터는 전체를 읽지 않고 다시 비교할 후보(rerank=2)만 읽습니다.
+    read, hmget, hgetall = [], client.hmget, client.hgetall
+    client.hmget = lambda key, ids: read.append(len(ids)) or hmget(key, ids)
+    client.hgetall = lambda key: pytest.fail("full vector scan") if key.endswith(":vectors") else hgetall(key)
+
+    assert cache.lookup(scope, "금리 뉴스 요약해줘") == "금리 뉴스 요약 답변"
+    assert read == [2]
+    assert len(client.hget(f"answer:{scope}:sketches", client.hkeys(f"answer:{scope}:sketches")[0])) == 2 * cache.sketch_dim
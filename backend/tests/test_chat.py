@@ -0,0 +1,114 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import fakeredis
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain_core.documents import Document
+from langchain_core.runnables import RunnableLambda
+
+from app.database import async_get_db
+from app.dependencies import get_current_user
+from app.routers import chat
+from app.services.answer_cache import AnswerCache
+from app.services.llm_backends import HashingEmbeddings, StubChatModel
+from app.services.llm_gate import LLMGate
+
+
+@pytest.fixture
+def client():
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=MagicMock(**{"scalars.return_value.all.return_value": [3]}))
+
+    async def override_db():
+        yield db
+
+    app = FastAPI()
+    app.include_router(chat.router, prefix="/chat")
+    app.dependency_overrides[async_get_db] = override_db
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=7)
+
+    retriever = RunnableLambda(
+        lambda question: [Document(page_content="Title: 반도체 수출 증가", metadata={"news_id": 11})]
+    )
+    with patch("app.routers.chat.news_retriever", return_value=retriever), \
+            patch("app.routers.chat.get_chat_model", return_value=StubChatModel()), \
+            patch("app.routers.chat.save_chat_message", new_callable=AsyncMock) as save, \
+            patch("app.routers.chat.async_session"), \
+            patch("app.routers.chat.get_chat_history", new_callable=AsyncMock, return_value=[]), \
+            patch("app.routers.chat.get_answer_cache", return_value=AnswerCache(embeddings=HashingEmbeddings(), client=fakeredis.FakeRedis())):
+        chat.init_chat_runtime(app)
+        yield TestClient(app), save
+
+
+def parse_events(body: str) -> list[tuple[str, object]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def test_query_streams_context_then_tokens(client):
+    client, save = client
+    response = client.post("/chat/query", params={"user_id": 7, "question": "반도체 수출은?", "stream": True})
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(response.text)
+    assert events[0] == ("context", [{"news_id": 11, "content": "Title: 반도체 수출 증가"}])
+    assert [name for name, _ in events[1:-1]] == ["token"] * (len(events) - 2)
+    answer = "".join(token for _, token in events[1:-1])
+    assert events[-1][0] == "done"
+    assert events[-1][1]["response"] == answer
+    assert events[-1][1]["prompt_tokens"] > 0
+
+    # 스트림이 끝난 뒤 질문과 완성된 답변이 저장됩니다.
+    assert [(saved.args[1:], saved.kwargs) for saved in save.await_args_list] == [
+        ((7, "반도체 수출은?"), {"is_user": True}),
+        ((7, answer), {"is_user": False}),
+    ]
+
+
+def test_query_without_stream_returns_full_answer(client):
+    client, save = client
+    response = client.post("/chat/query", params={"user_id": 7, "question": "반도체 수출은?"})
+
+    body = response.json()
+    assert body["response"] == "Stub answer to '반도체 수출은?'. Title: 반도체 수출 증가"
+    assert body["cached"] is False
+    assert body["prompt_tokens"] > 0
+    assert save.await_count == 2
+    # 합쳐진 계산은 요청 세션이 아닌 자체 세션으로 저장합니다 (먼저 온 요청이 끝나도 유효).
+    flight_db = chat.async_session.return_value.__aenter__.return_value
+    assert all(saved.args[0] is flight_db for saved in save.await_args_list)
+
+
+def test_query_reuses_cached_answer_for_similar_question(client):
+    client, save = client
+    first = client.post("/chat/query", params={"user_id": 7, "question": "반도체 수출은?"}).json()
+
+    with patch("app.routers.chat.news_retriever") as retriever:
+        second = client.post("/chat/query", params={"user_id": 7, "question": "반도체 수출은 ?"}).json()
+        stream = client.post("/chat/query", params={"user_id": 7, "question": "반도체 수출은?", "stream": True})
+
+    assert not retriever.called
+    assert second == {"response": first["response"], "cached": True, "prompt_tokens": 0}
+    assert parse_events(stream.text)[-1] == ("done", {"response": first["response"], "cached": True, "prompt_tokens": 0})
+    assert save.await_count == 6
+
+
+def test_query_returns_503_when_llm_is_saturated(client):
+    client, save = client
+    gate = LLMGate(max_concurrency=1, max_queue_wait=0)
+    client.app.state.llm_gate = gate
+
+    asyncio.run(gate.acquire())
+    for stream in (False, True):
+        response = client.post("/chat/query", params={"user_id": 7, "question": "환율은?", "stream": stream})
+        assert response.status_code == 503
+        assert "Retry-After" in response.headers
+    assert gate.stats()["rejected"] == 2
+    assert save.await_count == 0
@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+
+from langchain_core.documents import Document
+
+from app.services.context_builder import build_context, count_tokens
+
+
+def doc(news_id, text, published_at):
+    return Document(page_content=text, metadata={"news_id": news_id, "published_at": published_at})
+
+
+DOCS = [
+    doc(1, "Title: 한은 기준금리 0.25%p 인하\n\nDescription: 한국은행이 기준금리를 연 3.0%로 인하했다.", 100),
+    doc(2, "Title: 한은 기준금리 0.25%p 인하\n\nDescription: 한국은행이 기준금리를 연 3.0%로 인하했다.", 200),
+    doc(3, "Title: 금리 인하에 대출금리 하락 전망\n\nDescription: 은행 대출금리도 내려갈 것으로 보인다.", 300),
+    doc(4, "Title: 원달러 환율 급등\n\nDescription: 환율이 1,430원을 넘었다.", 50),
+]
+
+
+def test_build_context_drops_duplicates_and_orders_newest_first():
+    built = build_context("기준금리 인하", DOCS)
+
+    news_ids = [d.metadata["news_id"] for d in built.documents]
+    assert len({1, 2} & set(news_ids)) == 1
+    assert news_ids == sorted(news_ids, key=lambda news_id: -DOCS[news_id - 1].metadata["published_at"])
+    assert built.prompt_tokens > built.context_tokens > 0
+
+
+def test_build_context_respects_token_budget_with_history():
+    history = [
+        SimpleNamespace(is_user=False, message="이전 답변"),
+        SimpleNamespace(is_user=True, message="이전 질문"),
+        SimpleNamespace(is_user=False, message="아주 오래된 답변 " * 200),
+    ]
+    budget = 120
+    built = build_context("기준금리 인하", DOCS, history, budget=budget)
+
+    assert built.history_turns == 2
+    assert built.history.splitlines()[0] == "User: 이전 질문"
+    assert built.context_tokens + built.history_tokens <= budget
+    assert 0 < len(built.documents) < len(DOCS)
+    assert count_tokens("") == 0
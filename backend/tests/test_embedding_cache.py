@@ -0,0 +1,51 @@
+import itertools
+
+import fakeredis
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from app.services.embedding_cache import CachedEmbeddings
+
+
+class CountingEmbedding(DeterministicFakeEmbedding):
+    calls: list = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return super().embed_documents(texts)
+
+
+@pytest.fixture
+def underlying():
+    embedding = CountingEmbedding(size=8)
+    embedding.calls = []
+    return embedding
+
+
+def test_cached_embeddings_only_embed_new_texts(underlying):
+    cache = CachedEmbeddings(underlying, model_name="fake", client=fakeredis.FakeRedis())
+
+    first = cache.embed_documents(["a", "b", "a"])
+    second = cache.embed_documents(["b", "c"])
+
+    assert underlying.calls == [["a", "b"], ["c"]]
+    assert first[0] == first[2]
+    assert second[0] == pytest.approx(first[1], abs=1e-6)
+    assert (cache.hits, cache.misses) == (1, 4)
+    assert cache.stats()["total"] == {"hits": 1, "misses": 4}
+
+
+def test_cached_embeddings_evict_least_recently_used(underlying, monkeypatch):
+    clock = itertools.count(1)
+    monkeypatch.setattr("app.services.embedding_cache.time.time", lambda: next(clock))
+    client = fakeredis.FakeRedis()
+    cache = CachedEmbeddings(underlying, model_name="fake", client=client, max_entries=2)
+
+    cache.embed_documents(["a"])
+    cache.embed_documents(["b"])
+    cache.embed_documents(["a"])  # a를 최근 사용으로 갱신
+    cache.embed_documents(["c"])  # 가장 오래 쓰이지 않은 b가 삭제됨
+
+    assert cache.stats()["entries"] == 2
+    cache.embed_documents(["a", "b"])
+    assert underlying.calls[-1] == ["b"]
@@ -0,0 +1,39 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.keyword_matcher import KeywordAutomaton, KeywordMatcher
+
+
+def test_automaton_counts_overlapping_and_multi_word_keywords():
+    automaton = KeywordAutomaton({"반도체": [1], "반도체 수출": [2], "수출": [3], "AI": [4], "ai": [5]})
+
+    counts = automaton.count("반도체  수출이 늘고 반도체가 강세. AI 수요와 FAIR 규정, OpenAI(ai) 발표")
+    assert counts == {1: 2, 2: 1, 3: 1, 4: 2, 5: 2}  # "FAIR", "OpenAI"의 ai는 제외
+    assert len(automaton) == 4  # "AI"와 "ai"는 같은 키워드
+
+
+def test_automaton_matches_suffix_keywords_through_failure_links():
+    automaton = KeywordAutomaton({"가나다": [1], "나다": [2], "나다라마": [3], "다라": [4]})
+    assert automaton.count("가나다라마") == {1: 1, 2: 1, 3: 1, 4: 1}
+
+    korean = KeywordAutomaton({"전기차": [1], "기차": [2], "차세대 전기차": [3]})
+    assert korean.count("차세대 전기차와 기차") == {1: 1, 2: 2, 3: 1}
+
+
+def test_matcher_rebuilds_only_when_version_changes():
+    result = MagicMock()
+    result.all.return_value = [(1, "반도체")]
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=result)
+    matcher = KeywordMatcher()
+
+    async def scenario(versions):
+        automata = []
+        with patch("app.services.keyword_matcher.get_trend_keywords_version", side_effect=versions):
+            for _ in versions:
+                automata.append(await matcher.get(db))
+        return automata
+
+    first, second, third = asyncio.run(scenario([1, 1, 2]))
+    assert first is second and second is not third
+    assert db.execute.await_count == 2
@@ -0,0 +1,36 @@
+import asyncio
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.runnables import RunnableLambda
+
+from app.routers.chat import create_rag_chain
+from app.services.llm_backends import HashingEmbeddings, StubChatModel
+
+
+def test_hashing_embeddings_are_normalized_and_deterministic():
+    embeddings = HashingEmbeddings(dim=256)
+    vectors = np.array(embeddings.embed_documents(["반도체가 호황", "반도체를 수출", "날씨가 맑음", ""]))
+
+    assert vectors.shape == (4, 256)
+    assert np.allclose(np.linalg.norm(vectors[:3], axis=1), 1.0)
+    assert not vectors[3].any()
+    assert embeddings.embed_query("반도체가 호황") == vectors[0].tolist()
+    # 조사가 다른 같은 단어가 관련 없는 문장보다 가깝습니다.
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+
+
+def test_rag_chain_runs_offline_with_stub_model(monkeypatch):
+    monkeypatch.setattr("app.routers.chat.get_chat_model", lambda: StubChatModel())
+    retriever = RunnableLambda(lambda question: [Document(page_content="Title: 반도체 수출 증가")])
+    chain = create_rag_chain(retriever)
+
+    answer = chain.invoke("반도체 수출은?")
+    assert answer == "Stub answer to '반도체 수출은?'. Title: 반도체 수출 증가"
+
+    async def stream():
+        return [token async for token in chain.astream("반도체 수출은?")]
+
+    tokens = asyncio.run(stream())
+    assert len(tokens) > 1
+    assert "".join(tokens) == answer
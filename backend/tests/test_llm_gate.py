@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+
+from app.services.llm_gate import LLMGate, LLMSaturatedError
+
+
+def test_gate_bounds_concurrency_and_rejects_after_queue_wait():
+    async def scenario():
+        gate = LLMGate(max_concurrency=2, max_queue_wait=0.05)
+        running = []
+
+        async def call():
+            async with gate.slot():
+                running.append(gate.in_flight)
+                await asyncio.sleep(0.2)
+
+        results = await asyncio.gather(*(call() for _ in range(3)), return_exceptions=True)
+        return gate, running, results
+
+    gate, running, results = asyncio.run(scenario())
+    assert max(running) == 2
+    assert sum(isinstance(result, LLMSaturatedError) for result in results) == 1
+    assert gate.stats() == {"max_concurrency": 2, "in_flight": 0, "waiting": 0, "rejected": 1}
+
+
+def test_slot_release_is_idempotent():
+    async def scenario():
+        gate = LLMGate(max_concurrency=1, max_queue_wait=0)
+        slot = await gate.acquire()
+        slot.release()
+        slot.release()
+        await gate.acquire()
+        with pytest.raises(LLMSaturatedError):
+            await gate.acquire()
+        return gate
+
+    assert asyncio.run(scenario()).in_flight == 1
@@ -0,0 +1,66 @@
+import asyncio
+import os
+import threading
+
+from app.services.morph_analyzer import MorphAnalyzer
+
+
+class FakeOkt:
+    """JVM 없이 동작하는 분석기: 공백으로 나눈 단어 중 두 글자 이상을 명사로 취급합니다."""
+
+    created = 0
+
+    def __init__(self):
+        FakeOkt.created += 1
+
+    def nouns(self, text):
+        return [word for word in text.split() if len(word) >= 2] + [f"pid{os.getpid()}"]
+
+
+TEXTS = [f"반도체 수출 {i}번째 기사" for i in range(10)]
+
+
+def strip_pid(results):
+    return [[word for word in nouns if not word.startswith("pid")] for nouns in results]
+
+
+def test_process_pool_keeps_order_and_reuses_warm_workers():
+    analyzer = MorphAnalyzer(processes=2, batch_size=3, factory=FakeOkt)
+    try:
+        first = analyzer.nouns_many(TEXTS)
+        second = asyncio.run(analyzer.anouns_many(TEXTS))
+    finally:
+        analyzer.close()
+
+    expected = [["반도체", "수출", f"{i}번째", "기사"] for i in range(10)]
+    assert strip_pid(first) == expected
+    assert strip_pid(second) == expected
+    worker_pids = {nouns[-1] for nouns in first + second}
+    assert f"pid{os.getpid()}" not in worker_pids
+    assert len(worker_pids) <= 2
+
+
+def test_in_process_mode_reuses_one_analyzer_per_thread():
+    analyzer = MorphAnalyzer(processes=0, factory=FakeOkt)
+    FakeOkt.created = 0
+
+    analyzer.nouns_many(TEXTS)
+    analyzer.nouns_many(TEXTS)
+    assert FakeOkt.created == 1
+
+    thread = threading.Thread(target=analyzer.nouns_many, args=(TEXTS,))
+    thread.start()
+    thread.join()
+    assert FakeOkt.created == 2
+
+    assert strip_pid(asyncio.run(analyzer.anouns_many(["경제 뉴스"]))) == [["경제", "뉴스"]]
+    assert analyzer.nouns_many([]) == []
+
+
+def test_warm_starts_every_pool_worker():
+    analyzer = MorphAnalyzer(processes=2, batch_size=2, factory=FakeOkt)
+    try:
+        asyncio.run(analyzer.warm())
+        assert len(analyzer._get_pool()._processes) == 2
+    finally:
+        analyzer.close()
@@ -1,6 +1,7 @@
 import pytest
-from unittest.mock import patch, AsyncMock
-from background.task import crawl_and_save_news
+from unittest.mock import patch, MagicMock, ANY
+from background.task import crawl_and_save_news, embed_new_news, embed_news_batch, extract_news_nouns
+from app.config import settings
 
 
 @pytest.fixture
@@ -28,14 +29,29 @@ def mock_crawl_news():
 
 @pytest.fixture
 def mock_db_session():
-    """Mocked AsyncSession for database interaction"""
+    """Mocked Session for database interaction"""
     with patch("background.task.SessionLocal") as mock_session:
-        mock_instance = AsyncMock()
+        mock_instance = MagicMock()
         mock_session.return_value = mock_instance
         yield mock_instance
 
 
-def test_crawl_and_save_news(mock_crawl_news, mock_db_session):
+@pytest.fixture
+def mock_crawl_state():
+    """Mocked CrawlState so the task does not need Redis"""
+    with patch("background.task.CrawlState") as mock_state:
+        yield mock_state.return_value
+
+
+@pytest.fixture
+def mock_index_news():
+    """Mocked vector indexing so the task does not need Chroma or embeddings"""
+    with patch("background.task.index_news") as mock_index:
+        mock_index.return_value = {"embedded": 0, "updated": 0}
+        yield mock_index
+
+
+def test_crawl_and_save_news(mock_crawl_news, mock_db_session, mock_crawl_state, mock_index_news):
     """Test crawl_and_save_news task"""
     category_name = "technology"
     
@@ -43,7 +59,7 @@ def test_crawl_and_save_news(mock_crawl_news, mock_db_session):
     result = crawl_and_save_news(category_name)
 
     # Assertions for crawl_news_from_naver
-    mock_crawl_news.assert_called_once_with(category_name, limit=10)  # Check the mock was called
+    mock_crawl_news.assert_called_once_with(category_name, limit=10, known_filter=ANY)  # Check the mock was called
     assert result["status"] == "success"
     assert result["category"] == category_name
     assert result["count"] == len(mock_crawl_news.return_value)
@@ -51,3 +67,70 @@ def test_crawl_and_save_news(mock_crawl_news, mock_db_session):
     # Assertions for database interactions
     assert mock_db_session.commit.called
     assert mock_db_session.close.called
+    mock_crawl_state.mark_seen.assert_called_once_with(mock_crawl_news.return_value)
+    # 임베딩은 다음 단계에서 처리
+    mock_index_news.assert_not_called()
+    assert "news_ids" in result and "category_id" in result
+
+
+def test_embed_new_news_splits_ids_into_batches(monkeypatch):
+    """Test embed_new_news fans out EMBED_BATCH_SIZE batches"""
+    monkeypatch.setattr(settings, "EMBED_BATCH_SIZE", 2)
+    crawl_result = {"status": "success", "category": "technology", "category_id": 7, "news_ids": [1, 2, 3, 4, 5]}
+
+    with patch("background.task.embed_news_batch.delay") as mock_delay:
+        result = embed_new_news(crawl_result)
+
+    assert result == {"status": "queued", "category": "technology", "count": 5, "batches": 3}
+    assert [c.args for c in mock_delay.call_args_list] == [([1, 2], [7]), ([3, 4], [7]), ([5], [7])]
+
+
+def test_embed_new_news_skips_failed_or_empty_crawl():
+    """Test embed_new_news does nothing when the crawl failed or found nothing new"""
+    with patch("background.task.embed_news_batch.delay") as mock_delay:
+        assert embed_new_news({"status": "failure", "error": "timeout"})["status"] == "skipped"
+        assert embed_new_news({"status": "success", "category": "technology", "news_ids": []})["status"] == "skipped"
+    mock_delay.assert_not_called()
+
+
+def test_embed_news_batch(mock_db_session, mock_index_news):
+    """Test embed_news_batch indexes the batch, then invalidates the category answer cache"""
+    mock_index_news.return_value = {"embedded": 2, "updated": 1}
+
+    with patch("background.task.bump_category_versions") as mock_bump:
+        result = embed_news_batch([1, 2, 3], [7])
+
+    mock_index_news.assert_called_once_with(mock_db_session, [1, 2, 3])
+    mock_bump.assert_called_once_with([7])
+    assert mock_db_session.close.called
+    assert result["embedded"] == 2 and result["updated"] == 1
+    assert embed_news_batch.max_retries == settings.EMBED_MAX_RETRIES
+
+
+def test_extract_news_nouns(mock_db_session):
+    """Test extract_news_nouns stores noun counts for the crawled news once"""
+    crawl_result = {"status": "success", "category": "technology", "category_id": 7, "news_ids": [1, 2]}
+
+    with patch("background.task.store_noun_counts", return_value=2) as mock_store:
+        result = extract_news_nouns(crawl_result)
+        assert extract_news_nouns({"status": "failure", "error": "timeout"})["status"] == "skipped"
+
+    mock_store.assert_called_once_with(mock_db_session, [1, 2])
+    assert result == {"status": "success", "category": "technology", "count": 2}
+    assert mock_db_session.close.called
+
+
+def test_fetch_endpoint_runs_the_crawl_pipeline():
+    """Test POST /news/fetch queues crawl -> (embed, nouns) instead of inserting directly"""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.routers import news
+
+    app = FastAPI()
+    app.include_router(news.router, prefix="/news")
+    with patch("app.routers.news.enqueue_crawl") as mock_enqueue:
+        mock_enqueue.return_value.id = "task-1"
+        response = TestClient(app).post("/news/fetch", params={"category": "technology", "limit": 5})
+
+    mock_enqueue.assert_called_once_with("technology", 5)
+    assert response.json() == {"status": "queued", "task_id": "task-1"}
@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services.news_crawler import (
+    HostRateLimiter,
+    TokenBucket,
+    crawl_news_async,
+)
+
+
+def make_page(keyword, start, count):
+    items = "".join(
+        f"""
+        <div class="news_wrap">
+          <a class="news_tit" href="http://sample.com/{keyword}/{start + i}" title="{keyword} 뉴스 {start + i}"></a>
+          <div class="info_group"><span class="info">샘플일보</span><span class="info">3시간 전</span></div>
+          <div class="dsc_wrap">{keyword} 설명 {start + i}</div>
+        </div>
+        """
+        for i in range(count)
+    )
+    return f"<html><body>{items}</body></html>"
+
+
+@pytest.fixture
+def naver_transport():
+    """페이지당 10개, 최대 25개의 결과를 돌려주는 가짜 네이버 검색"""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        keyword = request.url.params["query"]
+        start = int(request.url.params["start"])
+        count = max(0, min(10, 25 - start + 1))
+        return httpx.Response(200, text=make_page(keyword, start, count))
+
+    transport = httpx.MockTransport(handler)
+    transport.requests = requests
+    return transport
+
+
+def test_crawl_news_async_fetches_pages(naver_transport):
+    async def run():
+        async with httpx.AsyncClient(transport=naver_transport) as client:
+            return await crawl_news_async("경제", limit=25, client=client, limiter=HostRateLimiter(100, 10))
+
+    articles = asyncio.run(run())
+
+    assert len(naver_transport.requests) == 3
+    assert [a["url"] for a in articles] == [f"http://sample.com/경제/{i}" for i in range(1, 26)]
+    assert articles[0]["source"] == "샘플일보"
+    assert articles[0]["category"] == "경제"
+
+
+def test_crawl_stops_on_error_status():
+    transport = httpx.MockTransport(lambda request: httpx.Response(403))
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await crawl_news_async("경제", limit=20, client=client, limiter=HostRateLimiter(100, 10))
+
+    assert asyncio.run(run()) == []
+
+
+def test_token_bucket_limits_rate():
+    async def run():
+        bucket = TokenBucket(rate=20, capacity=2)
+        started = time.monotonic()
+        for _ in range(6):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    # 2개는 즉시, 나머지 4개는 초당 20개 속도로 → 약 0.2초
+    assert asyncio.run(run()) >= 0.18
+
+
+def test_incremental_crawl_stops_at_known_page(naver_transport):
+    known_urls = {f"http://sample.com/경제/{i}" for i in range(6, 26)}
+
+    def known_filter(articles):
+        return [article["url"] in known_urls for article in articles]
+
+    async def run():
+        async with httpx.AsyncClient(transport=naver_transport) as client:
+            return await crawl_news_async(
+                "경제", limit=30, client=client, limiter=HostRateLimiter(100, 10), known_filter=known_filter
+            )
+
+    articles = asyncio.run(run())
+
+    # 1페이지에서 새 기사 5개, 2페이지는 전부 이미 수집된 기사이므로 중단
+    assert [a["url"] for a in articles] == [f"http://sample.com/경제/{i}" for i in range(1, 6)]
+    assert len(naver_transport.requests) == 2
+    assert naver_transport.requests[0].url.params["sort"] == "1"
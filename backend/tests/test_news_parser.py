@@ -0,0 +1,48 @@
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from app.services.news_parser import PARSER_BACKENDS, get_result_page_parser, parse_published_date
+
+FIXTURES = Path(__file__).parent / "fixtures"
+NOW = datetime(2024, 12, 3, 12, 0, 0)
+
+
+@pytest.fixture(params=["naver_search_page1.html", "naver_search_page2.html"])
+def page_html(request):
+    return (FIXTURES / request.param).read_text(encoding="utf-8")
+
+
+def test_backends_return_identical_records(page_html):
+    expected = get_result_page_parser("soup").parse(page_html, "경제", now=NOW)
+
+    assert len(expected) == 10
+    for name in PARSER_BACKENDS:
+        assert get_result_page_parser(name).parse(page_html, "경제", now=NOW) == expected
+
+
+def test_parsed_record_fields():
+    html = (FIXTURES / "naver_search_page1.html").read_text(encoding="utf-8")
+    record = get_result_page_parser("lxml").parse(html, "경제", now=NOW)[0]
+
+    assert record.title == "반도체 수출 3개월 연속 증가…AI 수요가 견인"
+    assert record.url.startswith("https://www.example-news.co.kr/article/")
+    assert record.description.startswith("산업통상자원부에 따르면")
+    assert record.source == "한국경제"
+    assert record.published_at == "2024-12-03 11:55:00"
+    assert record.category == "경제"
+
+
+@pytest.mark.parametrize(
+    "info_texts, expected",
+    [
+        (["연합뉴스", "17분 전"], "2024-12-03 11:43:00"),
+        (["연합뉴스", "3시간 전"], "2024-12-03 09:00:00"),
+        (["연합뉴스", "A12면", "2일 전"], "2024-12-01 12:00:00"),
+        (["연합뉴스", "2024.11.28."], "2024-11-28 00:00:00"),
+        (["전북일보", "네이버뉴스"], None),
+    ],
+)
+def test_parse_published_date(info_texts, expected):
+    assert parse_published_date(info_texts, NOW) == expected
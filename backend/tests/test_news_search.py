@@ -0,0 +1,21 @@
+from app.services.news_search import build_tsquery, highlight
+
+
+def test_build_tsquery_uses_hangul_bigrams():
+    assert build_tsquery("반도체 수출") == "(반도 & 도체) & (수출)"
+    assert build_tsquery("AI반도체") == "(ai:*) & (반도 & 도체)"
+    assert build_tsquery("금") == "(금:*)"
+    assert build_tsquery("!!") == ""
+
+
+def test_highlight_escapes_and_marks():
+    assert highlight("<b>반도체</b>가 강세", "반도체") == "&lt;b&gt;<mark>반도체</mark>&lt;/b&gt;가 강세"
+    assert highlight("AI 수요", "ai") == "<mark>AI</mark> 수요"
+
+
+def test_highlight_snippet_centers_on_match():
+    text = "가" * 300 + "반도체" + "나" * 300
+    snippet = highlight(text, "반도체", snippet=True)
+
+    assert "<mark>반도체</mark>" in snippet
+    assert snippet.startswith("…") and snippet.endswith("…")
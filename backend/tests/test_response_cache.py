@@ -0,0 +1,93 @@
+import asyncio
+
+import fakeredis
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from app.services.cache_versions import bump_trends_version, get_trends_version
+from app.services.response_cache import ResponseCache
+
+
+def make_app(cache: ResponseCache, version: dict, calls: list):
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items(request: Request, user: int = 1):
+        async def build():
+            calls.append(dict(request.query_params))
+            if request.query_params.get("missing"):
+                raise HTTPException(status_code=404, detail="No items found")
+            return {"items": request.query_params.getlist("tag"), "version": version["value"]}
+
+        return await cache.respond(request, build, user, version["value"])
+
+    return app
+
+
+def test_responses_are_cached_per_normalized_query_and_version():
+    cache = ResponseCache("test", client=fakeredis.FakeRedis(), enabled=True)
+    version, calls = {"value": "0"}, []
+    client = TestClient(make_app(cache, version, calls))
+
+    first = client.get("/items?tag=a&tag=b&user=1")
+    assert first.json() == {"items": ["a", "b"], "version": "0"}
+    # 파라미터 순서와 빈 값은 키에 영향을 주지 않음
+    assert client.get("/items?user=1&tag=a&tag=b&cursor=").json() == first.json()
+    assert len(calls) == 1
+
+    client.get("/items?tag=a&tag=b&user=2")
+    assert len(calls) == 2
+
+    version["value"] = "1"
+    assert client.get("/items?tag=a&tag=b&user=1").json()["version"] == "1"
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_if_none_match_returns_304_without_recomputing():
+    cache = ResponseCache("test", client=fakeredis.FakeRedis(), enabled=True)
+    version, calls = {"value": "0"}, []
+    client = TestClient(make_app(cache, version, calls))
+
+    etag = client.get("/items?tag=a").headers["etag"]
+    not_modified = client.get("/items?tag=a", headers={"If-None-Match": f'W/"x", {etag}'})
+    assert not_modified.status_code == 304 and not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+    assert len(calls) == 1
+
+    version["value"] = "1"
+    changed = client.get("/items?tag=a", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+
+
+def test_errors_are_not_cached_and_redis_outage_disables_cache():
+    cache = ResponseCache("test", client=fakeredis.FakeRedis(), enabled=True)
+    version, calls = {"value": "0"}, []
+    client = TestClient(make_app(cache, version, calls))
+    assert client.get("/items?missing=1").status_code == 404
+    assert client.get("/items?missing=1").status_code == 404
+    assert len(calls) == 2
+
+    server = fakeredis.FakeServer()
+    server.connected = False
+    broken = fakeredis.FakeRedis(server=server)
+    assert get_trends_version(1, client=broken) is None
+
+    cache = ResponseCache("test", client=broken, enabled=True)
+    response = asyncio.run(cache.respond(
+        Request({"type": "http", "method": "GET", "path": "/", "query_string": b"", "headers": []}),
+        _build_ok, version="0",
+    ))
+    assert response.status_code == 200 and response.body == b'{"ok":true}'
+
+
+async def _build_ok():
+    return {"ok": True}
+
+
+def test_trend_versions_are_per_user_and_global():
+    client = fakeredis.FakeRedis()
+    assert get_trends_version(1, client=client) == "0.0"
+    bump_trends_version(1, client=client)
+    assert (get_trends_version(1, client=client), get_trends_version(2, client=client)) == ("0.1", "0.0")
+    bump_trends_version(client=client)
+    assert get_trends_version(2, client=client) == "1.0"
@@ -0,0 +1,78 @@
+from datetime import datetime
+
+import chromadb
+import pytest
+from langchain_chroma import Chroma
+
+from app.services.bm25_index import BM25Index
+from app.services.llm_backends import HashingEmbeddings
+from app.services.retrieval import HybridRetriever, reciprocal_rank_fusion
+from app.services.vector_store import index_articles, news_text
+
+ARTICLES = [
+    (1, "반도체가 수출을 이끌었다", datetime(2024, 12, 10), [1]),
+    (2, "반도체 가격 하락 우려", datetime(2024, 12, 9), [2]),
+    (3, "반도체 업황 점검", datetime(2024, 10, 1), [1]),
+    (4, "환율 급등", datetime(2024, 12, 10), [1]),
+]
+
+
+@pytest.fixture
+def bm25():
+    index = BM25Index()
+    for news_id, title, published_at, category_ids in ARTICLES:
+        index.add(news_id, news_text(title, ""), published_at, category_ids)
+    index.refresh_from_db = lambda: pytest.fail("BM25 refresh on the request path")
+    return index
+
+
+def test_reciprocal_rank_fusion_prefers_items_ranked_by_both():
+    fused = reciprocal_rank_fusion([[1, 2, 3], [3, 1, 4]])
+    assert [key for key, _ in fused] == [1, 3, 2, 4]
+
+
+def test_bm25_matches_hangul_with_particles_and_pushes_down_filters(bm25):
+    assert {news_id for news_id, _ in bm25.search("반도체를")} == {1, 2, 3}
+    assert {news_id for news_id, _ in bm25.search("반도체", category_ids=[1])} == {1, 3}
+    assert [news_id for news_id, _ in bm25.search("반도체", category_ids=[1], since=datetime(2024, 12, 1))] == [1]
+
+    bm25.link(2, 1)
+    assert {news_id for news_id, _ in bm25.search("반도체", category_ids=[1], since=datetime(2024, 12, 1))} == {1, 2}
+
+
+def test_bm25_uses_stored_noun_counts():
+    def fail(text):
+        raise RuntimeError("JVM not available")
+
+    index = BM25Index(nouns=lambda text: {"칩": 1})
+    index.add(1, "반도체칩 수출", datetime(2024, 12, 10), [1], nouns={"반도체": 1, "칩": 1, "수출": 1})
+    index.add(2, "반도체칩 가격", datetime(2024, 12, 10), [1])  # 아직 명사 집계 전
+    assert [news_id for news_id, _ in index.search("칩")] == [1]
+
+    index.add_nouns(2, {"반도체": 1, "칩": 1, "가격": 1})
+    assert {news_id for news_id, _ in index.search("칩")} == {1, 2}
+    assert not index.pending_nouns
+
+    index.nouns = fail  # 분석기 오류 시 글자 기반 색인어로만 검색
+    assert {news_id for news_id, _ in index.search("반도체")} == {1, 2}
+
+
+def test_hybrid_retriever_applies_filters_to_both_indexes(bm25):
+    vectorstore = Chroma(
+        collection_name="test_retrieval",
+        embedding_function=HashingEmbeddings(dim=256),
+        client=chromadb.EphemeralClient(),
+    )
+    index_articles(vectorstore, [
+        {"id": news_id, "title": title, "description": "", "published_at": published_at, "category_ids": category_ids}
+        for news_id, title, published_at, category_ids in ARTICLES
+    ])
+    try:
+        retriever = HybridRetriever(
+            vectorstore=vectorstore, bm25=bm25, category_ids=[1], since=datetime(2024, 12, 1), k=3
+        )
+        docs = retriever.invoke("반도체 수출")
+        assert [doc.metadata["news_id"] for doc in docs][0] == 1
+        assert {doc.metadata["news_id"] for doc in docs} <= {1, 4}
+    finally:
+        vectorstore.delete_collection()
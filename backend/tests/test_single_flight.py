@@ -0,0 +1,117 @@
+import asyncio
+
+import fakeredis
+
+from app.services.single_flight import SingleFlight
+
+
+def test_concurrent_calls_with_same_key_share_one_execution():
+    async def scenario():
+        flight = SingleFlight("test", use_redis=False)
+        calls = []
+
+        async def compute(key):
+            calls.append(key)
+            await asyncio.sleep(0.05)
+            return {"key": key}
+
+        results = await asyncio.gather(
+            *(flight.do("a", lambda: compute("a")) for _ in range(5)),
+            flight.do("b", lambda: compute("b")),
+        )
+        return flight, calls, results
+
+    flight, calls, results = asyncio.run(scenario())
+    assert sorted(calls) == ["a", "b"]
+    assert results == [{"key": "a"}] * 5 + [{"key": "b"}]
+    assert (flight.executed, flight.shared) == (2, 4)
+
+
+def test_errors_are_shared_and_next_call_recomputes():
+    async def scenario():
+        flight = SingleFlight("test", use_redis=False)
+
+        async def fail():
+            await asyncio.sleep(0.05)
+            raise RuntimeError("boom")
+
+        async def ok():
+            return "ok"
+
+        results = await asyncio.gather(flight.do("a", fail), flight.do("a", fail), return_exceptions=True)
+        return results, await flight.do("a", ok)
+
+    results, retried = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert retried == "ok"
+
+
+def test_redis_lock_coalesces_across_workers():
+    client = fakeredis.FakeRedis()
+
+    async def scenario():
+        # 같은 Redis를 쓰는 두 워커
+        workers = [SingleFlight("test", client=client, use_redis=True) for _ in range(2)]
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.2)
+            return {"answer": "같은 결과"}
+
+        results = await asyncio.gather(*(worker.do("q", compute) for worker in workers))
+        return workers, calls, results
+
+    workers, calls, results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert results == [{"answer": "같은 결과"}] * 2
+    assert sum(worker.shared for worker in workers) == 1
+    assert not any(key.endswith(b":lock") for key in client.keys("sf:test:*"))
+
+
+def test_redis_follower_computes_when_leader_fails():
+    client = fakeredis.FakeRedis()
+
+    async def scenario():
+        leader, follower = SingleFlight("test", client=client, use_redis=True), SingleFlight("test", client=client, use_redis=True)
+
+        async def fail():
+            await asyncio.sleep(0.1)
+            raise RuntimeError("boom")
+
+        async def ok():
+            return "ok"
+
+        async def follow():
+            await asyncio.sleep(0.02)
+            return await follower.do("q", ok)
+
+        return await asyncio.gather(leader.do("q", fail), follow(), return_exceptions=True)
+
+    failed, followed = asyncio.run(scenario())
+    assert isinstance(failed, RuntimeError)
+    assert followed == "ok"
+
+
+def test_cancelling_leader_does_not_fail_followers():
+    async def scenario():
+        flight = SingleFlight("test", use_redis=False)
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            return "ok"
+
+        leader = asyncio.create_task(flight.do("a", compute))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(flight.do("a", compute))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        results = await asyncio.gather(leader, follower, return_exceptions=True)
+        return flight, calls, results
+
+    flight, calls, (leader, follower) = asyncio.run(scenario())
+    assert isinstance(leader, asyncio.CancelledError)
+    assert follower == "ok"
+    assert len(calls) == 1 and not flight._calls
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+import chromadb
+import pytest
+from langchain_chroma import Chroma
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from app.services.vector_store import category_filter, index_articles
+
+
+class CountingEmbedding(DeterministicFakeEmbedding):
+    embedded_texts: list = []
+
+    def embed_documents(self, texts):
+        self.embedded_texts.extend(texts)
+        return super().embed_documents(texts)
+
+
+@pytest.fixture
+def vectorstore():
+    embedding = CountingEmbedding(size=16)
+    embedding.embedded_texts = []
+    store = Chroma(
+        collection_name="test_news",
+        embedding_function=embedding,
+        client=chromadb.EphemeralClient(),
+    )
+    yield store
+    store.delete_collection()
+
+
+def article(news_id, category_ids):
+    return {
+        "id": news_id,
+        "title": f"반도체 기사 {news_id}",
+        "description": f"설명 {news_id}",
+        "published_at": datetime(2024, 12, 10, 12, 0),
+        "category_ids": category_ids,
+    }
+
+
+def test_category_filter():
+    assert category_filter([3]) == {"category_3": True}
+    assert category_filter([5, 3]) == {"$or": [{"category_3": True}, {"category_5": True}]}
+    with pytest.raises(ValueError):
+        category_filter([])
+
+
+def test_index_articles_embeds_each_article_once(vectorstore):
+    assert index_articles(vectorstore, [article(1, [1]), article(2, [2])]) == {"embedded": 2, "updated": 0}
+
+    # 다른 카테고리에 새로 연결된 기사는 다시 임베딩하지 않고 플래그만 추가합니다.
+    assert index_articles(vectorstore, [article(1, [1, 2])]) == {"embedded": 0, "updated": 1}
+    assert len(vectorstore.embeddings.embedded_texts) == 2
+
+    def news_ids(category_ids):
+        docs = vectorstore.similarity_search("반도체", k=10, filter=category_filter(category_ids))
+        return sorted(doc.metadata["news_id"] for doc in docs)
+
+    assert news_ids([1]) == [1]
+    assert news_ids([2]) == [1, 2]
+    assert news_ids([3]) == []
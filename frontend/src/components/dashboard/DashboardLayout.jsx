@@ -65,13 +65,14 @@ const DashboardLayout = () => {
         fetchNews(category, 5)
       );
       const newsResults = await Promise.all(newsPromises);
-      setNewsData(newsResults.flat());
+      setNewsData(newsResults.flatMap((page) => page?.items || []));
 
       const trendPromises = selectedCategories.map(async (category) => {
         const response = await fetchTrends([category], selectedInterval);
         return {
           category,
-          data: response.data[category]?.map((point) => ({
+          // 트렌드가 저장되지 않은 구간(count: null)은 그리지 않음
+          data: response.data[category]?.filter((point) => point.count !== null).map((point) => ({
             timestamp: new Date(point.time).getTime(),
             count: point.count,
           })) || [],
@@ -45,7 +45,8 @@ export function useNewsApi() {
     }
   };
 
-  const fetchNews = async (category = '', limit = 5) => {
+  // { items, next_cursor } 형태로 반환. 다음 페이지는 next_cursor를 cursor로 넘겨 요청
+  const fetchNews = async (category = '', limit = 5, cursor = null) => {
     console.log(API_BASE_URL);
     try {
       setLoading(true);
@@ -53,6 +54,7 @@ export function useNewsApi() {
       const params = new URLSearchParams();
       if (category) params.append('category', category);
       params.append('limit', limit.toString());
+      if (cursor) params.append('cursor', cursor);
 
       const response = await fetch(`${API_BASE_URL}/news?${params}`, {
         method: 'GET',